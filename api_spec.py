@@ -0,0 +1,239 @@
+# Define API categories
+API_CATEGORIES = {
+    "HRIS": {
+        "description": "HR, Payroll, and Directory",
+        "endpoints": {}  # To be implemented
+    },
+    "ATS": {
+        "description": "Recruiting",
+        "endpoints": {}  # To be implemented
+    },
+    "Accounting": {
+        "description": "Accounting and Finance",
+        "endpoints": {}  # To be implemented
+    },
+    "Ticketing": {
+        "description": "Welcome to the Merge Ticketing (TCKT) API explorer! Enter your Merge API key and access token of the linked account to check the response of Merge's unified API endpoints.",
+        "endpoints": {
+            "accounts": {
+                "description": "Retrieve accounts information",
+                "methods": ["GET"],
+                "endpoints": [
+                    "/accounts",
+                    "/accounts/{id}"
+                ]
+            },
+            "attachments": {
+                "description": "Manage ticket attachments",
+                "methods": ["GET", "POST"],
+                "endpoints": [
+                    "/attachments",
+                    "/attachments/{id}",
+                    "/attachments/{id}/download",
+                    "/attachments/meta/post"
+                ],
+                "post_fields": {
+                    "file_name": "string",
+                    "file_url": "string",
+                    "ticket": "string (UUID)",
+                    "content_type": "string"
+                }
+            },
+            "collections": {
+                "description": "Manage collections of tickets",
+                "methods": ["GET"],
+                "endpoints": [
+                    "/collections",
+                    "/collections/{id}",
+                    "/collections/{collection_id}/viewers"
+                ]
+            },
+            "comments": {
+                "description": "Manage ticket comments",
+                "methods": ["GET", "POST"],
+                "endpoints": [
+                    "/comments",
+                    "/comments/{id}",
+                    "/comments/meta/post"
+                ],
+                "post_fields": {
+                    "body": "string",
+                    "html_body": "string",
+                    "is_private": "boolean",
+                    "ticket": "string (UUID)",
+                    "user": "string (UUID)"
+                }
+            },
+            "contacts": {
+                "description": "Manage contacts",
+                "methods": ["GET", "POST"],
+                "endpoints": [
+                    "/contacts",
+                    "/contacts/{id}",
+                    "/contacts/meta/post"
+                ],
+                "post_fields": {
+                    "name": "string",
+                    "email_address": "string",
+                    "phone_number": "string",
+                    "details": "string"
+                }
+            },
+            "roles": {
+                "description": "Manage user roles",
+                "methods": ["GET"],
+                "endpoints": [
+                    "/roles",
+                    "/roles/{id}"
+                ]
+            },
+            "tags": {
+                "description": "Manage tags",
+                "methods": ["GET"],
+                "endpoints": [
+                    "/tags",
+                    "/tags/{id}"
+                ]
+            },
+            "teams": {
+                "description": "Manage teams",
+                "methods": ["GET"],
+                "endpoints": [
+                    "/teams",
+                    "/teams/{id}"
+                ]
+            },
+            "tickets": {
+                "description": "Manage tickets",
+                "methods": ["GET", "POST", "PATCH"],
+                "endpoints": [
+                    "/tickets",
+                    "/tickets/{id}",
+                    "/tickets/{ticket_id}/viewers",
+                    "/tickets/meta/patch/{id}",
+                    "/tickets/meta/post",
+                    "/tickets/remote-field-classes"
+                ],
+                "post_fields": {
+                    "name": "string (Required for most integrations)",
+                    "description": "string (Required for Zendesk)",
+                    "status": "enum (OPEN, CLOSED, IN_PROGRESS, ON_HOLD)",
+                    "priority": "enum (URGENT, HIGH, NORMAL, LOW)",
+                    "due_date": "string (ISO 8601 date)",
+                    "assignees": "array of UUIDs",
+                    "collections": "array of UUIDs (Required for Teamwork, Trello, Wrike, Zoho)",
+                    "ticket_type": "string",
+                    "account": "UUID",
+                    "contact": "UUID (Required for Zoho Desk)",
+                    "creator": "UUID",
+                    "parent_ticket": "UUID",
+                    "remote_id": "string",
+                    "remote_created_at": "string (ISO 8601 date)",
+                    "remote_updated_at": "string (ISO 8601 date)",
+                    "ticket_url": "string",
+                    "tags": "array of strings",
+                    "integration_params": {
+                        "counter_party_email": "string (Required for SpotDraft)",
+                        "counter_party_first_name": "string (Required for SpotDraft)",
+                        "counter_party_last_name": "string (Required for SpotDraft)",
+                        "template_remote_id": "string (Required for SpotDraft)",
+                        "department_id": "string (Required for Zoho Desk)"
+                    },
+                    "remote_fields": {
+                        "remote_field_class": "string (Required for all integrations)",
+                        "value": "string (Required for most integrations)"
+                    }
+                }
+            },
+            "users": {
+                "description": "Manage users",
+                "methods": ["GET"],
+                "endpoints": [
+                    "/users",
+                    "/users/{id}"
+                ]
+            }
+        }
+    },
+    "CRM": {
+        "description": "Customer Relationship Management",
+        "endpoints": {}  # To be implemented
+    },
+    "File Storage": {
+        "description": "File Storage and Management",
+        "endpoints": {}  # To be implemented
+    }
+}
+
+# Define API documentation for common models
+API_DOCUMENTATION = {
+    "accounts": {
+        "title": "API Documentation",
+        "parameters": [
+            {
+                "name": "created_after",
+                "type": "DateTime (ISO 8601)",
+                "required": "Optional",
+                "description": "If provided, will only return objects created after this datetime."
+            },
+            {
+                "name": "created_before",
+                "type": "DateTime (ISO 8601)",
+                "required": "Optional",
+                "description": "If provided, will only return objects created before this datetime."
+            },
+            {
+                "name": "cursor",
+                "type": "String",
+                "required": "Optional",
+                "description": "The pagination cursor value."
+            },
+            {
+                "name": "include_deleted_data",
+                "type": "Boolean",
+                "required": "Optional",
+                "description": "Indicates whether or not this object has been deleted in the third party platform. Full coverage deletion detection is a premium add-on. Native deletion detection is offered for free with limited coverage."
+            },
+            {
+                "name": "include_remote_data",
+                "type": "Boolean",
+                "required": "Optional",
+                "description": "Whether to include the original data Merge fetched from the third-party to produce these models."
+            },
+            {
+                "name": "include_shell_data",
+                "type": "Boolean",
+                "required": "Optional",
+                "description": "Whether to include shell records. Shell records are empty records (they may contain some metadata but all other fields are null)."
+            },
+            {
+                "name": "modified_after",
+                "type": "DateTime (ISO 8601)",
+                "required": "Optional",
+                "description": "If provided, only objects synced by Merge after this date time will be returned."
+            },
+            {
+                "name": "modified_before",
+                "type": "DateTime (ISO 8601)",
+                "required": "Optional",
+                "description": "If provided, only objects synced by Merge before this date time will be returned."
+            },
+            {
+                "name": "page_size",
+                "type": "Integer",
+                "required": "Optional",
+                "description": "Number of results to return per page."
+            },
+            {
+                "name": "remote_id",
+                "type": "String",
+                "required": "Optional",
+                "description": "The API provider's ID for the given object."
+            }
+        ]
+    }
+}
+
+# Add the same documentation to all other common models
+for model in ["attachments", "collections", "comments", "contacts", "roles", "tags", "teams", "tickets", "users"]:
+    API_DOCUMENTATION[model] = API_DOCUMENTATION["accounts"].copy()
@@ -0,0 +1,99 @@
+"""Compare peak memory and decode time of buffered vs streaming page decoding.
+
+Usage: python benchmarks/bench_decode.py --records 5000 --remote-data-kb 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streaming  # noqa: E402
+
+def synthetic_page(records: int, remote_data_kb: int) -> dict:
+    """Build a list response shaped like a Merge /tickets page."""
+    padding = "x" * (remote_data_kb * 1024)
+    return {
+        "next": "cD0yMDI0LTAxLTAx",
+        "previous": None,
+        "results": [
+            {
+                "id": f"00000000-0000-0000-0000-{i:012d}",
+                "remote_id": str(i),
+                "name": f"Ticket {i}",
+                "status": "OPEN",
+                "priority": "NORMAL",
+                "assignees": [f"10000000-0000-0000-0000-{i % 50:012d}"],
+                "created_at": "2024-01-01T00:00:00Z",
+                "modified_at": "2024-01-02T00:00:00Z",
+                "remote_data": [{"path": "/tickets", "data": {"blob": padding}}],
+            }
+            for i in range(records)
+        ],
+    }
+
+class FileResponse:
+    """Minimal stand-in for a streamed requests.Response backed by a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.raw = open(path, "rb")
+
+    @property
+    def content(self) -> bytes:
+        return self.raw.read()
+
+    def close(self):
+        self.raw.close()
+
+def measure(name: str, run) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = run()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"method": name, "records": count, "seconds": elapsed, "peak_mib": peak / 1024 / 1024}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--remote-data-kb", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(synthetic_page(args.records, args.remote_data_kb), f)
+        path = f.name
+    print(f"page size: {os.path.getsize(path) / 1024 / 1024:.1f} MiB, {args.records} records")
+
+    def stdlib_buffered():
+        with open(path, "rb") as fp:
+            return len(json.loads(fp.read())["results"])
+
+    def fast_buffered():
+        with open(path, "rb") as fp:
+            return len(streaming.loads(fp.read())["results"])
+
+    def streamed():
+        # Records are consumed one by one, as the store pipeline does
+        return sum(1 for _ in streaming.StreamedPage(FileResponse(path)))
+
+    runs = [measure("json.loads (buffered)", stdlib_buffered)]
+    if streaming.orjson is not None:
+        runs.append(measure("orjson.loads (buffered)", fast_buffered))
+    if streaming.ijson is not None:
+        runs.append(measure(f"ijson stream ({streaming.ijson.backend})", streamed))
+    else:
+        print("ijson is not installed; skipping the streaming decoder")
+
+    print(f"{'method':<32}{'records':>10}{'seconds':>10}{'peak MiB':>10}")
+    for run in runs:
+        print(f"{run['method']:<32}{run['records']:>10}{run['seconds']:>10.3f}{run['peak_mib']:>10.1f}")
+    os.unlink(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark the explorer's hot paths against the local mock Merge server.
+
+Usage: python benchmarks/bench_suite.py --records 5000 --latency-ms 20 --error-rate 0.02
+
+Reports throughput and p50/p99 latency for a single fetch, full pagination,
+DataFrame construction and chart aggregation.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from api_spec import API_CATEGORIES  # noqa: E402
+from frames import build_frame  # noqa: E402
+from merge_client import MergeClient, fetch_page, iter_pages  # noqa: E402
+from mock_server import MockMergeServer  # noqa: E402
+from rate_limit import RateLimiterRegistry  # noqa: E402
+from timeseries import TimeSeriesAggregator  # noqa: E402
+
+TICKET_FIELDS = API_CATEGORIES["Ticketing"]["endpoints"]["tickets"]["post_fields"]
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def timed(run: Callable[[], int], repeat: int) -> Dict:
+    """Run `run` repeatedly; it returns the number of items processed per call."""
+    durations = []
+    items = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items += run()
+        durations.append(time.perf_counter() - started)
+    total = sum(durations)
+    return {
+        "calls": repeat,
+        "items/s": items / total if total else 0.0,
+        "p50 ms": percentile(durations, 50) * 1000,
+        "p99 ms": percentile(durations, 99) * 1000,
+        "mean ms": statistics.mean(durations) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--payload-kb", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations for the per-call benchmarks")
+    args = parser.parse_args()
+
+    with MockMergeServer(records=args.records, page_size=args.page_size, latency=args.latency_ms / 1000,
+                         payload_kb=args.payload_kb, error_rate=args.error_rate, retry_after=0.01) as server:
+        # A private, effectively unlimited rate limiter so the benchmark measures the client itself
+        client = MergeClient("bench-key", "bench-token", base_url=server.base_url,
+                             rate_limits=RateLimiterRegistry(1e9, 1e9))
+        params = {"page_size": args.page_size, "include_remote_data": args.payload_kb > 0}
+        pages = [page["results"] for page in iter_pages(client, "/tickets", params)]
+
+        results = {
+            "single fetch (page)": timed(lambda: len(fetch_page(client, "/tickets", params)["results"]), args.repeat),
+            "full pagination (records)": timed(
+                lambda: sum(len(p["results"]) for p in iter_pages(client, "/tickets", params)), max(3, args.repeat // 10)),
+            "pd.DataFrame (records)": timed(lambda: sum(len(pd.DataFrame(p)) for p in pages), 5),
+            "build_frame (records)": timed(lambda: sum(len(build_frame(p, TICKET_FIELDS)) for p in pages), 5),
+        }
+        frames = [build_frame(p, TICKET_FIELDS) for p in pages]
+
+        def aggregate() -> int:
+            aggregator = TimeSeriesAggregator("created_at", "D", "status")
+            for frame in frames:
+                aggregator.add(frame)
+            aggregator.frame()
+            return sum(len(frame) for frame in frames)
+
+        results["chart aggregation (records)"] = timed(aggregate, 5)
+
+        print(f"mock server: {args.records} tickets, page size {args.page_size}, latency {args.latency_ms} ms, "
+              f"payload {args.payload_kb} KiB, 429 rate {args.error_rate}")
+        print(f"{'benchmark':<30}{'calls':>7}{'items/s':>14}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+        for name, r in results.items():
+            print(f"{name:<30}{r['calls']:>7}{r['items/s']:>14.0f}{r['p50 ms']:>10.2f}{r['p99 ms']:>10.2f}{r['mean ms']:>10.2f}")
+        print(f"server: {server.requests} requests, {server.throttled} throttled; client: {client.stats}")
+
+if __name__ == "__main__":
+    main()
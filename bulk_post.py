@@ -0,0 +1,247 @@
+import os
+import csv
+import io
+import json
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import requests
+
+from merge_client import MergeClient
+from streaming import loads
+
+BULK_REPORT_DIR = os.environ.get("MERGE_BULK_REPORT_DIR", ".merge_bulk")
+BULK_MAX_WORKERS = int(os.environ.get("MERGE_BULK_MAX_WORKERS", "4"))
+BULK_RATE_PER_SECOND = float(os.environ.get("MERGE_BULK_RATE_PER_SECOND", "5"))
+
+# Fields sent as arrays even when a single value is given
+ARRAY_FIELDS = ["collections", "assignees", "tags"]
+UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+REQUIRED_PATTERN = re.compile(r"Required for ([^)]*)")
+
+def format_post_payload(endpoint: str, data: Dict = None) -> Dict:
+    """Format POST data according to Merge API requirements."""
+    formatted_data = {}
+    if data:
+        # Remove empty values
+        data = {k: v for k, v in data.items() if v is not None and v != ""}
+        # Remove fields that are empty lists
+        data = {k: v for k, v in data.items() if not (isinstance(v, list) and len(v) == 0)}
+        # For tickets endpoint, wrap the data in a model object
+        if "tickets" in endpoint:
+            # Ensure 'collections' and other array fields are always lists
+            for field in ARRAY_FIELDS:
+                if field in data and not isinstance(data[field], list):
+                    data[field] = [data[field]]
+            formatted_data = {"model": data}
+        else:
+            formatted_data = data
+    return formatted_data
+
+def is_required(field_type: str, integration: Optional[str]) -> bool:
+    """Check whether a post_fields type description marks the field required for an integration."""
+    match = REQUIRED_PATTERN.search(field_type)
+    if not match:
+        return False
+    targets = [t.strip() for t in match.group(1).split(",")]
+    if any(t in ("all integrations", "most integrations") for t in targets):
+        return True
+    # "Zoho" covers both Zoho Desk and Zoho BugTracker
+    return integration is not None and any(integration.startswith(t) for t in targets)
+
+def required_fields(post_fields: Dict, integration: Optional[str] = None) -> Set[str]:
+    """Return top-level and dotted nested field names required for an integration."""
+    required = set()
+    for field, field_type in post_fields.items():
+        if isinstance(field_type, dict):
+            required.update(f"{field}.{child}" for child, child_type in field_type.items()
+                            if is_required(child_type, integration))
+        elif is_required(field_type, integration):
+            required.add(field)
+    return required
+
+def coerce_value(value, field_type):
+    """Convert a CSV cell into the JSON type a post field expects."""
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    if value == "":
+        return None
+    if isinstance(field_type, str) and field_type.startswith("boolean"):
+        return value.lower() in ("true", "1", "yes", "y")
+    if isinstance(field_type, str) and field_type.startswith("array"):
+        if value.startswith("["):
+            return json.loads(value)
+        return [x.strip() for x in value.split(",") if x.strip()]
+    return value
+
+def row_to_data(row: Dict, post_fields: Dict) -> Dict:
+    """Turn a CSV/JSONL row into POST data, nesting dotted columns like integration_params.department_id.
+
+    Raises ValueError for a row that is not an object or a malformed JSON array cell.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"row must be an object, not {type(row).__name__}")
+    data = {}
+    for column, value in row.items():
+        if column is None:
+            continue
+        if "." in column:
+            parent, child = column.split(".", 1)
+            child_type = post_fields.get(parent, {}).get(child) if isinstance(post_fields.get(parent), dict) else None
+            value = coerce_value(value, child_type)
+            if value is not None:
+                data.setdefault(parent, {})[child] = value
+        else:
+            value = coerce_value(value, post_fields.get(column))
+            if value is not None:
+                data[column] = value
+    return data
+
+def validate_row(data: Dict, post_fields: Dict, integration: Optional[str] = None) -> List[str]:
+    """Return a list of validation errors for one row of POST data."""
+    errors = []
+    for field in sorted(required_fields(post_fields, integration)):
+        parent, _, child = field.partition(".")
+        if child:
+            # Nested requirements only apply when the parent object is being sent
+            if isinstance(data.get(parent), dict) and data[parent].get(child) in (None, "", []):
+                errors.append(f"{field} is required")
+        elif data.get(field) in (None, "", []):
+            errors.append(f"{field} is required for {integration or 'this model'}")
+    for field, value in data.items():
+        field_type = post_fields.get(field)
+        if field_type is None:
+            errors.append(f"unknown field {field}")
+        elif isinstance(field_type, dict):
+            if not isinstance(value, dict):
+                errors.append(f"{field} must be an object")
+            else:
+                errors.extend(f"unknown field {field}.{child}" for child in value if child not in field_type)
+        elif field_type.startswith("enum"):
+            options = field_type.split("(")[1].split(")")[0].split(", ")
+            if value not in options:
+                errors.append(f"{field} must be one of {', '.join(options)}")
+        elif "UUID" in field_type:
+            values = value if isinstance(value, list) else [value]
+            if not all(isinstance(v, str) and UUID_PATTERN.match(v) for v in values):
+                errors.append(f"{field} must contain valid UUIDs")
+        elif "ISO 8601" in field_type:
+            try:
+                datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            except ValueError:
+                errors.append(f"{field} must be an ISO 8601 date")
+        elif field_type.startswith("boolean") and not isinstance(value, bool):
+            errors.append(f"{field} must be a boolean")
+    return errors
+
+def read_rows(content: bytes, file_name: str) -> List[Dict]:
+    """Parse an uploaded CSV or JSONL file into rows."""
+    text = content.decode("utf-8-sig")
+    if file_name.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return list(csv.DictReader(io.StringIO(text)))
+
+def report_path(model: str, file_name: str, account: str, directory: str = BULK_REPORT_DIR) -> str:
+    """Return the report file used to resume a bulk upload of `file_name`.
+
+    Reports are kept per account (a hash of base URL and credentials), so the same
+    file uploaded to another linked account or server starts from scratch.
+    """
+    base = re.sub(r"[^A-Za-z0-9_.-]", "_", os.path.basename(file_name))
+    return os.path.join(directory, account[:16], f"{model}-{base}.report.jsonl")
+
+def load_report(path: str) -> Dict[int, Dict]:
+    """Load the latest result per row from a report file."""
+    results = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    results[entry["row"]] = entry
+    return results
+
+class _IntervalLimiter:
+    """Space out request starts so at most `rate` begin per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+def iter_bulk_post(client: MergeClient, endpoint: str, rows: List[Dict], post_fields: Dict,
+                   integration: Optional[str] = None, report: str = None, max_workers: int = BULK_MAX_WORKERS,
+                   rate_per_second: float = BULK_RATE_PER_SECOND) -> Iterator[Dict]:
+    """POST rows concurrently and yield a result per row as each completes.
+
+    Rows that already succeeded according to `report` are skipped, and every new
+    result is appended to it, so a failed or interrupted upload can be resumed by
+    running it again with the same report file. Workers write their own results, so
+    a row is recorded even if the caller stops consuming; closing the generator
+    cancels the rows that have not been sent yet.
+    """
+    previous = load_report(report) if report else {}
+    done = {row: entry for row, entry in previous.items() if entry["status"] == "created"}
+    if report:
+        os.makedirs(os.path.dirname(report) or ".", exist_ok=True)
+    limiter = _IntervalLimiter(rate_per_second)
+    report_lock = threading.Lock()
+
+    def record(entry: Dict) -> Dict:
+        if report:
+            with report_lock, open(report, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def submit(index: int, payload: Dict) -> Dict:
+        limiter.wait()
+        try:
+            response = client.post(endpoint, payload)
+            if not response.ok:
+                return record({"row": index, "status": "error", "error": f"HTTP {response.status_code}: {response.text[:500]}"})
+            body = loads(response.content) if response.content else {}
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return record({"row": index, "status": "error", "error": str(e)})
+        if not isinstance(body, dict):
+            body = {}
+        model = body.get("model") if isinstance(body.get("model"), dict) else body
+        return record({"row": index, "status": "created", "id": model.get("id"),
+                       "errors": body.get("errors") or [], "warnings": body.get("warnings") or []})
+
+    pending: List[Tuple[int, Dict]] = []
+    for index, row in enumerate(rows):
+        if index in done:
+            yield {"row": index, "status": "skipped", "id": done[index].get("id")}
+            continue
+        try:
+            data = row_to_data(row, post_fields)
+        except ValueError as e:
+            yield record({"row": index, "status": "invalid", "error": str(e)})
+            continue
+        errors = validate_row(data, post_fields, integration)
+        if errors:
+            yield record({"row": index, "status": "invalid", "error": "; ".join(errors)})
+        else:
+            pending.append((index, format_post_payload(endpoint, data)))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="merge-bulk")
+    try:
+        futures = [executor.submit(submit, index, payload) for index, payload in pending]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Rows already being sent finish and are recorded; queued ones are never sent
+        executor.shutdown(wait=True, cancel_futures=True)
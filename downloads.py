@@ -0,0 +1,159 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from merge_client import MergeClient, iter_pages
+
+DOWNLOAD_DIR = os.environ.get("MERGE_DOWNLOAD_DIR", ".merge_downloads")
+DOWNLOAD_MAX_WORKERS = int(os.environ.get("MERGE_DOWNLOAD_MAX_WORKERS", "4"))
+DOWNLOAD_CHUNK_SIZE = int(os.environ.get("MERGE_DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Times an interrupted body is resumed from the partial file before giving up
+DOWNLOAD_RESUME_ATTEMPTS = int(os.environ.get("MERGE_DOWNLOAD_RESUME_ATTEMPTS", "3"))
+# Up to this many tickets, attachments are listed per ticket with the `ticket_id` filter;
+# larger sets scan /attachments once, reading at most ATTACHMENT_SCAN_MAX_PAGES pages
+ATTACHMENT_FILTER_MAX_TICKETS = int(os.environ.get("MERGE_ATTACHMENT_FILTER_MAX_TICKETS", "25"))
+ATTACHMENT_SCAN_MAX_PAGES = int(os.environ.get("MERGE_ATTACHMENT_SCAN_MAX_PAGES", "50"))
+ATTACHMENT_PAGE_SIZE = 100
+
+# Download bodies byte for byte so Range offsets match the file on disk
+DOWNLOAD_HEADERS = {"Accept": "*/*", "Accept-Encoding": "identity"}
+
+def is_download_endpoint(endpoint: str) -> bool:
+    return endpoint.rstrip("/").endswith("/download")
+
+def safe_file_name(name: str) -> str:
+    """Make an attachment file name safe to use as a local path component."""
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", os.path.basename(name or "")).strip("._")
+    return name[:120] or "attachment"
+
+def attachment_path(attachment: Dict, directory: str = DOWNLOAD_DIR) -> str:
+    """Local path of an attachment, grouped by ticket for evidence exports."""
+    # Ids come from the API, so they are sanitized like file names before becoming path components
+    folder = os.path.join(directory, safe_file_name(attachment["ticket"])) if attachment.get("ticket") else directory
+    return os.path.join(folder, f"{safe_file_name(attachment['id'])}-{safe_file_name(attachment.get('file_name'))}")
+
+def _expected_size(response: requests.Response, offset: int) -> Optional[int]:
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length is not None else None
+
+def download_file(client: MergeClient, endpoint: str, path: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                  resume_attempts: int = DOWNLOAD_RESUME_ATTEMPTS) -> Dict:
+    """Stream an endpoint's body to `path` in chunks, resuming from `path.part` when present.
+
+    The body is written to a `.part` file that is only renamed once its size matches
+    Content-Range/Content-Length, so an interrupted or short download is resumed with
+    a Range request next time instead of starting over.
+    """
+    part = path + ".part"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    started = time.perf_counter()
+    result = {"endpoint": endpoint, "path": path, "status": "downloaded", "bytes": 0, "resumed_from": 0, "error": None}
+    if os.path.exists(path):
+        result.update(status="skipped", bytes=os.path.getsize(path), elapsed=0.0)
+        return result
+
+    for _ in range(resume_attempts + 1):
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = dict(DOWNLOAD_HEADERS)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        try:
+            response = client.get(endpoint, headers=headers, stream=True)
+            with response:
+                if response.status_code == 416 and offset:
+                    # The partial file is no longer valid for this resource
+                    os.remove(part)
+                    continue
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    # Range was ignored; the full body follows
+                    offset = 0
+                if offset and not result["resumed_from"]:
+                    result["resumed_from"] = offset
+                expected = _expected_size(response, offset)
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+        except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout) as e:
+            result["error"] = str(e)
+            continue
+        except requests.exceptions.RequestException as e:
+            result.update(status="error", error=str(e))
+            break
+
+        size = os.path.getsize(part)
+        if expected is not None and size != expected:
+            result["error"] = f"size mismatch: got {size} of {expected} bytes"
+            if size > expected:
+                os.remove(part)
+            continue
+        os.replace(part, path)
+        result.update(status="resumed" if result["resumed_from"] else "downloaded", bytes=size, error=None)
+        break
+    else:
+        result["status"] = "error"
+
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+def download_attachment(client: MergeClient, attachment: Dict, directory: str = DOWNLOAD_DIR,
+                        chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Dict:
+    """Download one attachment record's file and return a result row."""
+    result = download_file(client, f"/attachments/{attachment['id']}/download",
+                           attachment_path(attachment, directory), chunk_size)
+    return {"attachment": attachment["id"], "ticket": attachment.get("ticket"),
+            "file_name": attachment.get("file_name"), **result}
+
+def iter_downloads(client: MergeClient, attachments: List[Dict], directory: str = DOWNLOAD_DIR,
+                   max_workers: int = DOWNLOAD_MAX_WORKERS) -> Iterator[Dict]:
+    """Download attachments concurrently, at most `max_workers` bodies at a time, yielding results as they finish."""
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="merge-download") as executor:
+        futures = [executor.submit(download_attachment, client, attachment, directory) for attachment in attachments]
+        for future in as_completed(futures):
+            yield future.result()
+
+def list_ticket_attachments(client: MergeClient, ticket_ids: Iterable[str], modified_after: str = None,
+                            max_workers: int = DOWNLOAD_MAX_WORKERS, filter_max_tickets: int = ATTACHMENT_FILTER_MAX_TICKETS,
+                            scan_max_pages: int = ATTACHMENT_SCAN_MAX_PAGES) -> Tuple[List[Dict], bool]:
+    """List the attachments of several tickets and whether the listing was cut short.
+
+    A few tickets are listed concurrently with one `ticket_id`-filtered listing each.
+    More than `filter_max_tickets` are found by one scan of /attachments, optionally
+    bounded by `modified_after`, that stops after `scan_max_pages` pages; the second
+    value is then True if attachments remained unread.
+    """
+    ticket_ids = list(dict.fromkeys(ticket_ids))
+    params = {"page_size": ATTACHMENT_PAGE_SIZE}
+    if modified_after:
+        params["modified_after"] = modified_after
+
+    if len(ticket_ids) <= filter_max_tickets:
+        def list_one(ticket_id: str) -> List[Dict]:
+            records = []
+            for page in iter_pages(client, "/attachments", {**params, "ticket_id": ticket_id}):
+                records.extend(r for r in page.get("results") or [] if r.get("ticket") == ticket_id)
+            return records
+
+        attachments = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="merge-attachments") as executor:
+            for records in executor.map(list_one, ticket_ids):
+                attachments.extend(records)
+        return attachments, False
+
+    wanted = set(ticket_ids)
+    attachments = []
+    truncated = False
+    for pages, page in enumerate(iter_pages(client, "/attachments", params), start=1):
+        attachments.extend(r for r in page.get("results") or [] if r.get("ticket") in wanted)
+        if pages >= scan_max_pages:
+            truncated = bool(page.get("next"))
+            break
+    return attachments, truncated
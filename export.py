@@ -0,0 +1,195 @@
+"""Headless export of Merge common models to JSONL or Parquet.
+
+    python merge_api_explorer.py export --model tickets --since 2024-01-01 --format parquet
+
+Credentials are read from --api-key/--account-token or the MERGE_API_KEY and
+MERGE_ACCOUNT_TOKEN environment variables. Records are streamed page by page and
+written in batches, so memory stays flat regardless of account size.
+"""
+import os
+import sys
+import json
+import gzip
+import time
+import argparse
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from merge_client import DEFAULT_BASE_URL, MergeClient
+from streaming import DECODE_ERRORS, iter_record_batches
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+EXPORT_BATCH_SIZE = 1000
+
+class JSONLWriter:
+    """Append records as JSON lines, gzip-compressed when the path ends in .gz."""
+
+    def __init__(self, path: str):
+        self.file = gzip.open(path, "wb") if path.endswith(".gz") else open(path, "wb")
+
+    def write(self, records: List[Dict]):
+        if orjson is not None:
+            self.file.write(b"".join(orjson.dumps(record) + b"\n" for record in records))
+        else:
+            self.file.write("".join(json.dumps(record) + "\n" for record in records).encode())
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """Write each batch of records as one Parquet row group.
+
+    The schema is fixed from the first batch: nested values are stored as JSON text,
+    columns that were all null become strings, and later values that do not fit a
+    column's type are stored as text (string columns) or dropped and counted. Values
+    of fields that first appear after the first batch are dropped and counted too,
+    and those fields are named in the closing warning.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet export requires pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.schema = None
+        self.writer = None
+        self.dropped = 0
+        self.dropped_fields = set()
+
+    @staticmethod
+    def _flatten(record: Dict) -> Dict:
+        return {key: json.dumps(value) if isinstance(value, (dict, list)) else value for key, value in record.items()}
+
+    def _column(self, values: list, field):
+        pa = self.pa
+        try:
+            return pa.array(values, type=field.type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            if pa.types.is_string(field.type):
+                return pa.array([None if v is None else str(v) for v in values], type=field.type)
+            converted = []
+            for value in values:
+                try:
+                    converted.append(pa.scalar(value, type=field.type).as_py())
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    converted.append(None)
+                    self.dropped += 1
+            return pa.array(converted, type=field.type)
+
+    def write(self, records: List[Dict]):
+        pa = self.pa
+        rows = [self._flatten(record) for record in records]
+        if self.schema is None:
+            inferred = pa.Table.from_pylist(rows).schema
+            self.schema = pa.schema([
+                pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in inferred
+            ])
+            self.writer = self.pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        # A Parquet file has one schema, so fields the first batch did not have cannot be added later
+        for row in rows:
+            for key, value in row.items():
+                if value is not None and self.schema.get_field_index(key) < 0:
+                    self.dropped += 1
+                    self.dropped_fields.add(key)
+        columns = [self._column([row.get(field.name) for row in rows], field) for field in self.schema]
+        self.writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        elif self.schema is None:
+            # Still produce a valid (empty) file when nothing was exported
+            self.pq.write_table(self.pa.table({}), self.path)
+        if self.dropped:
+            print(f"warning: {self.dropped} values did not fit the schema of the first batch and were dropped", file=sys.stderr)
+        if self.dropped_fields:
+            print(f"warning: fields missing from the first batch were dropped: {', '.join(sorted(self.dropped_fields))}",
+                  file=sys.stderr)
+
+WRITERS = {"jsonl": JSONLWriter, "parquet": ParquetWriter}
+
+def export_records(batches: Iterable[List[Dict]], path: str, fmt: str, progress=None) -> int:
+    """Write record batches to `path` and return how many records were written."""
+    writer = WRITERS[fmt](path)
+    written = 0
+    try:
+        for batch in batches:
+            writer.write(batch)
+            written += len(batch)
+            if progress:
+                progress(written)
+    finally:
+        writer.close()
+    return written
+
+def export_model(client: MergeClient, model: str, path: str, fmt: str = "jsonl", since: Optional[str] = None,
+                 params: Dict = None, page_size: int = 100, batch_size: int = EXPORT_BATCH_SIZE,
+                 max_records: int = None, progress=None) -> int:
+    """Stream every record of a model modified since `since` into a JSONL or Parquet file."""
+    params = {"page_size": page_size, **(params or {})}
+    if since:
+        params["modified_after"] = since
+    batches = iter_record_batches(client, f"/{model}", params, batch_size=batch_size, max_records=max_records)
+    return export_records(batches, path, fmt, progress)
+
+def parse_params(values: List[str]) -> Dict:
+    params = {}
+    for value in values or []:
+        key, sep, val = value.partition("=")
+        if not sep:
+            raise ValueError(f"--param expects key=value, got {value!r}")
+        params[key] = val
+    return params
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="merge_api_explorer.py export", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Common model to export, e.g. tickets")
+    parser.add_argument("--since", help="Only export records modified after this ISO 8601 datetime")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--output", help="Output path (default: <model>.<format>)")
+    parser.add_argument("--param", action="append", metavar="KEY=VALUE", help="Extra query parameter, repeatable")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Records per row group / write")
+    parser.add_argument("--max-records", type=int)
+    parser.add_argument("--api-key", default=os.environ.get("MERGE_API_KEY"))
+    parser.add_argument("--account-token", default=os.environ.get("MERGE_ACCOUNT_TOKEN"))
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    return parser
+
+def main(argv: List[str] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.api_key or not args.account_token:
+        parser.error("an API key and account token are required (flags or MERGE_API_KEY / MERGE_ACCOUNT_TOKEN)")
+    try:
+        params = parse_params(args.param)
+    except ValueError as e:
+        parser.error(str(e))
+    output = args.output or f"{args.model}.{args.format}"
+    client = MergeClient(args.api_key, args.account_token, base_url=args.base_url)
+    started = time.perf_counter()
+
+    def progress(written: int):
+        print(f"\r{written} records ({time.perf_counter() - started:.1f}s)", end="", file=sys.stderr, flush=True)
+
+    try:
+        written = export_model(client, args.model, output, args.format, args.since, params,
+                               args.page_size, args.batch_size, args.max_records, progress)
+    except (requests.exceptions.RequestException, *DECODE_ERRORS) as e:
+        print(f"\nError fetching data: {e}", file=sys.stderr)
+        return 1
+    print(f"\nWrote {written} {args.model} records to {output} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
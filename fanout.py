@@ -0,0 +1,75 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple
+
+import requests
+
+from merge_client import MergeClient, iter_pages
+
+# Linked accounts queried at the same time; each account's own in-flight limit still applies
+FANOUT_MAX_WORKERS = int(os.environ.get("MERGE_FANOUT_MAX_WORKERS", "8"))
+
+def parse_account_tokens(text: str) -> List[Tuple[str, str]]:
+    """Parse one account token per line, optionally as `label,token`; blank and # lines are ignored."""
+    accounts = []
+    seen = set()
+    labels = set()
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        label, _, token = line.rpartition(",")
+        token = token.strip()
+        if not token or token in seen:
+            continue
+        seen.add(token)
+        # Never show a token in full; its last characters are enough to tell accounts apart
+        label = label.strip() or f"…{token[-4:]}"
+        if label in labels:
+            label = f"{label} ({len(accounts) + 1})"
+        labels.add(label)
+        accounts.append((label, token))
+    return accounts
+
+def fetch_account(client: MergeClient, endpoint: str, params: Dict = None, max_pages: int = None,
+                  max_records: int = None) -> Dict:
+    """Fetch up to `max_pages`/`max_records` of a list endpoint for one account."""
+    started = time.perf_counter()
+    records = []
+    pages = 0
+    has_more = False
+    error = None
+    try:
+        for page in iter_pages(client, endpoint, params, max_pages, max_records):
+            pages += 1
+            records.extend(page.get("results") or [])
+            has_more = bool(page.get("next"))
+    except (requests.exceptions.RequestException, ValueError) as e:
+        error = str(e)
+    return {"records": records, "pages": pages, "has_more": has_more, "error": error,
+            "elapsed": time.perf_counter() - started}
+
+def fan_out(clients: Dict[str, MergeClient], endpoint: str, params: Dict = None, max_pages: int = 1,
+            max_records: int = None, max_workers: int = FANOUT_MAX_WORKERS,
+            on_result: Callable[[Dict], None] = None) -> List[Dict]:
+    """Run the same list query against several linked accounts concurrently.
+
+    `clients` maps an account label to its client. At most `max_workers` accounts are
+    fetched at once; each client additionally enforces its account's concurrency and
+    rate limits, and clients sharing an API key share the org rate limit. Results keep
+    the order of `clients` and carry the account label.
+    """
+    def run(label: str) -> Dict:
+        return {"account": label, **fetch_account(clients[label], endpoint, params, max_pages, max_records)}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(clients))), thread_name_prefix="merge-fanout") as executor:
+        futures = [executor.submit(run, label) for label in clients]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    order = {label: i for i, label in enumerate(clients)}
+    return sorted(results, key=lambda r: order[r["account"]])
@@ -0,0 +1,124 @@
+import json
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    pa = None
+    STRING_DTYPE = "string"
+
+# Fields present on every Merge common model
+COMMON_DATETIME_FIELDS = ["created_at", "modified_at", "remote_created_at", "remote_updated_at", "completed_at"]
+COMMON_ID_FIELDS = ["id", "remote_id"]
+# Nested payloads that are kept as compact JSON text instead of Python objects
+JSON_FIELDS = ["remote_data", "field_mappings", "remote_fields"]
+
+def parse_field_type(field_type) -> str:
+    """Classify a `post_fields` type description into the dtype family used for its column."""
+    if isinstance(field_type, dict):
+        return "nested"
+    if field_type.startswith("array"):
+        return "array"
+    if field_type.startswith("enum"):
+        return "enum"
+    if "ISO 8601" in field_type:
+        return "datetime"
+    if "UUID" in field_type:
+        return "uuid"
+    if field_type.startswith("boolean"):
+        return "boolean"
+    return "string"
+
+def enum_options(field_type: str) -> List[str]:
+    """Return the options listed in an `enum (A, B, C)` type description."""
+    return field_type.split("(")[1].split(")")[0].split(", ")
+
+def parse_datetimes(values: pd.Series) -> pd.Series:
+    """Parse ISO 8601 text to UTC datetimes.
+
+    Arrow's parser handles the zoned timestamps Merge returns in one vectorized pass;
+    anything it rejects (date-only values, nanosecond precision, junk) goes through
+    pandas, which turns unparseable values into NaT.
+    """
+    if pa is not None:
+        try:
+            parsed = pc.cast(pa.array(values, type=pa.string(), from_pandas=True), pa.timestamp("us", "UTC"))
+            # Dropping the zone keeps the UTC values and skips pyarrow's slower tz-aware conversion
+            utc = parsed.cast(pa.timestamp("us")).to_numpy(zero_copy_only=False)
+            return pd.Series(utc, index=values.index, name=values.name, dtype="datetime64[us, UTC]")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    return pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+
+def to_json_text(values: pd.Series) -> pd.Series:
+    return pd.Series([None if v is None or v != v else json.dumps(v, separators=(",", ":")) for v in values],
+                     index=values.index, dtype=STRING_DTYPE)
+
+def to_categorical(values: pd.Series, categories: List[str]) -> pd.Categorical:
+    """Encode enum values against their documented options with one hash lookup per value."""
+    categories = pd.Index(categories)
+    codes = categories.get_indexer(values)
+    unknown = (codes < 0) & values.notna().to_numpy()
+    if unknown.any():
+        # Keep values Merge returns outside the documented options rather than dropping them
+        extra = sorted(set(map(str, pd.unique(values[unknown]))) - set(categories))
+        categories = categories.append(pd.Index(extra))
+        codes = categories.get_indexer(values.where(values.isna(), values.astype(str)))
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories))
+
+def build_frame(records: List[Dict], post_fields: Dict = None, flatten: Iterable[str] = None) -> pd.DataFrame:
+    """Build a compactly typed DataFrame from Merge results.
+
+    Column dtypes come from the model's `post_fields` types: ISO 8601 fields are parsed
+    to UTC datetimes once, enums become categoricals with the documented categories,
+    and UUIDs use a compact string dtype. Nested fields listed in `flatten` (by default
+    the nested `post_fields`) are expanded into `parent.child` columns when their values
+    are objects; other nested payloads, such as list-valued `remote_fields` or
+    `remote_data`, are stored as JSON text.
+    """
+    df = pd.DataFrame.from_records(records)
+    if df.empty:
+        return df
+
+    field_kinds = {field: parse_field_type(field_type) for field, field_type in (post_fields or {}).items()}
+    for field in COMMON_DATETIME_FIELDS:
+        field_kinds.setdefault(field, "datetime")
+    for field in COMMON_ID_FIELDS:
+        field_kinds.setdefault(field, "uuid")
+    if flatten is None:
+        flatten = [field for field, kind in field_kinds.items() if kind == "nested"]
+
+    json_columns = set(JSON_FIELDS)
+    for field in flatten:
+        if field not in df.columns:
+            continue
+        values = df[field].tolist()
+        if not all(isinstance(v, dict) or v is None or v != v for v in values):
+            json_columns.add(field)
+            continue
+        nested = pd.DataFrame.from_records([v if isinstance(v, dict) else {} for v in values], index=df.index)
+        nested.columns = [f"{field}.{column}" for column in nested.columns]
+        df = pd.concat([df.drop(columns=[field]), nested], axis=1)
+
+    for column, values in list(df.items()):
+        kind = field_kinds.get(column)
+        if kind == "datetime":
+            df[column] = parse_datetimes(values)
+        elif kind == "enum":
+            df[column] = to_categorical(values, enum_options(post_fields[column]))
+        elif kind in ("uuid", "string"):
+            # pandas 3 already stores text as Arrow-backed strings; converting again only costs time
+            if isinstance(values.dtype, pd.StringDtype) and values.dtype.storage == "pyarrow":
+                continue
+            if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+                df[column] = values.astype(STRING_DTYPE)
+        elif kind == "boolean":
+            df[column] = values.astype("boolean")
+        elif column in json_columns or (kind is None and pd.api.types.infer_dtype(values, skipna=True) == "mixed"
+                                        and any(isinstance(v, dict) for v in values)):
+            df[column] = to_json_text(values)
+    return df
@@ -0,0 +1,72 @@
+import os
+import json
+from typing import Any, Dict, List
+
+import streamlit as st
+
+# Maximum serialized bytes the viewer sends to the browser per render
+MAX_VIEWER_BYTES = int(os.environ.get("MERGE_VIEWER_MAX_BYTES", str(256 * 1024)))
+WINDOW_SIZE = 25
+# Fields tried in order to label a record in the window
+LABEL_FIELDS = ["name", "email_address", "file_name", "body", "remote_id"]
+
+def summarize(value: Any, max_text: int = 80) -> Any:
+    """Collapse a value to a one-level skeleton: containers become their shape."""
+    if isinstance(value, dict):
+        return {key: describe(item, max_text) for key, item in value.items()}
+    return describe(value, max_text)
+
+def describe(value: Any, max_text: int = 80) -> Any:
+    """Describe containers by their size and shorten long strings."""
+    if isinstance(value, dict):
+        return f"{{...}} {len(value)} keys"
+    if isinstance(value, list):
+        return f"[...] {len(value)} items"
+    if isinstance(value, str) and len(value) > max_text:
+        return value[:max_text] + "…"
+    return value
+
+def record_label(index: int, record: Dict) -> str:
+    """Build a short label identifying a record in the results window."""
+    label = next((str(record[f]) for f in LABEL_FIELDS if isinstance(record, dict) and record.get(f)), "")
+    record_id = record.get("id", "") if isinstance(record, dict) else ""
+    return f"#{index} {record_id} {label[:60]}".strip()
+
+def render_capped_json(value: Any, max_bytes: int = MAX_VIEWER_BYTES):
+    """Render JSON, falling back to truncated text when it exceeds the byte budget."""
+    text = json.dumps(value, default=str)
+    if len(text) <= max_bytes:
+        st.json(value)
+    else:
+        st.code(text[:max_bytes] + " …", language="json")
+        st.caption(f"Truncated to {max_bytes // 1024} KiB of {len(text) // 1024} KiB")
+
+@st.fragment
+def render_response_viewer(data: Dict, key: str):
+    """Lazily render a response: a collapsed skeleton plus a paged window of `results`.
+
+    Runs as a fragment so paging and expanding records only re-execute the viewer.
+    """
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list):
+        render_capped_json(data)
+        return
+
+    st.json(summarize(data), expanded=True)
+    if not results:
+        return
+
+    pages = (len(results) - 1) // WINDOW_SIZE + 1
+    page = st.number_input(f"Results page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{key}_viewer_page")
+    start = (page - 1) * WINDOW_SIZE
+    window = results[start:start + WINDOW_SIZE]
+    labels = [record_label(start + i, record) for i, record in enumerate(window)]
+
+    # Each record in the window is shown collapsed to its skeleton
+    st.dataframe([{"record": label, **summarize(record, 40)} for label, record in zip(labels, window)], hide_index=True)
+    expanded: List[str] = st.multiselect("Expand records", labels, key=f"{key}_viewer_expand_{page}")
+    # Share the byte budget between the records that were expanded
+    budget = MAX_VIEWER_BYTES // max(1, len(expanded))
+    for label in expanded:
+        st.caption(label)
+        render_capped_json(window[labels.index(label)], budget)
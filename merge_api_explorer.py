@@ -1,252 +1,52 @@
 import streamlit as st
 import requests
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import json
+import os
+import sys
+import time
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-# Define API categories
-API_CATEGORIES = {
-    "HRIS": {
-        "description": "HR, Payroll, and Directory",
-        "endpoints": {}  # To be implemented
-    },
-    "ATS": {
-        "description": "Recruiting",
-        "endpoints": {}  # To be implemented
-    },
-    "Accounting": {
-        "description": "Accounting and Finance",
-        "endpoints": {}  # To be implemented
-    },
-    "Ticketing": {
-        "description": "Welcome to the Merge Ticketing (TCKT) API explorer! Enter your Merge API key and access token of the linked account to check the response of Merge's unified API endpoints.",
-        "endpoints": {
-            "accounts": {
-                "description": "Retrieve accounts information",
-                "methods": ["GET"],
-                "endpoints": [
-                    "/accounts",
-                    "/accounts/{id}"
-                ]
-            },
-            "attachments": {
-                "description": "Manage ticket attachments",
-                "methods": ["GET", "POST"],
-                "endpoints": [
-                    "/attachments",
-                    "/attachments/{id}",
-                    "/attachments/{id}/download",
-                    "/attachments/meta/post"
-                ],
-                "post_fields": {
-                    "file_name": "string",
-                    "file_url": "string",
-                    "ticket": "string (UUID)",
-                    "content_type": "string"
-                }
-            },
-            "collections": {
-                "description": "Manage collections of tickets",
-                "methods": ["GET"],
-                "endpoints": [
-                    "/collections",
-                    "/collections/{id}",
-                    "/collections/{collection_id}/viewers"
-                ]
-            },
-            "comments": {
-                "description": "Manage ticket comments",
-                "methods": ["GET", "POST"],
-                "endpoints": [
-                    "/comments",
-                    "/comments/{id}",
-                    "/comments/meta/post"
-                ],
-                "post_fields": {
-                    "body": "string",
-                    "html_body": "string",
-                    "is_private": "boolean",
-                    "ticket": "string (UUID)",
-                    "user": "string (UUID)"
-                }
-            },
-            "contacts": {
-                "description": "Manage contacts",
-                "methods": ["GET", "POST"],
-                "endpoints": [
-                    "/contacts",
-                    "/contacts/{id}",
-                    "/contacts/meta/post"
-                ],
-                "post_fields": {
-                    "name": "string",
-                    "email_address": "string",
-                    "phone_number": "string",
-                    "details": "string"
-                }
-            },
-            "roles": {
-                "description": "Manage user roles",
-                "methods": ["GET"],
-                "endpoints": [
-                    "/roles",
-                    "/roles/{id}"
-                ]
-            },
-            "tags": {
-                "description": "Manage tags",
-                "methods": ["GET"],
-                "endpoints": [
-                    "/tags",
-                    "/tags/{id}"
-                ]
-            },
-            "teams": {
-                "description": "Manage teams",
-                "methods": ["GET"],
-                "endpoints": [
-                    "/teams",
-                    "/teams/{id}"
-                ]
-            },
-            "tickets": {
-                "description": "Manage tickets",
-                "methods": ["GET", "POST", "PATCH"],
-                "endpoints": [
-                    "/tickets",
-                    "/tickets/{id}",
-                    "/tickets/{ticket_id}/viewers",
-                    "/tickets/meta/patch/{id}",
-                    "/tickets/meta/post",
-                    "/tickets/remote-field-classes"
-                ],
-                "post_fields": {
-                    "name": "string (Required for most integrations)",
-                    "description": "string (Required for Zendesk)",
-                    "status": "enum (OPEN, CLOSED, IN_PROGRESS, ON_HOLD)",
-                    "priority": "enum (URGENT, HIGH, NORMAL, LOW)",
-                    "due_date": "string (ISO 8601 date)",
-                    "assignees": "array of UUIDs",
-                    "collections": "array of UUIDs (Required for Teamwork, Trello, Wrike, Zoho)",
-                    "ticket_type": "string",
-                    "account": "UUID",
-                    "contact": "UUID (Required for Zoho Desk)",
-                    "creator": "UUID",
-                    "parent_ticket": "UUID",
-                    "remote_id": "string",
-                    "remote_created_at": "string (ISO 8601 date)",
-                    "remote_updated_at": "string (ISO 8601 date)",
-                    "ticket_url": "string",
-                    "tags": "array of strings",
-                    "integration_params": {
-                        "counter_party_email": "string (Required for SpotDraft)",
-                        "counter_party_first_name": "string (Required for SpotDraft)",
-                        "counter_party_last_name": "string (Required for SpotDraft)",
-                        "template_remote_id": "string (Required for SpotDraft)",
-                        "department_id": "string (Required for Zoho Desk)"
-                    },
-                    "remote_fields": {
-                        "remote_field_class": "string (Required for all integrations)",
-                        "value": "string (Required for most integrations)"
-                    }
-                }
-            },
-            "users": {
-                "description": "Manage users",
-                "methods": ["GET"],
-                "endpoints": [
-                    "/users",
-                    "/users/{id}"
-                ]
-            }
-        }
-    },
-    "CRM": {
-        "description": "Customer Relationship Management",
-        "endpoints": {}  # To be implemented
-    },
-    "File Storage": {
-        "description": "File Storage and Management",
-        "endpoints": {}  # To be implemented
-    }
-}
-
-# Define API documentation for common models
-API_DOCUMENTATION = {
-    "accounts": {
-        "title": "API Documentation",
-        "parameters": [
-            {
-                "name": "created_after",
-                "type": "DateTime (ISO 8601)",
-                "required": "Optional",
-                "description": "If provided, will only return objects created after this datetime."
-            },
-            {
-                "name": "created_before",
-                "type": "DateTime (ISO 8601)",
-                "required": "Optional",
-                "description": "If provided, will only return objects created before this datetime."
-            },
-            {
-                "name": "cursor",
-                "type": "String",
-                "required": "Optional",
-                "description": "The pagination cursor value."
-            },
-            {
-                "name": "include_deleted_data",
-                "type": "Boolean",
-                "required": "Optional",
-                "description": "Indicates whether or not this object has been deleted in the third party platform. Full coverage deletion detection is a premium add-on. Native deletion detection is offered for free with limited coverage."
-            },
-            {
-                "name": "include_remote_data",
-                "type": "Boolean",
-                "required": "Optional",
-                "description": "Whether to include the original data Merge fetched from the third-party to produce these models."
-            },
-            {
-                "name": "include_shell_data",
-                "type": "Boolean",
-                "required": "Optional",
-                "description": "Whether to include shell records. Shell records are empty records (they may contain some metadata but all other fields are null)."
-            },
-            {
-                "name": "modified_after",
-                "type": "DateTime (ISO 8601)",
-                "required": "Optional",
-                "description": "If provided, only objects synced by Merge after this date time will be returned."
-            },
-            {
-                "name": "modified_before",
-                "type": "DateTime (ISO 8601)",
-                "required": "Optional",
-                "description": "If provided, only objects synced by Merge before this date time will be returned."
-            },
-            {
-                "name": "page_size",
-                "type": "Integer",
-                "required": "Optional",
-                "description": "Number of results to return per page."
-            },
-            {
-                "name": "remote_id",
-                "type": "String",
-                "required": "Optional",
-                "description": "The API provider's ID for the given object."
-            }
-        ]
-    }
-}
+from merge_client import DEFAULT_BASE_URL, MergeClient, POOL_CONNECTIONS, POOL_MAXSIZE, decode_response, fetch_many, hash_credentials, iter_pages
+from response_cache import ResponseCache, make_cache_key
+from rate_limit import RATE_LIMITS
+from sync_store import SyncStore, sync_model
+from frames import build_frame
+from json_viewer import render_response_viewer
+from streaming import DECODE_ERRORS
+from metrics import METRICS, record_info, timed_phase, trace_request
+from bulk_post import BULK_MAX_WORKERS, BULK_RATE_PER_SECOND, format_post_payload, iter_bulk_post, read_rows, report_path, required_fields
+from downloads import ATTACHMENT_SCAN_MAX_PAGES, DOWNLOAD_DIR, download_file, is_download_endpoint, iter_downloads, list_ticket_attachments, safe_file_name
+from search_index import SearchIndex
+from snapshots import Snapshot, diff_snapshots
+from fanout import fan_out, parse_account_tokens
+from result_store import RESULT_CLEANUP_INTERVAL, RESULT_SPILL_BYTES, ResultStore, StoredFrame, StoredObject, frame_nbytes
+from openapi_registry import CATEGORY_SLUGS, OPENAPI_DIR, EndpointRegistry, category_base_url, fill_path, validate_post
+from references import REFERENCE_FIELDS, ReferenceIndex, resolve_references
+from timeseries import GRANULARITIES, SPLIT_FIELDS, TIME_FIELDS, TimeSeriesAggregator, available_time_fields
+
+# Integrations with their own required ticket fields
+TICKET_INTEGRATIONS = ["Teamwork", "Trello", "Wrike", "Zendesk", "Zoho Desk", "Zoho BugTracker", "SpotDraft"]
+
+# Section titles of nested POST fields that read better than their field names
+NESTED_FIELD_TITLES = {"integration_params": "Integration Parameters"}
 
-# Add the same documentation to all other common models
-for model in ["attachments", "collections", "comments", "contacts", "roles", "tags", "teams", "tickets", "users"]:
-    API_DOCUMENTATION[model] = API_DOCUMENTATION["accounts"].copy()
+# Minimum seconds between re-renders of a table that grows while pages arrive
+TABLE_REFRESH_SECONDS = 1.0
+# Downloaded files up to this size are also offered through the browser
+INLINE_DOWNLOAD_MAX_BYTES = 50 * 1024 * 1024
+# Parts of a tab result that are spilled to the result store along with its frame
+SPILLED_PARTS = ("data", "index", "diff")
+# Queries whose last snapshot a session keeps for diffs; the least recently fetched are forgotten
+SNAPSHOT_MAX_PER_SESSION = int(os.environ.get("MERGE_SNAPSHOT_MAX_PER_SESSION", "32"))
 
 def get_query_parameters(endpoint_name: str) -> Dict:
     """Generate a form for query parameters."""
-    if endpoint_name not in API_DOCUMENTATION:
+    documentation = category_spec()["documentation"]
+    if endpoint_name not in documentation:
         return {}
         
     query_params = {}
@@ -254,7 +54,7 @@ def get_query_parameters(endpoint_name: str) -> Dict:
     
     # Add a checkbox to enable query parameters
     if st.checkbox("Add Query Parameters", key=f"{endpoint_name}_enable_params"):
-        doc = API_DOCUMENTATION[endpoint_name]
+        doc = documentation[endpoint_name]
         
         for param in doc["parameters"]:
             param_name = param["name"]
@@ -285,103 +85,591 @@ def get_query_parameters(endpoint_name: str) -> Dict:
     
     return query_params
 
+@st.cache_resource(show_spinner=False)
+def get_shared_client(api_key: str, access_token: str, base_url: str = DEFAULT_BASE_URL, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE) -> MergeClient:
+    """Return a keep-alive client shared by every session using the same credentials."""
+    return MergeClient(api_key, access_token, base_url=base_url, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+@st.cache_resource(show_spinner=False)
+def get_registry() -> EndpointRegistry:
+    """Return the endpoint registry shared by every session; categories are compiled on first selection."""
+    return EndpointRegistry()
+
+def category_spec(category: str = None) -> Dict:
+    """Return the compiled endpoints, documentation and post_fields of a category, by default the selected one."""
+    return get_registry().get(category or st.session_state.get("category", "Ticketing"))
+
+def get_base_url() -> str:
+    """Return the API base URL configured in the sidebar, pointed at the selected category."""
+    base_url = st.session_state.get("base_url", "").strip().rstrip("/") or DEFAULT_BASE_URL
+    return category_base_url(base_url, st.session_state.get("category", "Ticketing"))
+
+def get_client(api_key: str, access_token: str) -> MergeClient:
+    """Return the shared client for these credentials and the configured base URL."""
+    return get_shared_client(api_key.strip(), access_token.strip(), get_base_url())
+
+def account_hash(api_key: str, access_token: str) -> str:
+    """Identify a linked account on the configured base URL without exposing its token."""
+    return hash_credentials(get_base_url(), api_key, access_token)
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> ResponseCache:
+    """Return the response cache shared by every session in this process."""
+    return ResponseCache()
+
+@st.cache_resource(show_spinner=False)
+def get_reference_index(account: str) -> ReferenceIndex:
+    """Return the referenced-record index of one linked account, shared by every session."""
+    return ReferenceIndex()
+
+@st.cache_resource(show_spinner=False)
+def get_result_store() -> ResultStore:
+    """Return the on-disk store that holds large session results for this process."""
+    return ResultStore()
+
+@st.cache_resource(show_spinner=False)
+def get_sync_store(account: str) -> SyncStore:
+    """Return the local sync store of one linked account, opened once per process."""
+    return SyncStore(account)
+
+def current_session_id() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "default"
+
+def spill_frame(key: str, df: pd.DataFrame):
+    """Move a large frame out of session memory, returning a handle to keep in its place."""
+    if df is None or frame_nbytes(df) < RESULT_SPILL_BYTES:
+        return df
+    return get_result_store().put(current_session_id(), key, df) or df
+
+def load_frame(frame):
+    """Return a frame kept by spill_frame, or None if it was evicted from the store."""
+    if isinstance(frame, StoredFrame):
+        return get_result_store().load(frame)
+    return frame
+
+def spill_object(key: str, value):
+    """Move an object that belongs to a spilled result out of session memory, returning its handle."""
+    return get_result_store().put_object(current_session_id(), key, value)
+
+def load_object(value):
+    """Return an object kept by spill_object, or None if it was evicted from the store."""
+    if isinstance(value, StoredObject):
+        return get_result_store().load_object(value)
+    return value
+
+def store_result(key: str, result: Dict) -> Dict:
+    """The version of a tab result kept in session state, spilled to disk as a whole when its frame is large."""
+    if not result or result["frame"] is None:
+        return result
+    frame = spill_frame(key, result["frame"])
+    if not isinstance(frame, StoredFrame):
+        return {**result, "frame": frame}
+    # The raw response, search index and diff grow with the frame, so they follow it to disk
+    spilled = {part: spill_object(f"{key}:{part}", result[part]) for part in SPILLED_PARTS if result.get(part) is not None}
+    return {**result, "frame": frame, **spilled}
+
+def load_result(result: Dict) -> Optional[Dict]:
+    """Return a tab result with its spilled parts loaded, or None if any of them was evicted."""
+    loaded = {**result, "frame": load_frame(result["frame"])}
+    loaded.update({part: load_object(result[part]) for part in SPILLED_PARTS if result.get(part) is not None})
+    if any(loaded[part] is None for part in ("frame",) + SPILLED_PARTS if result.get(part) is not None):
+        return None
+    return loaded
+
+def drop_ended_sessions():
+    """Delete the stored results of sessions that have ended."""
+    if Runtime.exists():
+        get_result_store().drop_inactive(Runtime.instance().is_active_session, RESULT_CLEANUP_INTERVAL)
+
+def add_reference_names(endpoint: str, df: pd.DataFrame, access_token: str, api_key: str) -> pd.DataFrame:
+    """Add name columns for the ids in a results frame."""
+    model = endpoint.strip("/").split("/")[0]
+    with timed_phase("resolve"):
+        return resolve_references(get_client(api_key, access_token), get_reference_index(account_hash(api_key, access_token)), df, model)
+
+def invalidate_account_caches(api_key: str, access_token: str):
+    """Forget cached reads of an account after it was written to."""
+    account = account_hash(api_key, access_token)
+    get_response_cache().invalidate(account)
+    get_reference_index(account).invalidate()
+
+def make_cached_fetch(api_key: str, access_token: str):
+    """Build a page fetcher that goes through the shared response cache when it is enabled."""
+    cache = get_response_cache()
+    account = account_hash(api_key, access_token)
+    use_cache = st.session_state.get("use_response_cache", True)
+    
+    def fetch(client: MergeClient, endpoint: str, params: Dict = None) -> Dict:
+        def fetch_upstream():
+            record_info(cache="miss" if use_cache else "off")
+            response = client.get(endpoint, params=params)
+            return decode_response(response), len(response.content)
+        if not use_cache:
+            return fetch_upstream()[0]
+        record_info(cache="hit")
+        return cache.get_or_fetch(make_cache_key(account, endpoint, params), fetch_upstream)
+    
+    return fetch
+
+def display_cache_stats(container):
+    """Show response cache counters, rate-limit queues and request timings in the sidebar."""
+    stats = get_response_cache().snapshot()
+    with container:
+        st.subheader("Response Cache")
+        st.checkbox("Use response cache", value=True, key="use_response_cache")
+        hit_col, miss_col = st.columns(2)
+        hit_col.metric("Hits", stats["hits"] + stats["stale_hits"])
+        miss_col.metric("Misses", stats["misses"])
+        st.caption(f"{stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB · "
+                   f"{stats['stale_hits']} stale, {stats['coalesced']} coalesced, {stats['evictions']} evicted")
+        if st.button("Clear Cache", key="clear_response_cache"):
+            get_response_cache().invalidate()
+        
+        st.subheader("Rate Limits")
+        buckets = RATE_LIMITS.snapshot()
+        if buckets:
+            queued = sum(b["queue_depth"] for b in buckets)
+            st.caption(f"{queued} request(s) waiting across {len(buckets)} bucket(s)")
+            # Bucket names carry a credential hash; a prefix is enough to tell them apart
+            st.dataframe(pd.DataFrame([{**b, "bucket": b["bucket"][:16]} for b in buckets]), hide_index=True)
+        else:
+            st.caption("No requests yet")
+        
+        st.subheader("Result Store")
+        results = get_result_store().stats(current_session_id())
+        st.caption(f"{results['entries']} spilled entries, {results['bytes'] / 1024 ** 2:.1f} MiB across {results['sessions']} session(s) · "
+                   f"{results['session_bytes'] / 1024 ** 2:.1f} MiB this session, {results['evictions']} evicted")
+        
+        st.subheader("Request Timings")
+        percentiles = METRICS.rolling_percentiles()
+        if percentiles:
+            st.dataframe(pd.DataFrame(percentiles), hide_index=True)
+        else:
+            st.caption("No traced requests yet")
+        prom_col, jsonl_col = st.columns(2)
+        prom_col.download_button("Prometheus", METRICS.prometheus_text(), file_name="merge_explorer.prom", mime="text/plain")
+        jsonl_col.download_button("Traces", METRICS.traces_jsonl(), file_name="merge_explorer_traces.jsonl", mime="application/jsonl")
+
 def fetch_endpoint_data(endpoint: str, access_token: str, api_key: str, method: str = "GET", data: Dict = None, query_params: Dict = None) -> Dict:
     """Fetch data from a specific endpoint."""
-    base_url = "https://api.merge.dev/api/ticketing/v1"
-    url = f"{base_url}{endpoint}"
-    
-    headers = {
-        "Authorization": f"Bearer {api_key.strip()}",
-        "X-Account-Token": access_token.strip(),
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
+    client = get_client(api_key, access_token)
     
     try:
         if method == "GET":
-            # Add query parameters to the request
-            if query_params:
-                # Convert datetime objects to ISO format
-                processed_params = {}
-                for key, value in query_params.items():
-                    if hasattr(value, 'isoformat'):  # Check if it's a datetime object
-                        processed_params[key] = value.isoformat()
-                    else:
-                        processed_params[key] = value
-                response = requests.get(url, headers=headers, params=processed_params)
-            else:
-                response = requests.get(url, headers=headers)
+            return make_cached_fetch(api_key, access_token)(client, endpoint, query_params)
         else:  # POST
-            # Format the data according to Merge API requirements
-            formatted_data = {}
-            if data:
-                # Remove empty values
-                data = {k: v for k, v in data.items() if v is not None and v != ""}
-                # Remove fields that are empty lists
-                data = {k: v for k, v in data.items() if not (isinstance(v, list) and len(v) == 0)}
-                # For tickets endpoint, wrap the data in a model object
-                if "tickets" in endpoint:
-                    # Ensure 'collections' and other array fields are always lists
-                    array_fields = [
-                        "collections", "assignees", "tags"
-                    ]
-                    for field in array_fields:
-                        if field in data and not isinstance(data[field], list):
-                            data[field] = [data[field]]
-                    formatted_data = {"model": data}
-                else:
-                    formatted_data = data
+            formatted_data = format_post_payload(endpoint, data)
             # Debug print
             st.write("Outgoing POST payload:", formatted_data)
             
-            response = requests.post(url, headers=headers, json=formatted_data)
+            response = client.post(endpoint, formatted_data)
+            created = decode_response(response)
         
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        # Cached reads of this account may now be out of date
+        invalidate_account_caches(api_key, access_token)
+        return created
+    except (requests.exceptions.RequestException, ValueError) as e:
         st.error(f"Error fetching data: {str(e)}")
         if hasattr(e, 'response') and e.response is not None:
             st.write("Error Response:", e.response.text)
         return None
 
-def display_endpoint_data(endpoint: str, access_token: str, api_key: str, method: str = "GET", data: Dict = None, query_params: Dict = None):
-    """Display data for a specific endpoint."""
-    data = fetch_endpoint_data(endpoint, access_token, api_key, method, data, query_params)
-    
-    if data:
+def model_frame(endpoint: str, records: list) -> pd.DataFrame:
+    """Build a typed DataFrame for an endpoint's results using its model's post_fields."""
+    model = endpoint.strip("/").split("/")[0]
+    return build_frame(records, category_spec()["post_fields"].get(model, {}))
+
+def get_chart_options(endpoint_name: str) -> Dict:
+    """Generate the controls for the records-over-time chart."""
+    with st.expander("Chart Options"):
+        time_field = st.selectbox("Time Field", TIME_FIELDS, key=f"{endpoint_name}_chart_field")
+        granularity = st.radio("Granularity", list(GRANULARITIES), index=1, horizontal=True, key=f"{endpoint_name}_chart_granularity")
+        split_by = st.selectbox("Split By", ["None"] + SPLIT_FIELDS, key=f"{endpoint_name}_chart_split")
+    return {
+        "time_field": time_field,
+        "freq": GRANULARITIES[granularity],
+        "split_by": None if split_by == "None" else split_by,
+    }
+
+def make_aggregator(df: pd.DataFrame, chart_options: Dict = None) -> TimeSeriesAggregator:
+    """Create an aggregator for the chosen time field, falling back to one the frame has."""
+    chart_options = chart_options or {"time_field": "created_at", "freq": "D", "split_by": None}
+    time_field = chart_options["time_field"]
+    fields = available_time_fields(df)
+    if fields and time_field not in fields:
+        time_field = fields[0]
+    return TimeSeriesAggregator(time_field, chart_options["freq"], chart_options["split_by"])
+
+def display_time_series(endpoint: str, aggregator: TimeSeriesAggregator, container=None):
+    """Plot the number of records per time bucket."""
+    container = container or st.container()
+    chart_df = aggregator.frame()
+    with container:
+        if chart_df.empty:
+            st.info("No date field found to plot the graph.")
+            return
+        model = endpoint.strip("/").split("/")[0]
+        st.subheader(f"{model.title()} Over Time")
+        st.caption(f"By {aggregator.time_field}")
+        st.line_chart(chart_df)
+
+def display_endpoint_data(endpoint: str, access_token: str, api_key: str, method: str = "GET", data: Dict = None, query_params: Dict = None, chart_options: Dict = None, resolve: bool = False) -> Dict:
+    """Display data for a specific endpoint and return it as the tab's last result."""
+    with trace_request(endpoint, method) as trace:
+        data = fetch_endpoint_data(endpoint, access_token, api_key, method, data, query_params)
+        result = None
+        if data:
+            result = {"endpoint": endpoint, "method": method, "data": data, "frame": None, "fetched_at": time.time()}
+            # If there are results, they are also shown as a table
+            if "results" in data:
+                with timed_phase("frame"):
+                    result["frame"] = model_frame(endpoint, data["results"])
+                with timed_phase("snapshot"):
+                    result["diff"] = snapshot_and_diff(endpoint, query_params, result["frame"], access_token, api_key)
+                if resolve:
+                    result["frame"] = add_reference_names(endpoint, result["frame"], access_token, api_key)
+                with timed_phase("index"):
+                    result["index"] = SearchIndex()
+                    result["index"].add(result["frame"])
+            display_result(result, chart_options)
+    display_diagnostics(trace)
+    if result:
+        result["trace"] = trace
+    return result
+
+def display_result(result: Dict, chart_options: Dict = None):
+    """Render a fetched result: raw JSON, results table and records-over-time chart."""
+    if result.get("summary") is not None:
+        display_account_summary(result)
+    if result["data"] is not None:
         # Display raw JSON
         st.subheader("Raw JSON Response")
-        st.json(data)
-        
-        # If there are results, display as table
-        if "results" in data:
-            st.subheader("Results Table")
-            df = pd.DataFrame(data["results"])
-            st.dataframe(df)
-            
-            # Display count
-            st.metric("Total Records", len(data["results"]))
-
-            # Add a graph for the Ticketing page (tickets endpoint)
-            if endpoint == "/tickets":
-                # Try to find a date field
-                date_field = None
-                for possible_field in ["created_at", "created", "createdAt", "createdat"]:
-                    if possible_field in df.columns:
-                        date_field = possible_field
-                        break
-                if date_field:
-                    st.subheader("Tickets Over Time")
-                    # Convert to datetime
-                    df[date_field] = pd.to_datetime(df[date_field], errors='coerce')
-                    # Drop rows with NaT
-                    df = df.dropna(subset=[date_field])
-                    # Group by date (day)
-                    df["date_only"] = df[date_field].dt.date
-                    tickets_by_date = df.groupby("date_only").size().reset_index(name="count")
-                    st.line_chart(data=tickets_by_date.set_index("date_only"))
-                else:
-                    st.info("No date field found to plot the graph.")
+        with timed_phase("render"):
+            render_response_viewer(result["data"], key=result["endpoint"])
+    
+    df = result["frame"]
+    if df is None:
+        return
+    st.subheader("Results Table")
+    shown = df
+    if result.get("index") is not None and not df.empty:
+        shown = search_frame(result["endpoint"], df, result["index"])
+    with timed_phase("render"):
+        st.dataframe(shown)
+    
+    # Display count
+    st.metric("Total Records", len(df))
+
+    # Plot records over time for models with timestamp fields
+    if not shown.empty:
+        with timed_phase("aggregate"):
+            aggregator = make_aggregator(shown, chart_options)
+            aggregator.add(shown)
+        with timed_phase("render"):
+            display_time_series(result["endpoint"], aggregator)
+    display_diff(result.get("diff"))
+
+def snapshot_and_diff(endpoint: str, query_params: Dict, df: pd.DataFrame, access_token: str, api_key: str) -> Dict:
+    """Snapshot a results frame and diff it against the previous fetch of the same endpoint and parameters."""
+    if "id" not in df.columns:
+        return None
+    snapshots = st.session_state.setdefault("snapshots", {})
+    key = make_cache_key(account_hash(api_key, access_token), endpoint, query_params)
+    snapshot = Snapshot(df)
+    # An evicted snapshot loads as None and has nothing left to compare against
+    previous = load_object(snapshots.pop(key, None))
+    diff = None
+    if previous is not None:
+        diff = diff_snapshots(previous, snapshot)
+    snapshots[key] = spill_object(f"snapshot:{key}", snapshot) if snapshot.nbytes >= RESULT_SPILL_BYTES else snapshot
+    # Most recently fetched queries last; the oldest are forgotten beyond the per-session limit
+    while len(snapshots) > SNAPSHOT_MAX_PER_SESSION:
+        oldest = snapshots.pop(next(iter(snapshots)))
+        if isinstance(oldest, StoredObject):
+            get_result_store().discard(oldest)
+    return diff
+
+def display_diff(diff: Dict = None):
+    """Show what was added, removed and changed since the previous fetch."""
+    if diff is None:
+        return
+    since = time.strftime("%H:%M:%S", time.localtime(diff["since"]))
+    added, removed, changed = len(diff["added"]), len(diff["removed"]), len(diff["changed"])
+    with st.expander(f"Changes since {since}: {added} added, {removed} removed, {changed} changed"):
+        for col, (label, count) in zip(st.columns(4), [("Added", added), ("Removed", removed),
+                                                        ("Changed", changed), ("Unchanged", diff["unchanged"])]):
+            col.metric(label, count)
+        if changed:
+            st.write("Changed fields:", ", ".join(f"{field} ({count})" for field, count in diff["field_counts"].items()))
+            st.dataframe(diff["changed"], hide_index=True)
+            st.caption("Old and new values")
+            st.dataframe(diff["values"], hide_index=True)
+        if added:
+            st.caption("Added records")
+            st.dataframe(diff["added"], hide_index=True)
+        if removed:
+            st.caption("Removed records")
+            st.dataframe(diff["removed"], hide_index=True)
+
+def search_frame(endpoint: str, df: pd.DataFrame, index: SearchIndex) -> pd.DataFrame:
+    """Filter a results frame through its search index using a query box."""
+    query = st.text_input(
+        "Search",
+        key=f"{endpoint}_search",
+        placeholder="outage status:open,in_progress tags:vip created_at>=2024-06-01",
+        help="Words match name, description and comment body (`word*` for a prefix); "
+             "`status:`, `priority:`, `tags:` and `linked_account:` filter by value; `<`, `<=`, `>`, `>=` compare date fields"
+    )
+    if not query.strip():
+        return df
+    started = time.perf_counter()
+    try:
+        positions = index.search(query)
+    except ValueError as e:
+        st.warning(str(e))
+        return df
+    st.caption(f"{len(positions)} of {len(df)} records match ({(time.perf_counter() - started) * 1000:.1f} ms)")
+    return df.iloc[positions]
+
+def display_last_result(result: Dict, chart_options: Dict = None) -> pd.DataFrame:
+    """Re-render a tab's previous result without fetching it again and return its frame."""
+    fetched_at = time.strftime("%H:%M:%S", time.localtime(result["fetched_at"]))
+    st.caption(f"Last result of {result['method']} {result['endpoint']}, fetched at {fetched_at}")
+    loaded = load_result(result)
+    if loaded is None:
+        st.info("This result was evicted from the result store to stay within its memory budget; fetch it again to see it.")
+        return None
+    display_result(loaded, chart_options)
+    if result.get("trace") is not None:
+        display_diagnostics(result["trace"])
+    return loaded["frame"]
+
+def display_diagnostics(trace):
+    """Show where the time of one request went."""
+    with st.expander("Diagnostics"):
+        phases = [{"phase": phase, "ms": round(seconds * 1000, 1)} for phase, seconds in trace.phases.items()]
+        if phases:
+            st.dataframe(pd.DataFrame(phases), hide_index=True)
+        info = trace.info
+        details = [f"status {info['status']}" if "status" in info else None,
+                   f"{info['attempts']} attempt(s)" if info.get("attempts", 1) > 1 else None,
+                   f"cache {info['cache']}" if "cache" in info else None,
+                   f"{info['bytes'] / 1024:.1f} KiB decoded" if "bytes" in info else None,
+                   f"{info['wire_bytes'] / 1024:.1f} KiB on the wire" if "wire_bytes" in info else None]
+        st.caption(" · ".join(d for d in details if d) or "No request was sent")
+
+def display_all_pages(endpoint: str, access_token: str, api_key: str, query_params: Dict = None, max_pages: int = None, max_records: int = None, chart_options: Dict = None, resolve: bool = False) -> Dict:
+    """Follow pagination cursors, grow the results table as pages arrive and return the combined result."""
+    client = get_client(api_key, access_token)
+    
+    st.subheader("Results Table")
+    metric = st.empty()
+    status = st.empty()
+    table = st.empty()
+    chart = st.empty()
+    aggregator = None
+    index = SearchIndex()
+    frames = []
+    total = 0
+    last_render = 0.0
+    
+    try:
+        for page_number, page in enumerate(iter_pages(client, endpoint, query_params, max_pages, max_records), start=1):
+            page_df = model_frame(endpoint, page.get("results") or [])
+            if page_df.empty:
+                continue
+            frames.append(page_df)
+            index.add(page_df)
+            total += len(page_df)
+            if aggregator is None:
+                aggregator = make_aggregator(page_df, chart_options)
+            aggregator.add(page_df)
+            metric.metric("Total Records", total)
+            status.caption(f"Fetched {page_number} page(s)")
+            # Re-render the growing table at most once per interval instead of on every page
+            if time.monotonic() - last_render >= TABLE_REFRESH_SECONDS:
+                table.dataframe(pd.concat(frames, ignore_index=True))
+                display_time_series(endpoint, aggregator, chart.container())
+                last_render = time.monotonic()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        st.error(f"Error fetching data: {str(e)}")
+        if hasattr(e, 'response') and e.response is not None:
+            st.write("Error Response:", e.response.text)
+    
+    if not frames:
+        metric.metric("Total Records", 0)
+        return None
+    
+    df = pd.concat(frames, ignore_index=True)
+    # Kept apart from single-page snapshots so a diff always compares like with like
+    diff = snapshot_and_diff(endpoint, {**(query_params or {}), "all_pages": f"{max_pages}/{max_records}"}, df, access_token, api_key)
+    if resolve:
+        # Resolve once across every page so each id is looked up only once
+        df = add_reference_names(endpoint, df, access_token, api_key)
+    with table.container():
+        st.dataframe(search_frame(endpoint, df, index))
+    display_time_series(endpoint, aggregator, chart.container())
+    display_diff(diff)
+    return {"endpoint": endpoint, "method": "GET", "data": None, "frame": df, "index": index, "diff": diff, "fetched_at": time.time()}
+
+def selected_accounts() -> List[Tuple[str, str]]:
+    """(label, token) pairs to fan out over when multi-account mode is on."""
+    if not st.session_state.get("multi_account"):
+        return []
+    return parse_account_tokens(st.session_state.get("account_tokens", ""))
+
+def display_fanout(endpoint: str, accounts: List[Tuple[str, str]], api_key: str, query_params: Dict = None, max_pages: int = 1, max_records: int = None, chart_options: Dict = None, resolve: bool = False) -> Dict:
+    """Run a list query across several linked accounts at once and show one merged result."""
+    clients = {label: get_client(api_key, token) for label, token in accounts}
+    progress = st.progress(0.0, text=f"Querying {len(clients)} accounts...")
+    completed = []
+    
+    def on_result(result: Dict):
+        completed.append(result)
+        progress.progress(len(completed) / len(clients), text=f"Fetched {result['account']} ({len(completed)}/{len(clients)})")
+    
+    started = time.perf_counter()
+    results = fan_out(clients, endpoint, query_params, max_pages, max_records, on_result=on_result)
+    wall_time = time.perf_counter() - started
+    
+    summary = pd.DataFrame([
+        {
+            "Account": r["account"],
+            "Status": "error" if r["error"] else "ok",
+            "Records": len(r["records"]),
+            "Pages": r["pages"],
+            "Has More": r["has_more"],
+            "Latency (ms)": round(r["elapsed"] * 1000),
+            "Error": r["error"] or "",
+        }
+        for r in results
+    ])
+    
+    # One frame for every account keeps categorical columns consistent across accounts
+    df = model_frame(endpoint, [record for r in results for record in r["records"]])
+    if not df.empty:
+        df.insert(0, "linked_account", pd.Categorical(np.repeat([r["account"] for r in results], [len(r["records"]) for r in results]),
+                                                      categories=list(clients)))
+        if resolve:
+            # Referenced ids belong to their own account, so each account is resolved with its own client
+            tokens = dict(accounts)
+            bounds = np.cumsum([0] + [len(r["records"]) for r in results])
+            df = pd.concat([add_reference_names(endpoint, df.iloc[start:end], tokens[r["account"]], api_key)
+                            for r, start, end in zip(results, bounds[:-1], bounds[1:]) if end > start], ignore_index=True)
+    index = SearchIndex()
+    index.add(df)
+    accounts_key = "\n".join(token for _, token in accounts)
+    diff = snapshot_and_diff(endpoint, {**(query_params or {}), "all_pages": f"{max_pages}/{max_records}"}, df, accounts_key, api_key)
+    result = {"endpoint": endpoint, "method": "GET", "data": None, "frame": df, "index": index, "diff": diff,
+              "summary": summary, "wall_time": wall_time, "fetched_at": time.time()}
+    display_result(result, chart_options)
+    return result
+
+def display_account_summary(result: Dict):
+    """Per-account timing and errors of a multi-account query."""
+    summary = result["summary"]
+    st.subheader("Accounts")
+    st.dataframe(summary, hide_index=True)
+    failed = int((summary["Status"] == "error").sum())
+    st.caption(f"Queried {len(summary)} accounts in {result['wall_time'] * 1000:.0f} ms "
+               f"(sum of account latencies {summary['Latency (ms)'].sum()} ms)" + (f" · {failed} failed" if failed else ""))
+
+def display_sync_store(endpoint_name: str, access_token: str, api_key: str, chart_options: Dict = None, resolve: bool = False):
+    """Sync a model into the local store with modified_after deltas and show the stored records."""
+    client = get_client(api_key, access_token)
+    store = get_sync_store(account_hash(api_key, access_token))
+    
+    st.subheader("Local Sync Store")
+    state = store.sync_state(endpoint_name)
+    if state["last_synced_at"]:
+        st.caption(f"{state['records']} records stored · last synced {state['last_synced_at']} · "
+                   f"high-water mark {state['high_water'] or 'none'}")
+    else:
+        st.caption("Not synced yet")
+    
+    sync_col, full_col = st.columns(2)
+    delta_sync = sync_col.button("Sync Changes", key=f"{endpoint_name}_sync")
+    full_sync = full_col.button("Full Resync", key=f"{endpoint_name}_full_sync")
+    if delta_sync or full_sync:
+        with st.spinner(f"Syncing {endpoint_name}..."):
+            try:
+                result = sync_model(client, store, endpoint_name, full=full_sync)
+            except (requests.exceptions.RequestException, *DECODE_ERRORS) as e:
+                st.error(f"Error syncing data: {str(e)}")
+            else:
+                kind = "Delta" if result["delta"] else "Full"
+                removed = f", removed {result['removed']} no longer upstream" if result["removed"] else ""
+                st.success(f"{kind} sync stored {result['upserted']} records{removed}")
+    
+    if st.checkbox("Show stored records", key=f"{endpoint_name}_show_store"):
+        df = model_frame(f"/{endpoint_name}", store.load_records(endpoint_name))
+        if resolve and not df.empty:
+            df = add_reference_names(f"/{endpoint_name}", df, access_token, api_key)
+        st.dataframe(df)
+        st.metric("Total Records", len(df))
+        if not df.empty:
+            aggregator = make_aggregator(df, chart_options)
+            aggregator.add(df)
+            display_time_series(f"/{endpoint_name}", aggregator)
+
+def display_all_models(category: str, access_token: str, api_key: str) -> Dict:
+    """Fetch the first page of every list endpoint in a category concurrently and return the summary."""
+    client = get_client(api_key, access_token)
+    endpoints = {}
+    for endpoint_name, endpoint_info in category_spec(category)["endpoints"].items():
+        list_endpoints = [e for e in endpoint_info["endpoints"] if "{" not in e and "/meta/" not in e]
+        if list_endpoints:
+            endpoints[list_endpoints[0]] = endpoint_name
+    
+    progress = st.progress(0.0, text="Fetching common models...")
+    completed = []
+    
+    def on_result(result: Dict):
+        completed.append(result)
+        progress.progress(len(completed) / len(endpoints), text=f"Fetched {endpoints[result['endpoint']]} ({len(completed)}/{len(endpoints)})")
+    
+    started = time.perf_counter()
+    results = fetch_many(client, list(endpoints), on_result=on_result, fetch=make_cached_fetch(api_key, access_token))
+    wall_time = time.perf_counter() - started
+    
+    summary = pd.DataFrame([
+        {
+            "Model": endpoints[r["endpoint"]],
+            "Status": "error" if r["error"] else "ok",
+            "Records": len(r["data"].get("results") or []) if r["data"] else 0,
+            "Has More": bool(r["data"] and r["data"].get("next")),
+            "Latency (ms)": round(r["elapsed"] * 1000),
+            "Error": r["error"] or "",
+        }
+        for r in results
+    ])
+    models = {
+        "summary": summary,
+        "wall_time": wall_time,
+        "frames": {endpoints[r["endpoint"]]: model_frame(r["endpoint"], r["data"]["results"])
+                   for r in results if r["data"] and r["data"].get("results")},
+    }
+    display_models_summary(models)
+    # Kept for reruns with large frames spilled like tab results
+    frames = {model: spill_frame(f"{category}_all_models:{model}", df) for model, df in models["frames"].items()}
+    return {**models, "frames": frames}
+
+def display_models_summary(models: Dict):
+    """Render the result of fetching every common model."""
+    summary = models["summary"]
+    st.subheader("Common Models Summary")
+    st.dataframe(summary, hide_index=True)
+    st.caption(f"Fetched {len(summary)} models in {models['wall_time'] * 1000:.0f} ms "
+               f"(sum of request latencies {summary['Latency (ms)'].sum()} ms)")
+    
+    for model, df in models["frames"].items():
+        with st.expander(model.title()):
+            df = load_frame(df)
+            if df is None:
+                st.info("This frame was evicted from the result store; fetch all common models again to see it.")
+            else:
+                st.dataframe(df)
 
 def get_post_form(endpoint_name: str, endpoint_info: Dict) -> Dict:
     """Generate a form for POST request data."""
@@ -392,73 +680,176 @@ def get_post_form(endpoint_name: str, endpoint_info: Dict) -> Dict:
     st.subheader("POST Request Data")
     
     # Add integration selector for tickets
+    integration = None
     if endpoint_name == "tickets":
         integration = st.selectbox(
             "Select Integration",
-            ["Teamwork", "Trello", "Wrike", "Zendesk", "Zoho Desk", "Zoho BugTracker", "SpotDraft"],
+            TICKET_INTEGRATIONS,
             help="Select the integration you're using"
         )
         st.write(f"Required fields for {integration} will be marked with *")
+    required = required_fields(endpoint_info["post_fields"], integration)
+    
+    def label(name: str, field_path: str) -> str:
+        return name.replace("_", " ").title() + (" *" if field_path in required else "")
     
     for field, field_type in endpoint_info["post_fields"].items():
-        if field == "integration_params" or field == "remote_fields":
-            continue  # Handle these separately
+        if isinstance(field_type, dict):
+            continue  # Nested objects are handled separately
             
-        if field_type == "boolean":
-            form_data[field] = st.checkbox(field.replace("_", " ").title())
-        elif field_type == "array of UUIDs" or field_type == "array of strings":
+        if field_type.startswith("boolean"):
+            form_data[field] = st.checkbox(label(field, field))
+        elif field_type.startswith("array"):
             input_text = st.text_area(
-                field.replace("_", " ").title(),
+                label(field, field),
                 help="Enter UUIDs or values separated by commas"
             )
             # Split, strip, and filter out empty strings
             form_data[field] = [x.strip() for x in input_text.split(",") if x.strip()] if input_text else []
         elif "UUID" in field_type:
             form_data[field] = st.text_input(
-                field.replace("_", " ").title(),
+                label(field, field),
                 help=f"Enter a valid UUID for {field}"
             )
         elif "enum" in field_type:
             options = field_type.split("(")[1].split(")")[0].split(", ")
             form_data[field] = st.selectbox(
-                field.replace("_", " ").title(),
+                label(field, field),
                 options,
                 help=f"Select {field.replace('_', ' ')}"
             )
         else:
             form_data[field] = st.text_input(
-                field.replace("_", " ").title(),
+                label(field, field),
                 help=f"Enter {field_type} value"
             )
     
-    # Handle integration-specific fields
-    if endpoint_name == "tickets":
-        st.subheader("Integration Parameters")
-        integration_params = {}
-        for param, param_type in endpoint_info["post_fields"]["integration_params"].items():
-            integration_params[param] = st.text_input(
-                param.replace("_", " ").title(),
-                help=f"Enter {param_type}"
-            )
-        if any(integration_params.values()):
-            form_data["integration_params"] = integration_params
-        
-        st.subheader("Remote Fields")
-        remote_fields = {}
-        for field, field_type in endpoint_info["post_fields"]["remote_fields"].items():
-            remote_fields[field] = st.text_input(
-                field.replace("_", " ").title(),
-                help=f"Enter {field_type}"
+    # Nested objects such as integration_params and remote_fields get a section each
+    for field, children in endpoint_info["post_fields"].items():
+        if not isinstance(children, dict):
+            continue
+        st.subheader(NESTED_FIELD_TITLES.get(field, field.replace("_", " ").title()))
+        nested = {}
+        for child, child_type in children.items():
+            nested[child] = st.text_input(
+                label(child, f"{field}.{child}"),
+                key=f"{endpoint_name}_{field}.{child}",
+                help=f"Enter {child_type}"
             )
-        if any(remote_fields.values()):
-            form_data["remote_fields"] = remote_fields
+        if any(nested.values()):
+            form_data[field] = nested
     
     return form_data
 
+def display_bulk_post(endpoint_name: str, endpoint_info: Dict, access_token: str, api_key: str):
+    """Create many objects from an uploaded CSV/JSONL file with a resumable per-row report."""
+    st.subheader("Bulk POST")
+    st.caption("Columns are POST fields; nested fields use dotted names such as `integration_params.department_id` "
+               "and array fields are comma separated.")
+    uploaded = st.file_uploader("Rows File", type=["csv", "jsonl", "ndjson"], key=f"{endpoint_name}_bulk_file")
+    integration = None
+    if endpoint_name == "tickets":
+        integration = st.selectbox("Select Integration", TICKET_INTEGRATIONS, key=f"{endpoint_name}_bulk_integration")
+    workers_col, rate_col = st.columns(2)
+    with workers_col:
+        max_workers = st.number_input("Concurrency", min_value=1, max_value=32, value=BULK_MAX_WORKERS, key=f"{endpoint_name}_bulk_workers")
+    with rate_col:
+        rate = st.number_input("Requests per Second", min_value=0.1, max_value=100.0, value=BULK_RATE_PER_SECOND, key=f"{endpoint_name}_bulk_rate")
+    if uploaded is None:
+        return
+    
+    try:
+        rows = read_rows(uploaded.getvalue(), uploaded.name)
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"Could not read {uploaded.name}: {str(e)}")
+        return
+    report = report_path(endpoint_name, uploaded.name, account_hash(api_key, access_token))
+    st.write(f"{len(rows)} rows loaded. Results are appended to `{report}`, so running the same file again resumes after failures.")
+    if not rows or not st.button(f"POST {len(rows)} rows to /{endpoint_name}", key=f"{endpoint_name}_bulk_submit"):
+        return
+    
+    client = get_client(api_key, access_token)
+    progress = st.progress(0.0, text="Submitting rows...")
+    results = []
+    for result in iter_bulk_post(client, f"/{endpoint_name}", rows, endpoint_info["post_fields"], integration,
+                                 report, int(max_workers), float(rate)):
+        results.append(result)
+        progress.progress(len(results) / len(rows), text=f"Processed {len(results)}/{len(rows)} rows")
+    # Cached reads of this account may now be out of date
+    invalidate_account_caches(api_key, access_token)
+    
+    report_df = pd.DataFrame(results).sort_values("row")
+    counts = report_df["status"].value_counts()
+    for col, status in zip(st.columns(4), ["created", "skipped", "invalid", "error"]):
+        col.metric(status.title(), int(counts.get(status, 0)))
+    st.dataframe(report_df, hide_index=True)
+    st.download_button("Download Report", report_df.to_csv(index=False), file_name=f"{endpoint_name}-bulk-report.csv",
+                       mime="text/csv", key=f"{endpoint_name}_bulk_download")
+
+def download_directory(api_key: str, access_token: str) -> str:
+    """Per-account folder for downloaded attachments."""
+    return os.path.join(DOWNLOAD_DIR, account_hash(api_key, access_token)[:12])
+
+def display_file_download(endpoint: str, access_token: str, api_key: str):
+    """Stream a download endpoint to disk instead of decoding it as JSON."""
+    client = get_client(api_key, access_token)
+    record_id = endpoint.strip("/").split("/")[1]
+    path = os.path.join(download_directory(api_key, access_token), safe_file_name(record_id))
+    result = download_file(client, endpoint, path)
+    if result["status"] == "error":
+        st.error(f"Error downloading file: {result['error']}")
+        return
+    resumed = f", resumed from byte {result['resumed_from']}" if result["resumed_from"] else ""
+    st.success(f"Saved {result['bytes']} bytes to `{path}` ({result['status']}{resumed})")
+    if result["bytes"] <= INLINE_DOWNLOAD_MAX_BYTES:
+        with open(path, "rb") as f:
+            st.download_button("Save File", f, file_name=os.path.basename(path), key=f"{endpoint}_save")
+
+def display_attachment_export(endpoint_name: str, df: pd.DataFrame, access_token: str, api_key: str):
+    """Download every attachment of the tickets (or the attachments) in a tab's last result."""
+    label = "Download all attachments for these tickets" if endpoint_name == "tickets" else "Download these attachments"
+    if not st.button(label, key=f"{endpoint_name}_download_attachments"):
+        return
+    
+    client = get_client(api_key, access_token)
+    if endpoint_name == "tickets":
+        with st.spinner(f"Listing attachments of {len(df)} tickets..."):
+            try:
+                attachments, truncated = list_ticket_attachments(client, df["id"].dropna().tolist())
+            except (requests.exceptions.RequestException, ValueError) as e:
+                st.error(f"Error listing attachments: {str(e)}")
+                return
+        if truncated:
+            st.warning(f"Stopped scanning /attachments after {ATTACHMENT_SCAN_MAX_PAGES} pages, "
+                       "so attachments of some of these tickets may be missing")
+    else:
+        columns = [c for c in ("id", "ticket", "file_name") if c in df.columns]
+        rows = df[columns].astype(object)
+        attachments = rows.where(rows.notna(), None).to_dict("records")
+    if not attachments:
+        st.info("No attachments found")
+        return
+    
+    directory = download_directory(api_key, access_token)
+    progress = st.progress(0.0, text=f"Downloading {len(attachments)} attachments...")
+    results = []
+    for result in iter_downloads(client, attachments, directory):
+        results.append(result)
+        progress.progress(len(results) / len(attachments), text=f"Downloaded {len(results)}/{len(attachments)} attachments")
+    
+    report_df = pd.DataFrame(results)[["ticket", "file_name", "status", "bytes", "resumed_from", "error", "path"]]
+    counts = report_df["status"].value_counts()
+    for col, status in zip(st.columns(4), ["downloaded", "resumed", "skipped", "error"]):
+        col.metric(status.title(), int(counts.get(status, 0)))
+    st.dataframe(report_df, hide_index=True)
+    st.caption(f"{report_df['bytes'].sum() / 1024 / 1024:.1f} MiB under `{directory}`; "
+               "running the export again resumes partial files and skips finished ones")
+
 def display_api_documentation(endpoint_name: str):
     """Display API documentation in a formatted way."""
-    if endpoint_name in API_DOCUMENTATION:
-        doc = API_DOCUMENTATION[endpoint_name]
+    documentation = category_spec()["documentation"]
+    if endpoint_name in documentation:
+        doc = documentation[endpoint_name]
         st.subheader(doc["title"])
         
         # Create a table for the parameters
@@ -474,6 +865,7 @@ def display_api_documentation(endpoint_name: str):
         st.table(pd.DataFrame(params_data))
 
 def main():
+    started = time.perf_counter()
     st.title("Merge API Explorer")
     st.markdown('Note: This is not an official API explorer from [Merge.dev](https://merge.dev)')
     
@@ -483,15 +875,31 @@ def main():
     
     # Sidebar for category selection - simplified design
     st.sidebar.header("API Categories")
-    # Only show 'Ticketing' in the sidebar
+    # Categories are listed without loading them; a category's spec is compiled when it is selected
+    categories = get_registry().categories
     selected_category = st.sidebar.selectbox(
         "Select Category",
-        ["Ticketing"]
+        categories,
+        index=categories.index("Ticketing"),
+        key="category"
     )
-    
+    with st.sidebar.expander("Connection"):
+        st.text_input("Base URL", value=DEFAULT_BASE_URL, key="base_url",
+                      help="Point the explorer at another Merge-compatible server, e.g. the local mock server. "
+                           "Merge URLs follow the selected category.")
+    # Filled in at the end of the run so the counters include this run's requests
+    cache_container = st.sidebar.container()
+    drop_ended_sessions()
+    explore_category(selected_category)
+    display_cache_stats(cache_container)
+    cache_container.caption(f"Full page run: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+def explore_category(selected_category: str):
+    """Render authentication and the endpoint tabs for a category."""
     # Main content area
     st.header(f"{selected_category} API")
-    st.write(API_CATEGORIES[selected_category]["description"])
+    spec = category_spec(selected_category)
+    st.write(spec["description"])
     
     # Authentication inputs
     col1, col2 = st.columns(2)
@@ -508,6 +916,16 @@ def main():
             key="access_token"
         )
     
+    if st.checkbox("Query multiple linked accounts", key="multi_account",
+                   help="Run GET list queries across several account tokens concurrently"):
+        st.text_area("Account Tokens", key="account_tokens",
+                     help="One account token per line, optionally as `label,token`; the first one is also used for single-account features")
+        accounts = selected_accounts()
+        st.caption(f"{len(accounts)} linked accounts")
+        # Detail, POST, sync and download features use the first account
+        if accounts and not access_token:
+            access_token = accounts[0][1]
+    
     # Add submit button
     if st.button("Submit"):
         if api_key and access_token:
@@ -520,51 +938,147 @@ def main():
         return
     
     # Display endpoints for selected category
-    if selected_category in API_CATEGORIES and API_CATEGORIES[selected_category]["endpoints"]:
+    if spec["endpoints"]:
         st.subheader("Available Common Models")
         
+        models_key = f"{selected_category}_all_models"
+        if st.button("Fetch All Common Models", key=f"{selected_category}_fetch_all_models"):
+            st.session_state[models_key] = display_all_models(selected_category, access_token, api_key)
+        elif st.session_state.get(models_key):
+            display_models_summary(st.session_state[models_key])
+        
         # Create tabs for each endpoint type
-        endpoint_types = list(API_CATEGORIES[selected_category]["endpoints"].keys())
+        endpoint_types = list(spec["endpoints"].keys())
         tabs = st.tabs(endpoint_types)
         
         for tab, endpoint_name in zip(tabs, endpoint_types):
             with tab:
-                endpoint_info = API_CATEGORIES[selected_category]["endpoints"][endpoint_name]
-                st.write(endpoint_info["description"])
-                
-                # Display available methods
-                st.write("Available Methods:", ", ".join(endpoint_info["methods"]))
-                
-                # Create a selectbox for available endpoints
-                selected_endpoint = st.selectbox(
-                    f"Select {endpoint_name.title()} Endpoint",
-                    endpoint_info["endpoints"],
-                    key=f"{endpoint_name}_endpoint"
-                )
-                
-                # Method selection
-                method = st.radio(
-                    "Select Method",
-                    endpoint_info["methods"],
-                    key=f"{endpoint_name}_method"
-                )
-                
-                # Get query parameters if method is GET
-                query_params = None
-                if method == "GET":
-                    query_params = get_query_parameters(endpoint_name)
-                
-                # Get POST data if method is POST
-                post_data = None
-                if method == "POST":
-                    post_data = get_post_form(endpoint_name, endpoint_info)
-                
-                if st.button(f"{method} {selected_endpoint}", key=f"{endpoint_name}_fetch"):
-                    with st.spinner(f"Processing {method} request to {selected_endpoint}..."):
-                        display_endpoint_data(selected_endpoint, access_token, api_key, method, post_data, query_params)
+                explore_endpoint(selected_category, endpoint_name, access_token, api_key)
     else:
-        st.info(f"Endpoints for {selected_category} are coming soon!")
+        slug = CATEGORY_SLUGS[selected_category]
+        st.info(f"No endpoints for {selected_category} yet. Save Merge's {selected_category} OpenAPI document as "
+                f"`{os.path.join(OPENAPI_DIR, slug)}.json` (or `.yaml`) to explore it.")
+
+@st.fragment
+def explore_endpoint(category: str, endpoint_name: str, access_token: str, api_key: str):
+    """Render one model tab.
+
+    Runs as a fragment, so interacting with a tab re-executes only that tab. The
+    last result is kept in session state and re-rendered without fetching again.
+    """
+    started = time.perf_counter()
+    spec = category_spec(category)
+    endpoint_info = spec["endpoints"][endpoint_name]
+    st.write(endpoint_info["description"])
+    
+    # Display available methods
+    st.write("Available Methods:", ", ".join(endpoint_info["methods"]))
+    
+    # Create a selectbox for available endpoints
+    selected_endpoint = st.selectbox(
+        f"Select {endpoint_name.title()} Endpoint",
+        endpoint_info["endpoints"],
+        key=f"{endpoint_name}_endpoint"
+    )
+    
+    # Method selection
+    method = st.radio(
+        "Select Method",
+        endpoint_info["methods"],
+        key=f"{endpoint_name}_method"
+    )
+    
+    # Detail endpoints need the id of a record, nested ones the id of their parent
+    path_values = {}
+    for param in spec["paths"][selected_endpoint]:
+        if param == "id":
+            path_values[param] = st.text_input("Record ID", key=f"{endpoint_name}_record_id").strip()
+        else:
+            path_values[param] = st.text_input(param.replace("_", " ").title(), key=f"{endpoint_name}_{param}").strip()
+    missing = [param for param, value in path_values.items() if not value]
+    endpoint_path = selected_endpoint if missing else fill_path(selected_endpoint, path_values)
+    
+    # Get query parameters if method is GET
+    query_params = None
+    fetch_all = False
+    if method == "GET":
+        query_params = get_query_parameters(endpoint_name)
+        # List endpoints can be paginated through with the cursor
+        if "{" not in selected_endpoint:
+            fetch_all = st.checkbox("Fetch all pages", key=f"{endpoint_name}_fetch_all")
+            if fetch_all:
+                page_col, record_col = st.columns(2)
+                with page_col:
+                    max_pages = st.number_input("Max Pages", min_value=1, value=50, key=f"{endpoint_name}_max_pages")
+                with record_col:
+                    max_records = st.number_input("Max Records", min_value=1, value=10000, key=f"{endpoint_name}_max_records")
+    
+    chart_options = None
+    resolve = False
+    if method == "GET":
+        chart_options = get_chart_options(endpoint_name)
+        if any(field in REFERENCE_FIELDS for field in spec["post_fields"].get(endpoint_name, {})):
+            resolve = st.checkbox("Resolve referenced names", key=f"{endpoint_name}_resolve",
+                                  help="Add name columns for referenced users, accounts, contacts, collections and tickets")
+    
+    # Get POST data if method is POST
+    post_data = None
+    bulk_mode = False
+    if method == "POST":
+        bulk_mode = st.checkbox("Bulk mode (CSV/JSONL)", key=f"{endpoint_name}_bulk")
+        if bulk_mode:
+            display_bulk_post(endpoint_name, endpoint_info, access_token, api_key)
+        else:
+            post_data = get_post_form(endpoint_name, endpoint_info)
+    post_errors = validate_post(spec["validators"].get(endpoint_name, {}), post_data) if post_data else []
+    
+    result_key = f"{category}_{endpoint_name}_last_result"
+    # List queries run across every linked account in multi-account mode
+    accounts = selected_accounts() if method == "GET" and "{" not in selected_endpoint else []
+    label = f"{method} {selected_endpoint}" + (f" across {len(accounts)} accounts" if accounts else "")
+    last_result = st.session_state.get(result_key)
+    # The frame of the tab's result, loaded at most once per run
+    frame = None
+    if not bulk_mode and st.button(label, key=f"{endpoint_name}_fetch"):
+        result = last_result
+        with st.spinner(f"Processing {method} request to {selected_endpoint}..."):
+            if missing:
+                st.error("Please enter a Record ID" if "id" in missing else f"Please enter {missing[0].replace('_', ' ').title()}")
+            elif post_errors:
+                for error in post_errors:
+                    st.error(error)
+            elif is_download_endpoint(selected_endpoint):
+                display_file_download(endpoint_path, access_token, api_key)
+            elif accounts:
+                result = display_fanout(selected_endpoint, accounts, api_key, query_params,
+                                        int(max_pages) if fetch_all else 1,
+                                        int(max_records) if fetch_all else None, chart_options, resolve)
+            elif fetch_all:
+                result = display_all_pages(selected_endpoint, access_token, api_key, query_params, int(max_pages), int(max_records), chart_options, resolve)
+            else:
+                result = display_endpoint_data(endpoint_path, access_token, api_key, method, post_data, query_params, chart_options, resolve)
+        if result is not last_result:
+            # Large frames are spilled to the result store; this run keeps using the in-memory one
+            st.session_state[result_key] = store_result(result_key, result)
+            frame = result["frame"] if result else None
+        elif last_result:
+            frame = load_frame(last_result["frame"])
+    elif not bulk_mode and last_result:
+        frame = display_last_result(last_result, chart_options)
+    elif last_result:
+        frame = load_frame(last_result["frame"])
+    
+    if endpoint_name in ("tickets", "attachments") and frame is not None and "id" in frame.columns:
+        display_attachment_export(endpoint_name, frame, access_token, api_key)
+    
+    if method == "GET" and f"/{endpoint_name}" in endpoint_info["endpoints"]:
+        display_sync_store(endpoint_name, access_token, api_key, chart_options, resolve)
+    st.caption(f"Tab ran in {(time.perf_counter() - started) * 1000:.0f} ms")
 
 if __name__ == "__main__":
+    # `python merge_api_explorer.py export ...` runs a headless export instead of the app
+    if len(sys.argv) > 1 and sys.argv[1] == "export":
+        import export
+        sys.exit(export.main(sys.argv[2:]))
     main()
 
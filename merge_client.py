@@ -0,0 +1,281 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from streaming import loads
+from metrics import current_trace, record_info, timed_phase
+from rate_limit import RATE_LIMITS, RateLimiterRegistry
+
+DEFAULT_BASE_URL = os.environ.get("MERGE_BASE_URL", "https://api.merge.dev/api/ticketing/v1")
+
+# Connection pool and retry settings (overridable through the environment)
+POOL_CONNECTIONS = int(os.environ.get("MERGE_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.environ.get("MERGE_POOL_MAXSIZE", "16"))
+MAX_RETRIES = int(os.environ.get("MERGE_MAX_RETRIES", "4"))
+BACKOFF_FACTOR = float(os.environ.get("MERGE_BACKOFF_FACTOR", "0.5"))
+MAX_BACKOFF = float(os.environ.get("MERGE_MAX_BACKOFF", "30"))
+REQUEST_TIMEOUT = float(os.environ.get("MERGE_REQUEST_TIMEOUT", "30"))
+# Maximum number of in-flight requests per linked account
+ACCOUNT_CONCURRENCY = int(os.environ.get("MERGE_ACCOUNT_CONCURRENCY", "4"))
+
+# Statuses that are safe to retry for any method (the request was not processed)
+RETRY_ALWAYS_STATUSES = {429}
+# Statuses that are only retried for idempotent methods
+RETRY_IDEMPOTENT_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+def normalize_query_params(query_params: Dict = None) -> Dict:
+    """Convert query parameter values into strings the API accepts."""
+    processed_params = {}
+    for key, value in (query_params or {}).items():
+        if value is None or value == "":
+            continue
+        if hasattr(value, 'isoformat'):  # Check if it's a datetime object
+            processed_params[key] = value.isoformat()
+        elif isinstance(value, bool):
+            processed_params[key] = "true" if value else "false"
+        else:
+            processed_params[key] = value
+    return processed_params
+
+def hash_credentials(*values: str) -> str:
+    """Hash credentials so raw tokens never appear in cache or rate-limit keys."""
+    digest = hashlib.sha256()
+    for value in values:
+        digest.update(value.strip().encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        with timed_phase("connect"):
+            super().connect()
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        with timed_phase("connect"):
+            super().connect()
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections report TCP/TLS setup time as the "connect" phase."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+class MergeClient:
+    """Keep-alive HTTP client for one (API key, account token) pair."""
+
+    def __init__(self, api_key: str, access_token: str, base_url: str = DEFAULT_BASE_URL,
+                 pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 max_retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR,
+                 timeout: float = REQUEST_TIMEOUT, max_concurrency: int = ACCOUNT_CONCURRENCY,
+                 rate_limits: RateLimiterRegistry = RATE_LIMITS):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        # Buckets are shared with every other client for the same org or linked account
+        self.org_bucket = rate_limits.org(hash_credentials(api_key))
+        self.account_bucket = rate_limits.account(hash_credentials(api_key, access_token))
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0}
+
+        self.session = requests.Session()
+        # Retries are handled in request() so that 429 Retry-After is honoured for every method
+        adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key.strip()}",
+            "X-Account-Token": access_token.strip(),
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+    def url(self, endpoint: str) -> str:
+        """Build the absolute URL for an endpoint path."""
+        return f"{self.base_url}{endpoint}"
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        return min(MAX_BACKOFF, self.backoff_factor * (2 ** attempt))
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a request, retrying throttled and transient failures with exponential backoff.
+
+        Inside a `metrics.trace_request` block the body is streamed, so that time to
+        first byte and download are recorded as separate phases.
+        """
+        method = method.upper()
+        kwargs.setdefault("timeout", self.timeout)
+        trace = current_trace()
+        if trace is not None:
+            kwargs.setdefault("stream", True)
+        url = endpoint if endpoint.startswith("http") else self.url(endpoint)
+        attempt = 0
+        while True:
+            self._count("requests")
+            with timed_phase("queue"):
+                self.org_bucket.acquire()
+                self.account_bucket.acquire()
+            try:
+                with self._slots:
+                    connect_before = trace.phases.get("connect", 0.0) if trace is not None else 0.0
+                    started = time.perf_counter()
+                    response = self.session.request(method, url, **kwargs)
+                    if trace is not None:
+                        # Connection setup is already counted in its own phase
+                        connect = trace.phases.get("connect", 0.0) - connect_before
+                        trace.add("ttfb", time.perf_counter() - started - connect)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if method not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                self._count("retries")
+                continue
+
+            self.account_bucket.update_from_headers(response.headers)
+            record_info(status=response.status_code, attempts=attempt + 1)
+            if response.status_code == 429:
+                self._count("throttled")
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                # Pause every queued request for this account, not just this one
+                self.account_bucket.penalize(min(MAX_BACKOFF, retry_after) if retry_after is not None else self._backoff(attempt))
+            retryable = response.status_code in RETRY_ALWAYS_STATUSES or (
+                response.status_code in RETRY_IDEMPOTENT_STATUSES and method in IDEMPOTENT_METHODS
+            )
+            if not retryable or attempt >= self.max_retries:
+                return response
+
+            # Release the connection back to the pool before waiting
+            response.close()
+            if response.status_code != 429:
+                # Throttled retries wait in the account bucket's acquire() instead
+                time.sleep(self._backoff(attempt))
+            attempt += 1
+            self._count("retries")
+
+    def get(self, endpoint: str, params: Dict = None, **kwargs) -> requests.Response:
+        """GET an endpoint with normalized query parameters."""
+        return self.request("GET", endpoint, params=normalize_query_params(params), **kwargs)
+
+    def post(self, endpoint: str, payload: Any = None, **kwargs) -> requests.Response:
+        """POST a JSON payload to an endpoint."""
+        return self.request("POST", endpoint, json=payload, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+def fetch_page(client: MergeClient, endpoint: str, params: Dict = None) -> Dict:
+    """Fetch and decode a single page of a list endpoint."""
+    response = client.get(endpoint, params=params)
+    return decode_response(response)
+
+def decode_response(response: requests.Response) -> Any:
+    """Read and decode a JSON response, recording download/decode time and sizes."""
+    with timed_phase("download"):
+        content = response.content
+    record_info(bytes=len(content), wire_bytes=int(response.headers.get("Content-Length") or len(content)))
+    response.raise_for_status()
+    with timed_phase("decode"):
+        return loads(content)
+
+def iter_pages(client: MergeClient, endpoint: str, params: Dict = None, max_pages: int = None,
+               max_records: int = None) -> Iterator[Dict]:
+    """Yield pages of a list endpoint, following `next` cursors and prefetching one page ahead.
+
+    Stops after `max_pages` pages or once `max_records` records have been yielded; the
+    last page is trimmed so the record budget is never exceeded.
+    """
+    params = dict(params or {})
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="merge-prefetch")
+    pending = executor.submit(fetch_page, client, endpoint, params)
+    pages = 0
+    records = 0
+    try:
+        while pending is not None:
+            page = pending.result()
+            pages += 1
+            results = page.get("results") or []
+            if max_records is not None and records + len(results) >= max_records:
+                page = {**page, "results": results[:max_records - records]}
+                cursor = None
+            elif max_pages is not None and pages >= max_pages:
+                cursor = None
+            else:
+                cursor = page.get("next")
+            # Start downloading the next page before the caller processes this one
+            pending = executor.submit(fetch_page, client, endpoint, {**params, "cursor": cursor}) if cursor else None
+            records += len(page.get("results") or [])
+            yield page
+    finally:
+        if pending is not None:
+            pending.cancel()
+        executor.shutdown(wait=False)
+
+def fetch_many(client: MergeClient, endpoints: List[str], params: Dict = None, max_workers: int = None,
+               on_result: Callable[[Dict], None] = None, fetch: Callable[..., Dict] = fetch_page) -> List[Dict]:
+    """Fetch several endpoints concurrently for one account.
+
+    Concurrency is bounded by the thread pool and by the client's per-account slots.
+    Each result is a dict with the endpoint, decoded data or error, and latency in
+    seconds; `on_result` is called as each one completes. `fetch` defaults to an
+    uncached `fetch_page`.
+    """
+    def fetch_one(endpoint: str) -> Dict:
+        started = time.perf_counter()
+        try:
+            data = fetch(client, endpoint, params)
+            error = None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            data = None
+            error = str(e)
+        return {"endpoint": endpoint, "data": data, "error": error, "elapsed": time.perf_counter() - started}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers or ACCOUNT_CONCURRENCY, thread_name_prefix="merge-fetch") as executor:
+        futures = [executor.submit(fetch_one, endpoint) for endpoint in endpoints]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    # Keep the caller's ordering regardless of completion order
+    order = {endpoint: i for i, endpoint in enumerate(endpoints)}
+    return sorted(results, key=lambda r: order[r["endpoint"]])
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Phases in the order they happen for one request
+PHASES = ["queue", "connect", "ttfb", "download", "decode", "resolve", "frame", "snapshot", "index", "aggregate", "render"]
+SECONDS_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+BYTES_BUCKETS = [1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864]
+# Number of recent traces kept for rolling percentiles and JSONL export
+ROLLING_WINDOW = int(os.environ.get("MERGE_METRICS_WINDOW", "500"))
+# When set, every finished trace is appended to this JSONL file
+TRACE_FILE = os.environ.get("MERGE_TRACE_FILE")
+
+_local = threading.local()
+
+class RequestTrace:
+    """Per-phase timings and sizes of one explorer request."""
+
+    def __init__(self, endpoint: str, method: str = "GET"):
+        self.endpoint = endpoint
+        self.method = method
+        self.started_at = time.time()
+        self.phases: Dict[str, float] = {}
+        self.info: Dict = {}
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def to_dict(self) -> Dict:
+        return {"endpoint": self.endpoint, "method": self.method, "started_at": self.started_at,
+                "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()}, **self.info}
+
+def current_trace() -> Optional[RequestTrace]:
+    """Return the trace active on this thread, if any."""
+    return getattr(_local, "trace", None)
+
+def record_phase(phase: str, seconds: float):
+    """Add time to a phase of the active trace; a no-op outside `trace_request`."""
+    trace = current_trace()
+    if trace is not None:
+        trace.add(phase, seconds)
+
+def record_info(**info):
+    trace = current_trace()
+    if trace is not None:
+        trace.info.update(info)
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """Time a block into the active trace's phase."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started)
+
+class Histogram:
+    """Cumulative Prometheus-style histogram."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def prometheus(self, name: str, labels: Dict[str, str] = None) -> List[str]:
+        def label_set(extra: Dict = None) -> str:
+            pairs = {**(labels or {}), **(extra or {})}
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs.items()) + "}" if pairs else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ["+Inf"], self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{label_set({'le': bound})} {cumulative}")
+        lines.append(f"{name}_sum{label_set()} {self.sum}")
+        lines.append(f"{name}_count{label_set()} {self.count}")
+        return lines
+
+class MetricsRegistry:
+    """Process-wide request metrics: cumulative histograms plus a rolling window of traces."""
+
+    def __init__(self, window: int = ROLLING_WINDOW, trace_file: Optional[str] = TRACE_FILE):
+        self.phase_seconds = {phase: Histogram(SECONDS_BUCKETS) for phase in PHASES}
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self.recent = deque(maxlen=window)
+        self.trace_file = trace_file
+        self._lock = threading.Lock()
+
+    def observe(self, trace: RequestTrace):
+        entry = trace.to_dict()
+        with self._lock:
+            for phase, seconds in trace.phases.items():
+                self.phase_seconds.setdefault(phase, Histogram(SECONDS_BUCKETS)).observe(seconds)
+            if "bytes" in trace.info:
+                self.response_bytes.observe(trace.info["bytes"])
+            self.recent.append(entry)
+            if self.trace_file:
+                with open(self.trace_file, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def rolling_percentiles(self) -> List[Dict]:
+        """p50/p95/p99 per phase over the recent window, in milliseconds."""
+        with self._lock:
+            recent = list(self.recent)
+        rows = []
+        for phase in PHASES:
+            samples = sorted(t["phases"][phase] for t in recent if phase in t["phases"])
+            if samples:
+                pick = lambda pct: samples[min(len(samples) - 1, int(pct / 100 * len(samples)))] * 1000  # noqa: E731
+                rows.append({"phase": phase, "samples": len(samples), "p50 ms": round(pick(50), 1),
+                             "p95 ms": round(pick(95), 1), "p99 ms": round(pick(99), 1)})
+        return rows
+
+    def prometheus_text(self) -> str:
+        """Render the cumulative histograms in Prometheus text exposition format."""
+        lines = ["# HELP merge_explorer_phase_seconds Time spent in each phase of an explorer request.",
+                 "# TYPE merge_explorer_phase_seconds histogram"]
+        with self._lock:
+            for phase, histogram in self.phase_seconds.items():
+                if histogram.count:
+                    lines.extend(histogram.prometheus("merge_explorer_phase_seconds", {"phase": phase}))
+            lines += ["# HELP merge_explorer_response_bytes Decoded response body size.",
+                      "# TYPE merge_explorer_response_bytes histogram"]
+            lines.extend(self.response_bytes.prometheus("merge_explorer_response_bytes"))
+        return "\n".join(lines) + "\n"
+
+    def traces_jsonl(self) -> str:
+        with self._lock:
+            return "".join(json.dumps(entry) + "\n" for entry in self.recent)
+
+# Shared by every session in this process
+METRICS = MetricsRegistry()
+
+@contextmanager
+def trace_request(endpoint: str, method: str = "GET", registry: MetricsRegistry = METRICS) -> Iterator[RequestTrace]:
+    """Make a trace active on this thread for the duration of a request and record it afterwards."""
+    previous = current_trace()
+    trace = RequestTrace(endpoint, method)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+        registry.observe(trace)
@@ -0,0 +1,291 @@
+"""Local stand-in for the Merge Ticketing API, for benchmarks and offline development.
+
+    python mock_server.py --port 8765 --records 5000 --latency-ms 50 --error-rate 0.05
+
+Then set the explorer's base URL (sidebar or MERGE_BASE_URL) to
+http://127.0.0.1:8765/api/ticketing/v1. Every model in API_CATEGORIES["Ticketing"]
+is served with cursor pagination, detail and POST endpoints, and attachment downloads.
+"""
+import json
+import time
+import uuid
+import base64
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qsl, urlparse
+
+from api_spec import API_CATEGORIES
+
+BASE_PATH = "/api/ticketing/v1"
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+STATUSES = ["OPEN", "CLOSED", "IN_PROGRESS", "ON_HOLD"]
+PRIORITIES = ["URGENT", "HIGH", "NORMAL", "LOW"]
+
+def model_id(model: str, index: int) -> str:
+    """Deterministic UUID for the index-th record of a model."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"merge-mock/{model}/{index}"))
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o={offset}".encode()).decode()
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode().split("=", 1)[1])
+    except (ValueError, IndexError):
+        return 0
+
+class MockDataset:
+    """Deterministic synthetic records for every Ticketing model, cross-referenced by id."""
+
+    def __init__(self, records: int = 1000, payload_kb: float = 0, seed: int = 7):
+        self.records = records
+        self.padding = "x" * int(payload_kb * 1024)
+        self.counts = {model: records if model in ("tickets", "comments", "attachments") else max(1, records // 20)
+                       for model in API_CATEGORIES["Ticketing"]["endpoints"]}
+        self.random = random.Random(seed)
+        self.models = {model: [self._record(model, i) for i in range(count)] for model, count in self.counts.items()}
+        self.index = {model: {r["id"]: r for r in rows} for model, rows in self.models.items()}
+        self.lock = threading.Lock()
+
+    def _ref(self, model: str) -> str:
+        return model_id(model, self.random.randrange(self.counts[model]))
+
+    def _record(self, model: str, i: int) -> Dict:
+        created = EPOCH + timedelta(minutes=37 * i + self.random.randrange(30))
+        record = {
+            "id": model_id(model, i),
+            "remote_id": str(10000 + i),
+            "created_at": created.isoformat().replace("+00:00", "Z"),
+            "modified_at": (created + timedelta(hours=self.random.randrange(240))).isoformat().replace("+00:00", "Z"),
+            "remote_was_deleted": False,
+            "field_mappings": None,
+            "remote_data": [{"path": f"/{model}", "data": {"blob": self.padding}}] if self.padding else None,
+        }
+        if model == "tickets":
+            record.update({
+                "name": f"Ticket {i}",
+                "description": f"Synthetic ticket number {i}",
+                "status": self.random.choice(STATUSES),
+                "priority": self.random.choice(PRIORITIES),
+                "assignees": [self._ref("users") for _ in range(self.random.randrange(3))],
+                "account": self._ref("accounts"),
+                "contact": self._ref("contacts"),
+                "creator": self._ref("users"),
+                "collections": [self._ref("collections")],
+                "parent_ticket": model_id("tickets", self.random.randrange(i)) if i and self.random.random() < 0.1 else None,
+                "tags": self.random.sample(["billing", "bug", "vip", "outage", "feature"], self.random.randrange(3)),
+                "remote_created_at": record["created_at"],
+                "remote_updated_at": record["modified_at"],
+                "due_date": (created + timedelta(days=7)).isoformat().replace("+00:00", "Z"),
+                "ticket_url": f"https://example.com/tickets/{i}",
+            })
+        elif model == "comments":
+            record.update({"body": f"Comment {i} on a ticket", "is_private": i % 5 == 0,
+                           "ticket": model_id("tickets", i % self.records), "user": self._ref("users")})
+        elif model == "attachments":
+            record.update({"file_name": f"evidence-{i}.txt", "content_type": "text/plain",
+                           "ticket": model_id("tickets", i % self.records),
+                           "file_url": f"https://example.com/files/{i}"})
+        elif model == "users":
+            record.update({"name": f"User {i}", "email_address": f"user{i}@example.com", "is_active": True})
+        elif model == "contacts":
+            record.update({"name": f"Contact {i}", "email_address": f"contact{i}@example.com"})
+        else:
+            record["name"] = f"{model.rstrip('s').title()} {i}"
+        return record
+
+    def attachment_body(self, record_id: str) -> bytes:
+        """Deterministic file contents for an attachment download."""
+        return (f"attachment {record_id}\n" * 2048).encode()
+
+    def create(self, model: str, payload: Dict) -> Dict:
+        data = payload.get("model", payload)
+        with self.lock:
+            record = {**data, "id": str(uuid.uuid4()),
+                      "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")}
+            record["modified_at"] = record["created_at"]
+            self.models.setdefault(model, []).append(record)
+            self.index.setdefault(model, {})[record["id"]] = record
+        return record
+
+class MockMergeServer:
+    """Threaded HTTP server speaking enough of the Merge Ticketing API for the explorer.
+
+    `latency` delays every response, `error_rate` is the fraction of requests that get
+    a 429 with `Retry-After: retry_after`.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, records: int = 1000, page_size: int = 100,
+                 latency: float = 0.0, payload_kb: float = 0, error_rate: float = 0.0, retry_after: float = 0.1):
+        self.dataset = MockDataset(records, payload_kb)
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.throttled = 0
+        self._random = random.Random(11)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="merge-mock")
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_throttle(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.throttled += 1
+                return True
+        return False
+
+    def list_page(self, model: str, query: Dict) -> Dict:
+        rows: List[Dict] = self.dataset.models[model]
+        for param, field, keep in (("modified_after", "modified_at", lambda v, t: v > t),
+                                   ("modified_before", "modified_at", lambda v, t: v < t),
+                                   ("created_after", "created_at", lambda v, t: v > t),
+                                   ("created_before", "created_at", lambda v, t: v < t)):
+            if query.get(param):
+                threshold = datetime.fromisoformat(query[param].replace("Z", "+00:00"))
+                if threshold.tzinfo is None:
+                    threshold = threshold.replace(tzinfo=timezone.utc)
+                rows = [r for r in rows if keep(datetime.fromisoformat(r[field].replace("Z", "+00:00")), threshold)]
+        if query.get("ticket_id"):
+            rows = [r for r in rows if r.get("ticket") == query["ticket_id"]]
+        offset = decode_cursor(query["cursor"]) if query.get("cursor") else 0
+        page_size = int(query.get("page_size") or self.page_size)
+        page = rows[offset:offset + page_size]
+        if query.get("include_remote_data") != "true":
+            page = [{**r, "remote_data": None} for r in page]
+        return {
+            "next": encode_cursor(offset + page_size) if offset + page_size < len(rows) else None,
+            "previous": encode_cursor(max(0, offset - page_size)) if offset else None,
+            "results": page,
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this, delayed ACKs add ~40 ms per response
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json", headers: Dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._should_throttle():
+                    self._send(429, b'{"detail": "Request was throttled."}', headers={"Retry-After": str(server.retry_after)})
+                    return None
+                url = urlparse(self.path)
+                if not url.path.startswith(BASE_PATH):
+                    self._send(404, b'{"detail": "Not found."}')
+                    return None
+                parts = [p for p in url.path[len(BASE_PATH):].split("/") if p]
+                if not parts or parts[0] not in server.dataset.models:
+                    self._send(404, b'{"detail": "Not found."}')
+                    return None
+                return parts, dict(parse_qsl(url.query))
+
+            def do_GET(self):
+                routed = self._route()
+                if routed is None:
+                    return
+                parts, query = routed
+                model = parts[0]
+                if len(parts) == 1:
+                    self._send(200, json.dumps(server.list_page(model, query)).encode())
+                    return
+                record = server.dataset.index[model].get(parts[1])
+                if record is None:
+                    self._send(404, b'{"detail": "Not found."}')
+                elif len(parts) == 3 and parts[2] == "download" and model == "attachments":
+                    self._send_download(record)
+                else:
+                    self._send(200, json.dumps(record).encode())
+
+            def _send_download(self, record: Dict):
+                body = server.dataset.attachment_body(record["id"])
+                start = 0
+                range_header = self.headers.get("Range", "")
+                if range_header.startswith("bytes="):
+                    start = int(range_header[6:].split("-")[0] or 0)
+                if start:
+                    headers = {"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}", "Accept-Ranges": "bytes"}
+                    self._send(206, body[start:], "application/octet-stream", headers)
+                else:
+                    self._send(200, body, "application/octet-stream", {"Accept-Ranges": "bytes"})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                routed = self._route()
+                if routed is None:
+                    return
+                parts, _ = routed
+                try:
+                    payload = json.loads(body or b"{}")
+                except ValueError:
+                    self._send(400, b'{"detail": "Invalid JSON."}')
+                    return
+                record = server.dataset.create(parts[0], payload)
+                self._send(201, json.dumps({"model": record, "warnings": [], "errors": []}).encode())
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--records", type=int, default=1000, help="Tickets, comments and attachments; other models get 1/20th")
+    parser.add_argument("--page-size", type=int, default=100, help="Default page size when the client sends none")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--payload-kb", type=float, default=0, help="remote_data padding per record (include_remote_data=true)")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    args = parser.parse_args()
+    server = MockMergeServer(args.host, args.port, args.records, args.page_size, args.latency_ms / 1000,
+                             args.payload_kb, args.error_rate, args.retry_after)
+    print(f"Serving mock Merge Ticketing API at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from api_spec import API_CATEGORIES, API_DOCUMENTATION
+from frames import enum_options
+
+# Merge OpenAPI documents, saved as <slug>.json or <slug>.yaml, e.g. openapi/hris.yaml
+OPENAPI_DIR = os.environ.get("MERGE_OPENAPI_DIR", "openapi")
+OPENAPI_CACHE_DIR = os.environ.get("MERGE_OPENAPI_CACHE_DIR", ".merge_openapi")
+# Bump when the compiled form changes so stale cache files are ignored
+REGISTRY_VERSION = 2
+
+# URL path segment of each category in Merge's API, e.g. /api/filestorage/v1
+CATEGORY_SLUGS = {
+    "HRIS": "hris",
+    "ATS": "ats",
+    "Accounting": "accounting",
+    "Ticketing": "ticketing",
+    "CRM": "crm",
+    "File Storage": "filestorage",
+}
+
+BASE_URL_PATTERN = re.compile(rf"/api/(?:{'|'.join(CATEGORY_SLUGS.values())})/(v\d+)$")
+PATH_PARAM_PATTERN = re.compile(r"\{(\w+)\}")
+UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+REQUIRED = " (Required for all integrations)"
+
+def category_base_url(base_url: str, category: str) -> str:
+    """Point a base URL ending in a category path such as /api/ticketing/v1 at a category.
+
+    The host is not checked, so a mock or proxy with the same layout is rewritten too;
+    URLs that do not end in /api/<category slug>/vN are returned unchanged.
+    """
+    return BASE_URL_PATTERN.sub(lambda m: f"/api/{CATEGORY_SLUGS[category]}/{m.group(1)}", base_url)
+
+def path_params(templates: List[str]) -> Dict[str, List[str]]:
+    """Map each path template to the names of its path parameters, in order."""
+    return {template: PATH_PARAM_PATTERN.findall(template) for template in templates}
+
+def fill_path(template: str, values: Dict[str, str]) -> str:
+    """Substitute path parameters, escaping them so an id cannot change the path."""
+    return PATH_PARAM_PATTERN.sub(lambda m: quote(values[m.group(1)], safe=""), template)
+
+def field_validator(field_type) -> Optional[tuple]:
+    """Turn a post_fields type description into a (kind, argument) check, or None if any value is accepted."""
+    if isinstance(field_type, dict):
+        return None
+    if field_type.startswith("enum"):
+        return ("enum", frozenset(enum_options(field_type)))
+    if field_type.startswith("array of UUIDs"):
+        return ("uuids", None)
+    if "UUID" in field_type:
+        return ("uuid", None)
+    if "ISO 8601" in field_type:
+        return ("datetime", None)
+    if field_type.startswith(("integer", "number")):
+        return ("number", None)
+    return None
+
+def compile_validators(post_fields: Dict) -> Dict[str, tuple]:
+    validators = {field: field_validator(field_type) for field, field_type in post_fields.items()}
+    return {field: check for field, check in validators.items() if check is not None}
+
+def validate_post(validators: Dict[str, tuple], data: Dict) -> List[str]:
+    """Return a message for every filled-in field whose value does not match its type."""
+    errors = []
+    for field, value in (data or {}).items():
+        check = validators.get(field)
+        if check is None or value in (None, "", []):
+            continue
+        kind, options = check
+        if kind == "enum" and value not in options:
+            errors.append(f"{field}: {value!r} is not one of {', '.join(sorted(options))}")
+        elif kind == "uuid" and not UUID_PATTERN.fullmatch(str(value)):
+            errors.append(f"{field}: {value!r} is not a UUID")
+        elif kind == "uuids" and not all(UUID_PATTERN.fullmatch(str(v)) for v in value):
+            errors.append(f"{field}: every value must be a UUID")
+        elif kind == "datetime":
+            try:
+                datetime.fromisoformat(str(value))
+            except ValueError:
+                errors.append(f"{field}: {value!r} is not an ISO 8601 date")
+        elif kind == "number":
+            try:
+                float(value)
+            except (TypeError, ValueError):
+                errors.append(f"{field}: {value!r} is not a number")
+    return errors
+
+def _resolve(spec: Dict, schema: Dict) -> Dict:
+    """Follow $ref and unwrap allOf/oneOf/anyOf to the first schema that is not null."""
+    for _ in range(20):
+        if "$ref" in schema:
+            node = spec
+            for part in schema["$ref"].lstrip("#/").split("/"):
+                node = node.get(part, {})
+            schema = node
+            continue
+        for key in ("allOf", "oneOf", "anyOf"):
+            options = [s for s in schema.get(key, []) if s.get("type") != "null"]
+            if options:
+                schema = options[0]
+                break
+        else:
+            return schema
+    return schema
+
+def _field_type(spec: Dict, schema: Dict, required: bool = False, nested: bool = True):
+    """Describe an OpenAPI property in the post_fields format of api_spec."""
+    schema = _resolve(spec, schema)
+    kind, fmt = schema.get("type"), schema.get("format")
+    if "enum" in schema:
+        description = f"enum ({', '.join(str(v) for v in schema['enum'] if v not in (None, ''))})"
+    elif kind == "array":
+        items = _resolve(spec, schema.get("items", {}))
+        description = "array of UUIDs" if items.get("format") == "uuid" else "array of strings"
+    elif kind == "object" and schema.get("properties") and nested:
+        children = set(schema.get("required", []))
+        return {name: _field_type(spec, child, name in children, nested=False)
+                for name, child in schema["properties"].items() if not child.get("readOnly")}
+    elif kind == "boolean":
+        description = "boolean"
+    elif fmt == "uuid":
+        description = "string (UUID)"
+    elif fmt in ("date-time", "date"):
+        description = "string (ISO 8601 date)"
+    elif kind in ("integer", "number"):
+        description = kind
+    elif kind == "object":
+        description = "object (JSON)"
+    else:
+        description = "string"
+    return description + REQUIRED if required else description
+
+def _param_type(spec: Dict, schema: Dict) -> str:
+    schema = _resolve(spec, schema or {})
+    if schema.get("format") == "date-time":
+        return "DateTime (ISO 8601)"
+    return {"boolean": "Boolean", "integer": "Integer"}.get(schema.get("type"), "String")
+
+def _json_schema(spec: Dict, content: Dict) -> Dict:
+    return _resolve(spec, (content or {}).get("application/json", {}).get("schema", {}))
+
+def compile_openapi(spec: Dict, category: str) -> Dict:
+    """Compile an OpenAPI document into the endpoint, documentation and post_fields form the explorer uses.
+
+    Every path is grouped by its first segment; a group becomes a model when its list
+    path answers GET with a paginated `results` payload, which leaves out account
+    management routes such as /link-token or /passthrough.
+    """
+    groups: Dict[str, List[str]] = {}
+    for path in spec.get("paths", {}):
+        groups.setdefault(path.strip("/").split("/")[0], []).append(path)
+
+    endpoints, documentation, post_fields = {}, {}, {}
+    for model, paths in groups.items():
+        list_item = spec["paths"].get(f"/{model}", {})
+        list_get = list_item.get("get")
+        if not list_get:
+            continue
+        listing = _json_schema(spec, list_get.get("responses", {}).get("200", {}).get("content"))
+        if "results" not in listing.get("properties", {}):
+            continue
+
+        methods = ["GET"]
+        if "post" in list_item:
+            methods.append("POST")
+        if any("patch" in spec["paths"][path] for path in paths):
+            methods.append("PATCH")
+        description = (list_get.get("summary") or list_get.get("description") or f"Retrieve {model}").strip().split("\n")[0]
+        endpoints[model] = {"description": description.replace("`", ""), "methods": methods, "endpoints": paths}
+
+        parameters = []
+        for param in list_item.get("parameters", []) + list_get.get("parameters", []):
+            param = _resolve(spec, param)
+            if param.get("in") != "query":
+                continue
+            parameters.append({
+                "name": param["name"],
+                "type": _param_type(spec, param.get("schema")),
+                "required": "Required" if param.get("required") else "Optional",
+                "description": (param.get("description") or "").strip(),
+            })
+        documentation[model] = {"title": "API Documentation", "parameters": sorted(parameters, key=lambda p: p["name"])}
+
+        if "post" in list_item:
+            body = _json_schema(spec, list_item["post"].get("requestBody", {}).get("content"))
+            # Merge wraps the writable fields in a `model` object next to options such as is_debug_mode
+            if "model" in body.get("properties", {}):
+                body = _resolve(spec, body["properties"]["model"])
+            required = set(body.get("required", []))
+            fields = {name: _field_type(spec, schema, name in required)
+                      for name, schema in body.get("properties", {}).items() if not schema.get("readOnly")}
+            endpoints[model]["post_fields"] = post_fields[model] = fields
+
+    return {
+        "description": API_CATEGORIES[category]["description"],
+        "endpoints": endpoints,
+        "documentation": documentation,
+        "post_fields": post_fields,
+        "paths": path_params([path for paths in groups.values() for path in paths]),
+        "validators": {model: compile_validators(fields) for model, fields in post_fields.items()},
+    }
+
+def compile_builtin(category: str) -> Dict:
+    """Compile the hand-written api_spec entry of a category into the same form."""
+    endpoints = API_CATEGORIES[category]["endpoints"]
+    post_fields = {model: info["post_fields"] for model, info in endpoints.items() if "post_fields" in info}
+    return {
+        "description": API_CATEGORIES[category]["description"],
+        "endpoints": endpoints,
+        "documentation": {model: API_DOCUMENTATION[model] for model in endpoints if model in API_DOCUMENTATION},
+        "post_fields": post_fields,
+        "paths": path_params([path for info in endpoints.values() for path in info["endpoints"]]),
+        "validators": {model: compile_validators(fields) for model, fields in post_fields.items()},
+    }
+
+def load_document(path: str) -> Dict:
+    if path.endswith((".yaml", ".yml")):
+        # PyYAML is only needed for YAML documents
+        import yaml
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+class EndpointRegistry:
+    """Endpoint specs of every category, compiled on first use.
+
+    A category with a local OpenAPI document is compiled from it; one without keeps
+    its hand-written entry from api_spec. Compiled documents are pickled next to a
+    key made from the document's path, size and modification time, so later
+    processes load them without parsing the document again.
+    """
+
+    def __init__(self, spec_dir: str = OPENAPI_DIR, cache_dir: str = OPENAPI_CACHE_DIR):
+        self.spec_dir = spec_dir
+        self.cache_dir = cache_dir
+        self._compiled: Dict[str, Dict] = {}
+        self._locks = {category: threading.Lock() for category in API_CATEGORIES}
+
+    @property
+    def categories(self) -> List[str]:
+        return list(API_CATEGORIES)
+
+    def document_path(self, category: str) -> Optional[str]:
+        for extension in (".json", ".yaml", ".yml"):
+            path = os.path.join(self.spec_dir, CATEGORY_SLUGS[category] + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get(self, category: str) -> Dict:
+        """Return the compiled spec of a category, compiling or unpickling it the first time."""
+        compiled = self._compiled.get(category)
+        if compiled is not None:
+            return compiled
+        with self._locks[category]:
+            if category not in self._compiled:
+                path = self.document_path(category)
+                compiled = self._load(category, path) if path else compile_builtin(category)
+                compiled["source"] = path
+                self._compiled[category] = compiled
+        return self._compiled[category]
+
+    def _load(self, category: str, path: str) -> Dict:
+        stat = os.stat(path)
+        key = hashlib.sha256(f"{REGISTRY_VERSION}:{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+        cache_path = os.path.join(self.cache_dir, f"{CATEGORY_SLUGS[category]}-{key}.pickle")
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+        compiled = compile_openapi(load_document(path), category)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        return compiled
@@ -0,0 +1,155 @@
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+# Default budgets until the API reports its own limits through response headers
+ACCOUNT_REQUESTS_PER_MINUTE = float(os.environ.get("MERGE_ACCOUNT_REQUESTS_PER_MINUTE", "300"))
+ORG_REQUESTS_PER_MINUTE = float(os.environ.get("MERGE_ORG_REQUESTS_PER_MINUTE", "1200"))
+# Window assumed when a limit header arrives without a reset time
+RATE_LIMIT_WINDOW = float(os.environ.get("MERGE_RATE_LIMIT_WINDOW", "60"))
+
+def _header_float(headers, *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return None
+
+class TokenBucket:
+    """Token bucket whose waiters are served strictly in arrival order.
+
+    The refill rate starts from a configured budget and is re-learned from
+    X-RateLimit-* response headers; a 429 empties the bucket until Retry-After.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float):
+        self.name = name
+        self.capacity = max(1.0, requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self.stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "max_wait": 0.0, "throttled": 0}
+
+    def _refill(self, now: float):
+        # After a 429, refilling only starts once the bucket is unblocked
+        if now <= self.updated:
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available and it is this caller's turn."""
+        ticket = object()
+        started = time.monotonic()
+        with self._cond:
+            self._queue.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._queue[0] is ticket and now >= self.blocked_until and self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    if self._queue[0] is ticket:
+                        timeout = max(self.blocked_until - now, (1 - self.tokens) / self.rate if self.rate > 0 else 1.0)
+                    else:
+                        timeout = None
+                    self._cond.wait(timeout)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            self.stats["acquired"] += 1
+            if waited > 0.001:
+                self.stats["waited"] += 1
+                self.stats["wait_seconds"] += waited
+                self.stats["max_wait"] = max(self.stats["max_wait"], waited)
+
+    def update_from_headers(self, headers):
+        """Adjust the rate and remaining tokens from rate-limit response headers."""
+        limit = _header_float(headers, "X-RateLimit-Limit", "RateLimit-Limit")
+        remaining = _header_float(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        if limit is None and remaining is None:
+            return
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if reset is not None and reset > 1e9:
+                # Some APIs send an epoch timestamp instead of seconds until reset
+                reset = max(0.0, reset - time.time())
+            if limit is not None:
+                self.capacity = max(1.0, limit)
+                self.rate = limit / RATE_LIMIT_WINDOW
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+                if reset:
+                    # Don't refill faster than what is left of the window's budget allows
+                    self.rate = min(self.rate, max(remaining, 1.0) / reset)
+            self._cond.notify_all()
+
+    def penalize(self, retry_after: Optional[float]):
+        """Pause every waiter after a 429, for Retry-After seconds when given.
+
+        One token is available again when the pause ends and refilling resumes from
+        there, so the next request waits Retry-After rather than a full refill period.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + (retry_after if retry_after is not None else 1.0 / max(self.rate, 1e-3)))
+            self.tokens = min(1.0, self.capacity)
+            self.updated = self.blocked_until
+            self.stats["throttled"] += 1
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            self._refill(time.monotonic())
+            waited = self.stats["waited"]
+            return {
+                "bucket": self.name,
+                "per_minute": round(self.rate * 60, 1),
+                "tokens": round(self.tokens, 1),
+                "queue_depth": len(self._queue),
+                "avg_wait_ms": round(self.stats["wait_seconds"] / waited * 1000) if waited else 0,
+                "max_wait_ms": round(self.stats["max_wait"] * 1000),
+                "throttled": self.stats["throttled"],
+            }
+
+class RateLimiterRegistry:
+    """Process-wide token buckets keyed by hashed API key and hashed account token."""
+
+    def __init__(self, account_requests_per_minute: float = ACCOUNT_REQUESTS_PER_MINUTE,
+                 org_requests_per_minute: float = ORG_REQUESTS_PER_MINUTE):
+        self.account_requests_per_minute = account_requests_per_minute
+        self.org_requests_per_minute = org_requests_per_minute
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, name: str, requests_per_minute: float) -> TokenBucket:
+        with self._lock:
+            if name not in self._buckets:
+                self._buckets[name] = TokenBucket(name, requests_per_minute)
+            return self._buckets[name]
+
+    def org(self, api_key_hash: str) -> TokenBucket:
+        return self.bucket(f"org:{api_key_hash}", self.org_requests_per_minute)
+
+    def account(self, account_hash: str) -> TokenBucket:
+        return self.bucket(f"account:{account_hash}", self.account_requests_per_minute)
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return [bucket.snapshot() for bucket in buckets]
+
+# Shared by every client (and therefore every Streamlit session) in this process
+RATE_LIMITS = RateLimiterRegistry()
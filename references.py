@@ -0,0 +1,184 @@
+import os
+import time
+import threading
+from typing import Dict, Iterable, List, Set
+
+import pandas as pd
+import requests
+
+from frames import STRING_DTYPE
+from merge_client import MergeClient, fetch_many, iter_pages
+
+# Fields holding the id (or ids) of another common model
+REFERENCE_FIELDS = {
+    "assignees": "users",
+    "account": "accounts",
+    "contact": "contacts",
+    "creator": "users",
+    "collections": "collections",
+    "parent_ticket": "tickets",
+    "ticket": "tickets",
+    "user": "users",
+}
+# Fields tried in order for a record's label
+LABEL_FIELDS = ["name", "email_address", "file_name", "remote_id"]
+# Seconds an index of a referenced model is trusted before it is rebuilt
+REFERENCE_TTL = float(os.environ.get("MERGE_REFERENCE_TTL", "600"))
+REFERENCE_PAGE_SIZE = int(os.environ.get("MERGE_REFERENCE_PAGE_SIZE", "100"))
+# List pages scanned per resolve call before falling back to detail requests
+REFERENCE_MAX_PAGES = int(os.environ.get("MERGE_REFERENCE_MAX_PAGES", "20"))
+# Ids still missing after the list scan are fetched one by one only up to this many
+REFERENCE_DETAIL_LIMIT = int(os.environ.get("MERGE_REFERENCE_DETAIL_LIMIT", "25"))
+
+def record_label(record: Dict) -> str:
+    """Human-readable label of a referenced record."""
+    for field in LABEL_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str) and value:
+            return value
+    return str(record.get("id"))
+
+def referenced_ids(values: Iterable) -> Set[str]:
+    """Distinct ids in a column of ids or of id lists."""
+    ids = set()
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            ids.update(v for v in value if isinstance(v, str))
+        elif isinstance(value, str):
+            ids.add(value)
+    return ids
+
+class _ModelIndex:
+    __slots__ = ("labels", "cursor", "complete", "loaded_at", "lock")
+
+    def __init__(self):
+        self.labels: Dict[str, str] = {}
+        self.cursor = None
+        self.complete = False
+        self.loaded_at = time.monotonic()
+        self.lock = threading.Lock()
+
+class ReferenceIndex:
+    """Id-indexed labels of one linked account's records, filled by batched list scans.
+
+    Missing ids are looked up by paging through the referenced model's list endpoint,
+    indexing every record seen, and resuming from the last cursor on the next call.
+    Only a few ids left over after the scan are fetched individually.
+    """
+
+    def __init__(self, ttl: float = REFERENCE_TTL, page_size: int = REFERENCE_PAGE_SIZE,
+                 max_pages: int = REFERENCE_MAX_PAGES, detail_limit: int = REFERENCE_DETAIL_LIMIT):
+        self.ttl = ttl
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.detail_limit = detail_limit
+        self._models: Dict[str, _ModelIndex] = {}
+        self._lock = threading.Lock()
+        self.stats = {"list_requests": 0, "detail_requests": 0, "resolved": 0, "unresolved": 0}
+
+    def _model(self, model: str) -> _ModelIndex:
+        with self._lock:
+            index = self._models.get(model)
+            if index is None or time.monotonic() - index.loaded_at > self.ttl:
+                index = self._models[model] = _ModelIndex()
+            return index
+
+    def add(self, model: str, records: Iterable[Dict]):
+        """Index records that are already at hand, e.g. the tickets of the current page."""
+        index = self._model(model)
+        with index.lock:
+            for record in records:
+                if record.get("id"):
+                    index.labels[record["id"]] = record_label(record)
+
+    def resolve(self, client: MergeClient, model: str, ids: Iterable[str]) -> Dict[str, str]:
+        """Return labels for `ids`, fetching the ones not indexed yet; unknown ids are left out."""
+        ids = set(ids)
+        index = self._model(model)
+        # One caller scans a model at a time; the others wait and then read the index
+        with index.lock:
+            missing = ids - index.labels.keys()
+            if missing and not index.complete:
+                self._scan(client, model, index, missing)
+                missing = ids - index.labels.keys()
+            if missing and not index.complete and len(missing) <= self.detail_limit:
+                self._fetch_details(client, model, index, missing)
+            labels = {i: index.labels[i] for i in ids if index.labels.get(i) is not None}
+        with self._lock:
+            self.stats["resolved"] += len(labels)
+            self.stats["unresolved"] += len(ids) - len(labels)
+        return labels
+
+    def _scan(self, client: MergeClient, model: str, index: _ModelIndex, missing: Set[str]):
+        params = {"page_size": self.page_size}
+        if index.cursor:
+            params["cursor"] = index.cursor
+        missing = set(missing)
+        for page in iter_pages(client, f"/{model}", params, max_pages=self.max_pages):
+            with self._lock:
+                self.stats["list_requests"] += 1
+            for record in page.get("results") or []:
+                if record.get("id"):
+                    index.labels[record["id"]] = record_label(record)
+                    missing.discard(record["id"])
+            index.cursor = page.get("next")
+            if not index.cursor:
+                index.complete = True
+            if not missing:
+                break
+
+    def _fetch_details(self, client: MergeClient, model: str, index: _ModelIndex, missing: Set[str]):
+        endpoints = {f"/{model}/{record_id}": record_id for record_id in missing}
+        with self._lock:
+            self.stats["detail_requests"] += len(endpoints)
+        for result in fetch_many(client, list(endpoints)):
+            # Remember failures too, so a deleted record is not requested on every rerun
+            index.labels[endpoints[result["endpoint"]]] = record_label(result["data"]) if result["data"] else None
+
+    def invalidate(self):
+        with self._lock:
+            self._models.clear()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {**self.stats, "models": {model: len(index.labels) for model, index in self._models.items()}}
+
+def reference_columns(df: pd.DataFrame) -> List[str]:
+    """Reference fields present in a frame."""
+    return [column for column in df.columns if column in REFERENCE_FIELDS]
+
+def resolve_references(client: MergeClient, index: ReferenceIndex, df: pd.DataFrame, model: str = None) -> pd.DataFrame:
+    """Add a `<field>_name` column next to every reference field of `df`, whose rows are `model` records.
+
+    Distinct ids are collected per referenced model across all columns, so the cost is
+    a few list pages per model rather than one request per row. When a column refers
+    to `model` itself (e.g. `parent_ticket`), the frame's own rows are indexed first.
+    """
+    columns = reference_columns(df)
+    if not columns:
+        return df
+    if model in {REFERENCE_FIELDS[column] for column in columns} and "id" in df.columns:
+        index.add(model, df[["id"] + [f for f in LABEL_FIELDS if f in df.columns]].to_dict("records"))
+    wanted: Dict[str, Set[str]] = {}
+    for column in columns:
+        wanted.setdefault(REFERENCE_FIELDS[column], set()).update(referenced_ids(df[column]))
+
+    labels: Dict[str, Dict[str, str]] = {}
+    for referenced, ids in wanted.items():
+        try:
+            labels[referenced] = index.resolve(client, referenced, ids) if ids else {}
+        except requests.exceptions.RequestException:
+            # Leave the ids unresolved rather than failing the whole table
+            labels[referenced] = {}
+
+    df = df.copy()
+    for column in columns:
+        names = labels[REFERENCE_FIELDS[column]]
+
+        def label(value, names=names):
+            if isinstance(value, (list, tuple)):
+                return ", ".join(names.get(v, v) for v in value) if value else None
+            return names.get(value, value) if isinstance(value, str) else None
+
+        df.insert(df.columns.get_loc(column) + 1, f"{column}_name", df[column].map(label).astype(STRING_DTYPE))
+    return df
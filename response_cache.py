@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Callable, Tuple
+
+from merge_client import normalize_query_params
+from streaming import dumps, loads
+
+# Seconds a cached response is served as fresh
+CACHE_TTL = float(os.environ.get("MERGE_CACHE_TTL", "60"))
+# Extra seconds an expired response may be served while it is refreshed in the background
+CACHE_STALE_TTL = float(os.environ.get("MERGE_CACHE_STALE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.environ.get("MERGE_CACHE_MAX_ENTRIES", "256"))
+CACHE_MAX_BYTES = int(os.environ.get("MERGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+def make_cache_key(account_hash: str, endpoint: str, query_params: Dict = None) -> Tuple:
+    """Build a cache key from the hashed account, endpoint and normalized query parameters."""
+    params = normalize_query_params(query_params)
+    return (account_hash, endpoint, json.dumps(params, sort_keys=True, default=str))
+
+class _Entry:
+    __slots__ = ("data", "size", "stored_at")
+
+    def __init__(self, data: bytes, size: int):
+        self.data = data
+        self.size = size
+        self.stored_at = time.monotonic()
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache of decoded responses shared by all sessions.
+
+    Concurrent misses for the same key are coalesced into a single upstream call,
+    and expired entries are served stale while one background refresh runs. Values
+    are kept JSON-encoded and every caller decodes its own copy, so a session that
+    modifies a response cannot change what other sessions are served.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, stale_ttl: float = CACHE_STALE_TTL,
+                 max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._inflight: Dict[Tuple, Future] = {}
+        # Bumped by invalidate(); a fetch that started before an invalidation is not stored
+        self._generation = 0
+        self._account_generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "refreshes": 0}
+
+    def get_or_fetch(self, key: Tuple, fetch: Callable[[], Tuple[Any, int]]) -> Any:
+        """Return the cached value for `key`, calling `fetch` on a miss.
+
+        `fetch` must return a `(value, size_in_bytes)` tuple; errors are propagated to
+        every coalesced caller and nothing is cached.
+        """
+        cached = None
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation_of(key[0])
+            if entry is not None:
+                age = time.monotonic() - entry.stored_at
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    cached = entry.data
+                elif age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["stale_hits"] += 1
+                    if key not in self._inflight:
+                        refresh = self._inflight[key] = Future()
+                        self.stats["refreshes"] += 1
+                        threading.Thread(target=self._run_fetch, args=(key, fetch, refresh, generation), daemon=True,
+                                         name="merge-cache-refresh").start()
+                    cached = entry.data
+            if cached is None:
+                future = self._inflight.get(key)
+                if future is not None:
+                    self.stats["coalesced"] += 1
+                    leader = False
+                else:
+                    future = self._inflight[key] = Future()
+                    self.stats["misses"] += 1
+                    leader = True
+        # Every caller decodes its own copy outside the lock
+        if cached is not None:
+            return loads(cached)
+        if leader:
+            self._run_fetch(key, fetch, future, generation)
+        return loads(future.result())
+
+    def _generation_of(self, account_hash: str) -> Tuple[int, int]:
+        return self._generation, self._account_generations.get(account_hash, 0)
+
+    def _run_fetch(self, key: Tuple, fetch: Callable[[], Tuple[Any, int]], future: Future, generation: Tuple[int, int]):
+        try:
+            value, size = fetch()
+            data = dumps(value)
+        except BaseException as e:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            return
+        with self._lock:
+            # An invalidation while the request was in flight means the response may predate a write
+            if self._generation_of(key[0]) == generation:
+                self._store(key, data, size)
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(data)
+
+    def _store(self, key: Tuple, data: bytes, size: int):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = _Entry(data, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats["evictions"] += 1
+
+    def invalidate(self, account_hash: str = None):
+        """Drop every entry, or only the entries of one account."""
+        with self._lock:
+            if account_hash is None:
+                self._generation += 1
+            else:
+                self._account_generations[account_hash] = self._account_generations.get(account_hash, 0) + 1
+            # Later misses start a new request instead of joining one that may return stale data
+            for key in [k for k in self._inflight if account_hash is None or k[0] == account_hash]:
+                del self._inflight[key]
+            for key in [k for k in self._entries if account_hash is None or k[0] == account_hash]:
+                self._bytes -= self._entries.pop(key).size
+
+    def snapshot(self) -> Dict:
+        """Return counters and current occupancy for display."""
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "bytes": self._bytes}
@@ -0,0 +1,205 @@
+import atexit
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+RESULT_DIR = os.environ.get("MERGE_RESULT_DIR", ".merge_results")
+# Frames using less memory than this stay in the session; larger ones are spilled to disk
+RESULT_SPILL_BYTES = int(os.environ.get("MERGE_RESULT_SPILL_BYTES", str(1024 * 1024)))
+RESULT_SESSION_BUDGET = int(os.environ.get("MERGE_RESULT_SESSION_BUDGET", str(256 * 1024 * 1024)))
+RESULT_GLOBAL_BUDGET = int(os.environ.get("MERGE_RESULT_GLOBAL_BUDGET", str(2 * 1024 * 1024 * 1024)))
+# Minimum seconds between checks for sessions that have ended
+RESULT_CLEANUP_INTERVAL = float(os.environ.get("MERGE_RESULT_CLEANUP_INTERVAL", "60"))
+
+class StoredFrame:
+    """Handle to a results frame spilled to an Arrow IPC file; it holds no rows itself."""
+
+    __slots__ = ("session_id", "key", "path", "rows", "nbytes", "stored_at")
+
+    def __init__(self, session_id: str, key: str, path: str, rows: int, nbytes: int):
+        self.session_id = session_id
+        self.key = key
+        self.path = path
+        self.rows = rows
+        self.nbytes = nbytes
+        self.stored_at = time.time()
+
+    def __len__(self) -> int:
+        return self.rows
+
+class StoredObject(StoredFrame):
+    """Handle to any other part of a result, e.g. its search index or diff, pickled to a file."""
+
+    __slots__ = ()
+
+class ResultStore:
+    """Session results kept as memory-mapped Arrow IPC files instead of in-process frames.
+
+    Each stored frame is one file under a per-process directory. Loading maps the
+    file and converts it to pandas without copying fixed-width and Arrow-backed
+    string columns, so pages are only read when a rerun renders them and the OS can
+    drop them again under memory pressure. Files are evicted least recently used
+    first once a session or the whole process exceeds its budget; the most recently
+    stored frame is never evicted by its own write. Objects that go with a spilled
+    frame, such as its search index, are pickled next to it and count against the
+    same budgets.
+    """
+
+    def __init__(self, directory: str = RESULT_DIR, session_budget: int = RESULT_SESSION_BUDGET,
+                 global_budget: int = RESULT_GLOBAL_BUDGET):
+        # A directory per process, so a second server or a leftover from a crash is never shared
+        self.directory = os.path.join(directory, str(os.getpid()))
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+        self.session_budget = session_budget
+        self.global_budget = global_budget
+        self._entries: "OrderedDict[Tuple[str, str], StoredFrame]" = OrderedDict()
+        self._session_bytes: Dict[str, int] = {}
+        self._bytes = 0
+        self.evictions = 0
+        self._cleaned_at = 0.0
+        self._lock = threading.Lock()
+        atexit.register(shutil.rmtree, self.directory, True)
+
+    def put(self, session_id: str, key: str, df: pd.DataFrame) -> Optional[StoredFrame]:
+        """Write `df` under `key`, replacing the session's previous frame for that key.
+
+        Returns None when the frame cannot be represented in Arrow, e.g. a column mixing
+        strings and numbers; the caller then keeps the frame in memory.
+        """
+        if pa is None:
+            return None
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return None
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.arrow")
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return self._add(StoredFrame(session_id, key, path, len(df), os.path.getsize(path)))
+
+    def put_object(self, session_id: str, key: str, value: Any) -> StoredObject:
+        """Pickle `value` under `key`, replacing the session's previous entry for that key."""
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.pickle")
+        with open(path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._add(StoredObject(session_id, key, path, 0, os.path.getsize(path)))
+
+    def _add(self, handle: StoredFrame) -> StoredFrame:
+        session_id = handle.session_id
+        with self._lock:
+            self._remove((session_id, handle.key))
+            self._entries[(session_id, handle.key)] = handle
+            self._session_bytes[session_id] = self._session_bytes.get(session_id, 0) + handle.nbytes
+            self._bytes += handle.nbytes
+            for entry_key, entry in list(self._entries.items()):
+                if self._session_bytes.get(session_id, 0) <= self.session_budget:
+                    break
+                if entry.session_id == session_id and entry is not handle:
+                    self._remove(entry_key)
+                    self.evictions += 1
+            for entry_key, entry in list(self._entries.items()):
+                if self._bytes <= self.global_budget:
+                    break
+                if entry is not handle:
+                    self._remove(entry_key)
+                    self.evictions += 1
+        return handle
+
+    def _touch(self, handle: StoredFrame) -> bool:
+        with self._lock:
+            if self._entries.get((handle.session_id, handle.key)) is not handle:
+                return False
+            self._entries.move_to_end((handle.session_id, handle.key))
+            return True
+
+    def load(self, handle: StoredFrame) -> Optional[pd.DataFrame]:
+        """Map a stored frame back into pandas, or None when it has been evicted."""
+        if not self._touch(handle):
+            return None
+        try:
+            table = pa.ipc.open_file(pa.memory_map(handle.path)).read_all()
+        except FileNotFoundError:
+            return None
+        # Arrow would return list cells as numpy arrays; the rest of the app works with lists
+        lists = [field.name for field in table.schema if pa.types.is_list(field.type) or pa.types.is_large_list(field.type)]
+        df = table.drop_columns(lists).to_pandas(split_blocks=True)
+        for name in lists:
+            df[name] = table.column(name).to_pylist()
+        return df[table.column_names]
+
+    def load_object(self, handle: StoredObject) -> Any:
+        """Unpickle a stored object, or None when it has been evicted."""
+        if not self._touch(handle):
+            return None
+        try:
+            with open(handle.path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def discard(self, handle: StoredFrame):
+        """Delete a stored entry its owner no longer needs, unless it was already replaced."""
+        with self._lock:
+            if self._entries.get((handle.session_id, handle.key)) is handle:
+                self._remove((handle.session_id, handle.key))
+
+    def _remove(self, entry_key: Tuple[str, str]):
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        self._session_bytes[entry.session_id] -= entry.nbytes
+        if not self._session_bytes[entry.session_id]:
+            del self._session_bytes[entry.session_id]
+        self._bytes -= entry.nbytes
+        try:
+            # Frames still mapped by a running script stay readable until they are released
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+    def drop_session(self, session_id: str):
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == session_id]:
+                self._remove(entry_key)
+
+    def drop_inactive(self, is_active: Callable[[str], bool], min_interval: float = 0.0) -> int:
+        """Remove the frames of every session for which `is_active` is false; returns the number of sessions.
+
+        Does nothing if the previous check was less than `min_interval` seconds ago.
+        """
+        with self._lock:
+            if time.time() - self._cleaned_at < min_interval:
+                return 0
+            self._cleaned_at = time.time()
+            sessions = list(self._session_bytes)
+        inactive = [session_id for session_id in sessions if not is_active(session_id)]
+        for session_id in inactive:
+            self.drop_session(session_id)
+        return len(inactive)
+
+    def stats(self, session_id: str = None) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "sessions": len(self._session_bytes),
+                "bytes": self._bytes,
+                "session_bytes": self._session_bytes.get(session_id, 0),
+                "evictions": self.evictions,
+            }
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=False, deep=True).sum())
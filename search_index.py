@@ -0,0 +1,162 @@
+import re
+import shlex
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Free-text fields tokenized into the inverted index
+TEXT_FIELDS = ["name", "description", "body"]
+# Fields indexed by exact (case-insensitive) value; list values index every element
+FACET_FIELDS = ["status", "priority", "tags", "linked_account"]
+
+TOKEN_PATTERN = re.compile(r"\w+")
+RANGE_PATTERN = re.compile(r"^(\w+)(>=|<=|>|<)(.+)$")
+NAT = np.iinfo(np.int64).min
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _utc_nanoseconds(series: pd.Series) -> np.ndarray:
+    if series.dt.tz is not None:
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+    return series.astype("datetime64[ns]").to_numpy().view("i8")
+
+def _timestamp(value: str) -> int:
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.as_unit("ns").value
+
+class SearchIndex:
+    """Incremental in-memory index over the rows of a results frame.
+
+    Rows are identified by their position, in the order they were added. Text fields
+    go into an inverted index of tokens, facet fields into per-value posting lists,
+    and datetime columns into arrays that are sorted lazily for range queries.
+    Posting lists are compact int32 arrays that are already sorted, because rows
+    only ever get appended.
+    """
+
+    def __init__(self, text_fields: List[str] = TEXT_FIELDS, facet_fields: List[str] = FACET_FIELDS):
+        self.text_fields = text_fields
+        self.facet_fields = facet_fields
+        self.size = 0
+        self.tokens: Dict[str, array] = {}
+        self.facets: Dict[str, Dict[str, array]] = {field: {} for field in facet_fields}
+        self._dates: Dict[str, List[np.ndarray]] = {}
+        self._sorted: Dict[str, tuple] = {}
+
+    def add(self, df: pd.DataFrame):
+        """Index the rows of `df` as the next positions."""
+        start = self.size
+        text_columns = [df[field].tolist() for field in self.text_fields if field in df.columns]
+        for row, texts in enumerate(zip(*text_columns), start):
+            # A row is listed once per token even when several fields contain it
+            for token in set(token for text in texts if isinstance(text, str) for token in tokenize(text)):
+                postings = self.tokens.get(token)
+                if postings is None:
+                    postings = self.tokens[token] = array("i")
+                postings.append(row)
+        for field in self.facet_fields:
+            if field not in df.columns:
+                continue
+            values = self.facets[field]
+            for row, value in enumerate(df[field].tolist(), start):
+                for item in set(value) if isinstance(value, (list, tuple)) else [value]:
+                    if isinstance(item, str) and item:
+                        postings = values.get(item.lower())
+                        if postings is None:
+                            postings = values[item.lower()] = array("i")
+                        postings.append(row)
+
+        date_columns = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+        for column in date_columns:
+            if column not in self._dates:
+                # Rows indexed before this column appeared have no value
+                self._dates[column] = [np.full(start, NAT, dtype=np.int64)]
+            self._dates[column].append(_utc_nanoseconds(df[column]))
+        for column, chunks in self._dates.items():
+            if column not in date_columns:
+                chunks.append(np.full(len(df), NAT, dtype=np.int64))
+        self._sorted.clear()
+        self.size += len(df)
+
+    @property
+    def date_fields(self) -> List[str]:
+        return list(self._dates)
+
+    def _date_range(self, field: str, op: str, value: str) -> np.ndarray:
+        if field not in self._sorted:
+            values = np.concatenate(self._dates[field])
+            order = np.argsort(values, kind="stable")
+            sorted_values = values[order]
+            self._sorted[field] = (order, sorted_values, int(np.searchsorted(sorted_values, NAT, side="right")))
+        order, sorted_values, missing = self._sorted[field]
+        bound = _timestamp(value)
+        if op in (">", ">="):
+            lo, hi = np.searchsorted(sorted_values, bound, side="right" if op == ">" else "left"), len(sorted_values)
+        else:
+            lo, hi = missing, np.searchsorted(sorted_values, bound, side="left" if op == "<" else "right")
+        return order[max(lo, missing):hi]
+
+    def _postings(self, postings: Optional[array]) -> np.ndarray:
+        if postings is None:
+            return np.empty(0, dtype=np.int32)
+        # Copy so the array can still grow while a result is alive
+        return np.frombuffer(postings, dtype=np.int32).copy()
+
+    def _text(self, token: str) -> np.ndarray:
+        if token.endswith("*"):
+            prefix = token[:-1]
+            matches = [self._postings(p) for t, p in self.tokens.items() if t.startswith(prefix)]
+            return np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int32)
+        return self._postings(self.tokens.get(token))
+
+    def _term(self, term: str) -> List[np.ndarray]:
+        # Ranges first, since their values may contain ":" (e.g. a time of day)
+        match = RANGE_PATTERN.match(term)
+        if match:
+            field, op, value = match.groups()
+            if field not in self._dates:
+                raise ValueError(f"Unknown date field {field!r}; use {', '.join(self.date_fields) or 'none available'}")
+            try:
+                return [self._date_range(field, op, value)]
+            except ValueError:
+                raise ValueError(f"Could not parse date {value!r}")
+        field, sep, value = term.partition(":")
+        if sep and field in self.facets:
+            # Comma separated values match any of them
+            matches = [self._postings(self.facets[field].get(v.strip().lower())) for v in value.split(",") if v.strip()]
+            return [np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int32)]
+        if sep:
+            raise ValueError(f"Unknown field {field!r}; filter on {', '.join(self.facet_fields)}")
+        # Free text; `word*` matches every token starting with `word`
+        tokens = tokenize(term)
+        if tokens and term.endswith("*"):
+            tokens[-1] += "*"
+        return [self._text(token) for token in tokens]
+
+    def search(self, query: str) -> Optional[np.ndarray]:
+        """Return the sorted positions of rows matching every term of `query`, or None for an empty query.
+
+        Terms are free-text words (`word*` for a prefix), `field:value[,value...]` for
+        facets and `date_field>=2024-01-01` style ranges on datetime columns.
+        """
+        terms = shlex.split(query) if query and query.strip() else []
+        if not terms:
+            return None
+        candidates = [postings for term in terms for postings in self._term(term)]
+        if not candidates:
+            raise ValueError(f"Nothing to search for in {query!r}; use words, field:value or date ranges")
+        candidates.sort(key=len)
+        result = candidates[0]
+        for postings in candidates[1:]:
+            if not len(result):
+                break
+            # Intersect through a bitmap of the smaller side instead of sorting both
+            mask = np.zeros(self.size, dtype=bool)
+            mask[result] = True
+            result = postings[mask[postings]]
+        return np.sort(result)
@@ -0,0 +1,114 @@
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Changed field values listed in a diff before the rest are only counted
+DIFF_MAX_ROWS = 1000
+
+def _cell_text(value):
+    if isinstance(value, list):
+        # Id and tag lists are the common case; joining is much cheaper than json.dumps
+        return "[" + "\x1f".join(map(str, value))
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+def _hashable(series: pd.Series) -> pd.Series:
+    """Turn list and dict cells into text so they hash by content."""
+    if series.dtype == object:
+        return series.map(_cell_text)
+    return series
+
+def field_hashes(df: pd.DataFrame, fields: List[str]) -> np.ndarray:
+    """uint64 hash of every cell, one column per field; fields missing from `df` hash as null."""
+    missing = pd.util.hash_array(np.array([None], dtype=object))[0]
+    columns = []
+    for field in fields:
+        if field in df.columns:
+            columns.append(pd.util.hash_pandas_object(_hashable(df[field]), index=False).to_numpy())
+        else:
+            columns.append(np.full(len(df), missing, dtype=np.uint64))
+    return np.column_stack(columns) if columns else np.empty((len(df), 0), dtype=np.uint64)
+
+def combine_hashes(hashes: np.ndarray) -> np.ndarray:
+    """Fold per-field hashes into one hash per record."""
+    combined = np.zeros(len(hashes), dtype=np.uint64)
+    for column in hashes.T:
+        combined = combined * np.uint64(1000003) ^ column
+    return combined
+
+class Snapshot:
+    """Columnar content hashes of one fetch of a model, keyed by record `id`."""
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.drop_duplicates("id", keep="last") if "id" in df.columns else df.iloc[0:0]
+        self.frame = df.reset_index(drop=True)
+        self.fields = [c for c in self.frame.columns if c != "id"]
+        self.ids = pd.Index(self.frame["id"].astype(str)) if "id" in self.frame.columns else pd.Index([])
+        self.hashes = field_hashes(self.frame, self.fields)
+        self.record_hashes = combine_hashes(self.hashes)
+        self.taken_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the snapshot's rows and hashes."""
+        return int(self.frame.memory_usage(index=False, deep=True).sum()) + self.hashes.nbytes + self.record_hashes.nbytes
+
+def diff_snapshots(old: Snapshot, new: Snapshot, max_rows: int = DIFF_MAX_ROWS) -> Dict:
+    """Compare two snapshots by id and content hash.
+
+    Records are matched with an index lookup and compared by their combined hash;
+    only records whose hash differs are compared field by field, again by hash.
+    Returns the added and removed rows, the changed ids with their changed fields,
+    and up to `max_rows` old/new values of changed fields.
+    """
+    fields = list(dict.fromkeys(old.fields + new.fields))
+    old_hashes = old.hashes if fields == old.fields else field_hashes(old.frame, fields)
+    new_hashes = new.hashes if fields == new.fields else field_hashes(new.frame, fields)
+    old_records = combine_hashes(old_hashes)
+    new_records = combine_hashes(new_hashes)
+
+    matches = old.ids.get_indexer(new.ids)
+    added = np.flatnonzero(matches < 0)
+    removed = np.flatnonzero(new.ids.get_indexer(old.ids) < 0)
+    new_common = np.flatnonzero(matches >= 0)
+    old_common = matches[new_common]
+    differs = new_records[new_common] != old_records[old_common]
+    new_changed = new_common[differs]
+    old_changed = old_common[differs]
+
+    field_changes = new_hashes[new_changed] != old_hashes[old_changed]
+    field_names = np.array(fields, dtype=object)
+    changed = pd.DataFrame({
+        "id": new.ids[new_changed],
+        "changed_fields": [", ".join(field_names[row]) for row in field_changes],
+    })
+    if "name" in new.frame.columns:
+        changed.insert(1, "name", new.frame["name"].to_numpy()[new_changed])
+
+    values = []
+    for new_row, old_row, row_changes in zip(new_changed, old_changed, field_changes):
+        for field in field_names[row_changes]:
+            if len(values) >= max_rows:
+                break
+            values.append({
+                "id": new.ids[new_row],
+                "field": field,
+                "old": old.frame.at[old_row, field] if field in old.frame.columns else None,
+                "new": new.frame.at[new_row, field] if field in new.frame.columns else None,
+            })
+    return {
+        "added": new.frame.iloc[added],
+        "removed": old.frame.iloc[removed],
+        "changed": changed,
+        "values": pd.DataFrame(values, columns=["id", "field", "old", "new"]).astype(str),
+        "field_counts": pd.Series(field_changes.sum(axis=0), index=fields)[lambda s: s > 0].sort_values(ascending=False),
+        "unchanged": int(len(new_common) - len(new_changed)),
+        "since": old.taken_at,
+    }
@@ -0,0 +1,109 @@
+import json
+from typing import Any, BinaryIO, Dict, Iterator, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Errors raised for a body that is not valid JSON; ijson's do not subclass ValueError
+DECODE_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
+def loads(data: bytes) -> Any:
+    """Decode JSON with orjson when it is installed, otherwise with the stdlib."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(value: Any) -> bytes:
+    """Encode JSON with orjson when it is installed, otherwise with the stdlib."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+class StreamedPage:
+    """Iterate the `results` of one list response without buffering the whole body.
+
+    With ijson installed, records are built one at a time from the socket; the page's
+    `next` and `previous` cursors are available once iteration finishes. Without it,
+    the body is buffered and decoded with `loads`.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.meta: Dict[str, Any] = {"next": None, "previous": None}
+
+    def __iter__(self) -> Iterator[Dict]:
+        try:
+            if ijson is None:
+                yield from self._iter_buffered()
+            else:
+                # Let urllib3 undo gzip so ijson sees plain JSON
+                self.response.raw.decode_content = True
+                yield from self._iter_events(self.response.raw)
+        finally:
+            self.response.close()
+
+    def _iter_buffered(self) -> Iterator[Dict]:
+        page = loads(self.response.content)
+        self.meta["next"] = page.get("next")
+        self.meta["previous"] = page.get("previous")
+        yield from page.get("results") or []
+
+    def _iter_events(self, fp: BinaryIO) -> Iterator[Dict]:
+        builder = None
+        for prefix, event, value in ijson.parse(fp, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                # Nested containers have longer prefixes, so this closes the record itself
+                if prefix == "results.item" and event in ("end_map", "end_array"):
+                    yield builder.value
+                    builder = None
+            elif prefix == "results.item":
+                if event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                else:
+                    yield value
+            elif prefix in self.meta and event in ("string", "null"):
+                self.meta[prefix] = value
+
+    @property
+    def next(self):
+        return self.meta["next"]
+
+def iter_records(client, endpoint: str, params: Dict = None, max_records: int = None) -> Iterator[Dict]:
+    """Stream records from every page of a list endpoint, following `next` cursors."""
+    params = dict(params or {})
+    yielded = 0
+    cursor = params.pop("cursor", None)
+    while True:
+        response = client.get(endpoint, params={**params, "cursor": cursor}, stream=True)
+        response.raise_for_status()
+        page = StreamedPage(response)
+        for record in page:
+            yield record
+            yielded += 1
+            if max_records is not None and yielded >= max_records:
+                response.close()
+                return
+        cursor = page.next
+        if not cursor:
+            return
+
+def iter_record_batches(client, endpoint: str, params: Dict = None, batch_size: int = 1000,
+                        max_records: int = None) -> Iterator[List[Dict]]:
+    """Group streamed records into batches for DataFrame construction or store upserts."""
+    batch = []
+    for record in iter_records(client, endpoint, params, max_records):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,151 @@
+import os
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from merge_client import MergeClient
+from streaming import iter_record_batches
+
+SYNC_DIR = os.environ.get("MERGE_SYNC_DIR", ".merge_sync")
+SYNC_PAGE_SIZE = int(os.environ.get("MERGE_SYNC_PAGE_SIZE", "100"))
+SYNC_BATCH_SIZE = int(os.environ.get("MERGE_SYNC_BATCH_SIZE", "500"))
+# Delta syncs re-read this many seconds before the high-water mark, so records sharing
+# its timestamp or committed upstream slightly out of order are not skipped
+SYNC_OVERLAP_SECONDS = float(os.environ.get("MERGE_SYNC_OVERLAP_SECONDS", "5"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    model TEXT NOT NULL,
+    id TEXT NOT NULL,
+    modified_at TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (model, id)
+);
+CREATE INDEX IF NOT EXISTS records_created_at ON records (model, created_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    model TEXT PRIMARY KEY,
+    high_water TEXT,
+    last_synced_at TEXT
+);
+"""
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp returned by Merge."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+class SyncStore:
+    """SQLite store of one linked account's records, upserted by `id`."""
+
+    def __init__(self, account_hash: str, directory: str = SYNC_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{account_hash}.sqlite3")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the store safe to use from any Streamlit thread
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, model: str, records: List[Dict]) -> int:
+        """Insert or replace records by id and return how many were written."""
+        rows = [
+            (model, record["id"], record.get("modified_at"), record.get("created_at"), json.dumps(record))
+            for record in records if record.get("id")
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO records (model, id, modified_at, created_at, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (model, id) DO UPDATE SET modified_at = excluded.modified_at, "
+                "created_at = excluded.created_at, data = excluded.data",
+                rows,
+            )
+        return len(rows)
+
+    def sync_state(self, model: str) -> Dict:
+        """Return the high-water mark, last sync time and record count of a model."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT high_water, last_synced_at FROM sync_state WHERE model = ?", (model,)).fetchone()
+            count = conn.execute("SELECT COUNT(*) FROM records WHERE model = ?", (model,)).fetchone()[0]
+        high_water, last_synced_at = row if row else (None, None)
+        return {"high_water": high_water, "last_synced_at": last_synced_at, "records": count}
+
+    def set_high_water(self, model: str, high_water: Optional[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_state (model, high_water, last_synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (model) DO UPDATE SET high_water = excluded.high_water, "
+                "last_synced_at = excluded.last_synced_at",
+                (model, high_water, datetime.now(timezone.utc).isoformat()),
+            )
+
+    def load_records(self, model: str) -> List[Dict]:
+        """Return stored records of a model ordered by creation time."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT data FROM records WHERE model = ? ORDER BY created_at", (model,)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def prune(self, model: str, keep_ids: Iterable[str]) -> int:
+        """Delete a model's records whose id is not in `keep_ids` and return how many were removed."""
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE keep_ids (id TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO keep_ids (id) VALUES (?)", ((record_id,) for record_id in keep_ids))
+            removed = conn.execute("DELETE FROM records WHERE model = ? AND id NOT IN (SELECT id FROM keep_ids)", (model,)).rowcount
+        return removed
+
+    def clear(self, model: str):
+        """Forget a model's records and high-water mark so the next sync is a full one."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM records WHERE model = ?", (model,))
+            conn.execute("DELETE FROM sync_state WHERE model = ?", (model,))
+
+def sync_model(client: MergeClient, store: SyncStore, model: str, endpoint: str = None,
+               params: Dict = None, full: bool = False) -> Dict:
+    """Pull records changed since the model's high-water mark into the store.
+
+    The high-water mark is the newest `modified_at` seen and is only advanced once
+    every page has been stored, so an interrupted sync is simply repeated. Deltas
+    start SYNC_OVERLAP_SECONDS before it and rely on the upsert by id to absorb the
+    records read twice. A full resync upserts over the existing records and only
+    removes the ones it did not see once the last page has been stored, so the store
+    keeps its previous contents if the pull fails halfway.
+    """
+    high_water = None if full else store.sync_state(model)["high_water"]
+    params = {"page_size": SYNC_PAGE_SIZE, "include_deleted_data": True, **(params or {})}
+    newest = parse_timestamp(high_water)
+    if newest:
+        params["modified_after"] = (newest - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+
+    batches = 0
+    written = 0
+    seen = set()
+    # Records are streamed off the socket and upserted in batches without holding whole pages
+    for batch in iter_record_batches(client, endpoint or f"/{model}", params, batch_size=SYNC_BATCH_SIZE):
+        written += store.upsert(model, batch)
+        batches += 1
+        for record in batch:
+            if full and record.get("id"):
+                seen.add(record["id"])
+            modified_at = parse_timestamp(record.get("modified_at"))
+            if modified_at and (newest is None or modified_at > newest):
+                newest = modified_at
+    removed = store.prune(model, seen) if full else 0
+    high_water_after = newest.isoformat() if newest else None
+    store.set_high_water(model, high_water_after)
+    return {"batches": batches, "upserted": written, "removed": removed, "delta": high_water is not None,
+            "high_water": high_water_after}
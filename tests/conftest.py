@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Modules read their directories at import time, so point them away from the checkout first
+STATE_DIR = tempfile.mkdtemp(prefix="merge-explorer-tests-")
+for name in ("SYNC", "BULK_REPORT", "DOWNLOAD", "RESULT", "OPENAPI_CACHE"):
+    os.environ.setdefault(f"MERGE_{name}_DIR", os.path.join(STATE_DIR, name.lower()))
+
+from mock_server import MockMergeServer  # noqa: E402
+
+APP = os.path.join(ROOT, "merge_api_explorer.py")
+
+@pytest.fixture
+def mock_server():
+    server = MockMergeServer(records=200)
+    server.start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def app(mock_server):
+    """The explorer pointed at the mock server and signed in."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    at.text_input(key="base_url").input(mock_server.base_url)
+    at.text_input(key="api_key").input("test-key")
+    at.text_input(key="access_token").input("test-token")
+    at.checkbox(key="use_response_cache").uncheck()
+    next(b for b in at.button if b.label == "Submit").click()
+    at.run()
+    return at
+
+def click(at, label: str):
+    next(b for b in at.button if b.label == label).click()
+    at.run()
@@ -0,0 +1,48 @@
+import requests
+
+from bulk_post import iter_bulk_post, load_report, read_rows, report_path
+from merge_client import MergeClient
+
+POST_FIELDS = {"body": "string", "ticket": "string (UUID)", "tags": "array of strings"}
+
+def make_client(mock_server):
+    return MergeClient("test-key", "test-token", base_url=mock_server.base_url)
+
+def test_closing_the_generator_records_every_sent_row(mock_server, tmp_path):
+    mock_server.latency = 0.02
+    created = len(mock_server.dataset.models["comments"])
+    report = str(tmp_path / "report.jsonl")
+    rows = [{"body": f"row {i}"} for i in range(40)]
+    results = iter_bulk_post(make_client(mock_server), "/comments", rows, POST_FIELDS, report=report,
+                             max_workers=4, rate_per_second=1000)
+    for _ in range(5):
+        next(results)
+    results.close()
+
+    sent = len(mock_server.dataset.models["comments"]) - created
+    recorded = [entry for entry in load_report(report).values() if entry["status"] == "created"]
+    assert sent < len(rows)
+    assert len(recorded) == sent
+
+def test_malformed_rows_are_reported_invalid(mock_server, tmp_path):
+    rows = read_rows(b'{"body": "ok"}\n["a"]\n{"body": "bad tags", "tags": "[bad"}\n', "rows.jsonl")
+    results = sorted(iter_bulk_post(make_client(mock_server), "/comments", rows, POST_FIELDS,
+                                    report=str(tmp_path / "report.jsonl")), key=lambda r: r["row"])
+    assert [r["status"] for r in results] == ["created", "invalid", "invalid"]
+
+class ErrorClient:
+    def post(self, endpoint, payload):
+        response = requests.Response()
+        response.status_code = 502
+        response._content = b"<html>Bad Gateway</html>"
+        return response
+
+def test_http_status_is_reported_for_non_json_error_bodies():
+    [result] = iter_bulk_post(ErrorClient(), "/comments", [{"body": "x"}], POST_FIELDS)
+    assert result["status"] == "error"
+    assert result["error"].startswith("HTTP 502")
+
+def test_reports_are_kept_per_account(tmp_path):
+    first = report_path("tickets", "rows.csv", "a" * 32, str(tmp_path))
+    second = report_path("tickets", "rows.csv", "b" * 32, str(tmp_path))
+    assert first != second
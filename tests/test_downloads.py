@@ -0,0 +1,36 @@
+import os
+
+from downloads import attachment_path, list_ticket_attachments
+from merge_client import MergeClient
+
+def test_few_tickets_are_listed_with_the_ticket_filter(mock_server):
+    tickets = [r["id"] for r in mock_server.dataset.models["tickets"][:3]]
+    client = MergeClient("test-key", "test-token", base_url=mock_server.base_url)
+    requests_before = mock_server.requests
+    attachments, truncated = list_ticket_attachments(client, tickets)
+    client.close()
+    expected = [r for r in mock_server.dataset.models["attachments"] if r["ticket"] in tickets]
+    assert sorted(r["id"] for r in attachments) == sorted(r["id"] for r in expected)
+    assert not truncated
+    assert mock_server.requests - requests_before == len(tickets)
+
+def test_many_tickets_scan_attachments_up_to_a_page_budget(mock_server):
+    tickets = [r["id"] for r in mock_server.dataset.models["tickets"]]
+    client = MergeClient("test-key", "test-token", base_url=mock_server.base_url)
+    requests_before = mock_server.requests
+    attachments, truncated = list_ticket_attachments(client, tickets, filter_max_tickets=2, scan_max_pages=1)
+    client.close()
+    # 200 attachments at 100 per page: one page read, one left
+    assert len(attachments) == 100 and truncated
+    assert mock_server.requests - requests_before <= 2
+
+    client = MergeClient("test-key", "test-token", base_url=mock_server.base_url)
+    attachments, truncated = list_ticket_attachments(client, tickets, filter_max_tickets=2)
+    client.close()
+    assert len(attachments) == 200 and not truncated
+
+def test_attachment_path_stays_inside_the_directory(tmp_path):
+    directory = str(tmp_path)
+    path = attachment_path({"id": "../../etc/x", "ticket": "../..", "file_name": "../passwd"}, directory)
+    assert os.path.dirname(os.path.dirname(path)) == directory
+    assert ".." not in os.path.relpath(path, directory).split(os.sep)
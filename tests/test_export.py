@@ -0,0 +1,70 @@
+import gzip
+import json
+
+import pyarrow.parquet as pq
+import pytest
+
+from export import export_model, export_records, main
+from merge_client import MergeClient
+from rate_limit import RateLimiterRegistry
+
+RECORDS = [
+    {"id": "1", "name": "a", "priority": 1, "tags": ["x", "y"], "remote_data": None},
+    {"id": "2", "name": "b", "priority": 2, "tags": [], "remote_data": None},
+]
+
+@pytest.mark.parametrize("name", ["out.jsonl", "out.jsonl.gz"])
+def test_jsonl_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    assert export_records([RECORDS[:1], RECORDS[1:]], path, "jsonl") == 2
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+def test_parquet_round_trip(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    assert export_records([RECORDS[:1], RECORDS[1:]], path, "parquet") == 2
+    table = pq.read_table(path)
+    assert table.num_rows == 2
+    assert table.column("priority").to_pylist() == [1, 2]
+    # Nested values are stored as JSON text; an all-null column becomes a string column
+    assert [json.loads(v) for v in table.column("tags").to_pylist()] == [["x", "y"], []]
+    assert str(table.schema.field("remote_data").type) == "string"
+
+def test_parquet_counts_values_that_do_not_fit_the_first_batch(tmp_path, capsys):
+    path = str(tmp_path / "out.parquet")
+    batches = [
+        [{"id": "1", "priority": 1, "status": "OPEN"}],
+        [{"id": "2", "priority": "high", "status": 3, "due_date": "2024-01-01"},
+         {"id": "3", "priority": 3, "status": None, "due_date": None}],
+    ]
+    export_records(batches, path, "parquet")
+
+    table = pq.read_table(path)
+    assert table.column_names == ["id", "priority", "status"]
+    assert table.column("priority").to_pylist() == [1, None, 3]
+    assert table.column("status").to_pylist() == ["OPEN", "3", None]
+    err = capsys.readouterr().err
+    # The unparseable priority and the one non-null due_date
+    assert "2 values did not fit" in err
+    assert "fields missing from the first batch were dropped: due_date" in err
+
+def test_parquet_without_records_is_still_readable(tmp_path):
+    path = str(tmp_path / "empty.parquet")
+    assert export_records([], path, "parquet") == 0
+    assert pq.read_table(path).num_rows == 0
+
+def test_export_model_streams_every_page(mock_server, tmp_path):
+    client = MergeClient("test-key", "test-token", base_url=mock_server.base_url, rate_limits=RateLimiterRegistry())
+    path = str(tmp_path / "tickets.parquet")
+    written = export_model(client, "tickets", path, "parquet", page_size=30, batch_size=50)
+
+    table = pq.read_table(path)
+    assert written == table.num_rows == len(mock_server.dataset.models["tickets"])
+    assert table.column("id").to_pylist() == [r["id"] for r in mock_server.dataset.models["tickets"]]
+
+def test_main_reports_fetch_errors(mock_server, tmp_path, capsys):
+    code = main(["--model", "nothing", "--api-key", "k", "--account-token", "t",
+                 "--base-url", mock_server.base_url, "--output", str(tmp_path / "out.jsonl")])
+    assert code == 1
+    assert "Error fetching data" in capsys.readouterr().err
@@ -0,0 +1,43 @@
+import socket
+
+from fanout import fan_out, parse_account_tokens
+from merge_client import MergeClient
+from rate_limit import RateLimiterRegistry
+
+def make_client(base_url: str, token: str) -> MergeClient:
+    return MergeClient("test-key", token, base_url=base_url, max_retries=0, backoff_factor=0.001,
+                       rate_limits=RateLimiterRegistry())
+
+def closed_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/ticketing/v1"
+
+def test_parse_account_tokens():
+    text = "# accounts\nsupport,tok-aaaa\n\ntok-bbbb\nsupport,tok-cccc\ntok-aaaa\n"
+    assert parse_account_tokens(text) == [("support", "tok-aaaa"), ("…bbbb", "tok-bbbb"), ("support (3)", "tok-cccc")]
+
+def test_fan_out_keeps_results_of_accounts_that_succeed(mock_server):
+    clients = {
+        "ok": make_client(mock_server.base_url, "tok-ok"),
+        "down": make_client(closed_port_url(), "tok-down"),
+        "missing": make_client(mock_server.base_url.replace("/ticketing/", "/nowhere/"), "tok-missing"),
+    }
+    seen = []
+    results = fan_out(clients, "/tickets", {"page_size": 50}, max_pages=2, on_result=lambda r: seen.append(r["account"]))
+
+    assert [r["account"] for r in results] == ["ok", "down", "missing"]
+    assert sorted(seen) == ["down", "missing", "ok"]
+    ok, down, missing = results
+    assert ok["error"] is None
+    assert (ok["pages"], len(ok["records"]), ok["has_more"]) == (2, 100, True)
+    assert down["error"] and down["records"] == [] and down["pages"] == 0
+    assert "404" in missing["error"] and missing["records"] == []
+
+def test_fan_out_stops_at_max_records(mock_server):
+    clients = {label: make_client(mock_server.base_url, f"tok-{label}") for label in ("a", "b")}
+    results = fan_out(clients, "/tickets", {"page_size": 50}, max_pages=None, max_records=120)
+
+    assert [len(r["records"]) for r in results] == [120, 120]
+    assert all(r["error"] is None for r in results)
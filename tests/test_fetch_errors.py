@@ -0,0 +1,44 @@
+import pytest
+
+import merge_client
+from conftest import click
+
+def not_json(content):
+    raise ValueError(f"unexpected content: {content[:20]!r}")
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_non_json_body_shows_error(app, monkeypatch, method):
+    monkeypatch.setattr(merge_client, "loads", not_json)
+    if method == "POST":
+        app.radio(key="comments_method").set_value("POST")
+        app.run()
+    click(app, f"{method} /comments")
+    assert not app.exception
+    assert any("Error fetching data" in e.value for e in app.error)
+
+def serve_html(mock_server, monkeypatch):
+    """Answer every GET with a 200 HTML page, like a captive portal or misrouted proxy."""
+    def do_GET(handler):
+        handler._send(200, b"<html>Sign in to continue</html>", "text/html")
+    monkeypatch.setattr(mock_server.httpd.RequestHandlerClass, "do_GET", do_GET)
+
+def test_fetch_all_pages_reports_non_json_body(app, mock_server, monkeypatch):
+    app.checkbox(key="comments_fetch_all").check()
+    app.run()
+    serve_html(mock_server, monkeypatch)
+    click(app, "GET /comments")
+    assert not app.exception
+    assert any("Error fetching data" in e.value for e in app.error)
+
+def test_sync_reports_non_json_stream(app, mock_server, monkeypatch):
+    serve_html(mock_server, monkeypatch)
+    click(app, "Sync Changes")
+    assert not app.exception
+    assert any("Error syncing data" in e.value for e in app.error)
+
+def test_attachment_export_reports_non_json_listing(app, mock_server, monkeypatch):
+    click(app, "GET /tickets")
+    serve_html(mock_server, monkeypatch)
+    click(app, "Download all attachments for these tickets")
+    assert not app.exception
+    assert any("Error listing attachments" in e.value for e in app.error)
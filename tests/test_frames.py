@@ -0,0 +1,28 @@
+import json
+
+import pandas as pd
+
+from api_spec import API_CATEGORIES
+from frames import build_frame
+
+TICKET_FIELDS = API_CATEGORIES["Ticketing"]["endpoints"]["tickets"]["post_fields"]
+
+def test_list_valued_nested_field_is_kept_as_json():
+    remote_fields = [{"remote_field_class": "rfc-1", "value": "high"}]
+    df = build_frame([{"id": "a", "remote_fields": remote_fields}, {"id": "b", "remote_fields": []}], TICKET_FIELDS)
+    assert json.loads(df.loc[0, "remote_fields"]) == remote_fields
+    assert json.loads(df.loc[1, "remote_fields"]) == []
+
+def test_dict_valued_nested_field_is_flattened():
+    df = build_frame([{"id": "a", "integration_params": {"department_id": "d1"}}, {"id": "b", "integration_params": None}],
+                     TICKET_FIELDS)
+    assert "integration_params" not in df.columns
+    assert df["integration_params.department_id"].tolist()[0] == "d1"
+
+def test_datetimes_are_parsed_to_utc():
+    df = build_frame([{"id": "a", "created_at": "2024-01-01T05:00:00+05:00", "due_date": "2024-01-02"},
+                      {"id": "b", "created_at": None, "due_date": "not a date"}], TICKET_FIELDS)
+    assert df.loc[0, "created_at"] == pd.Timestamp("2024-01-01T00:00:00Z")
+    assert df.loc[0, "due_date"] == pd.Timestamp("2024-01-02T00:00:00Z")
+    assert df["created_at"].isna().tolist() == [False, True]
+    assert df["due_date"].isna().tolist() == [False, True]
@@ -0,0 +1,13 @@
+from conftest import click
+
+def test_single_object_post(app, mock_server):
+    created = len(mock_server.dataset.models["comments"])
+    app.radio(key="comments_method").set_value("POST")
+    app.run()
+    next(t for t in app.text_input if t.label == "Body").input("Investigating")
+    app.run()
+    click(app, "POST /comments")
+    assert not app.exception
+    assert not app.error
+    assert len(mock_server.dataset.models["comments"]) == created + 1
+    assert mock_server.dataset.models["comments"][-1]["body"] == "Investigating"
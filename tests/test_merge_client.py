@@ -0,0 +1,100 @@
+import socket
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from merge_client import MergeClient, parse_retry_after
+from rate_limit import RateLimiterRegistry
+
+def make_client(base_url: str, **kwargs) -> MergeClient:
+    # A registry per client, so buckets penalized by one test do not slow down the next
+    return MergeClient("test-key", "test-token", base_url=base_url, backoff_factor=0.001,
+                       rate_limits=RateLimiterRegistry(), **kwargs)
+
+def throttle_first(mock_server, count: int):
+    """Answer the next `count` requests with 429."""
+    remaining = [count]
+
+    def should_throttle():
+        mock_server.requests += 1
+        if remaining[0]:
+            remaining[0] -= 1
+            mock_server.throttled += 1
+            return True
+        return False
+    mock_server._should_throttle = should_throttle
+
+def closed_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/ticketing/v1"
+
+def test_429_waits_retry_after_seconds(mock_server):
+    mock_server.retry_after = 0.2
+    throttle_first(mock_server, 1)
+    client = make_client(mock_server.base_url)
+    started = time.monotonic()
+    response = client.get("/users")
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.2
+    assert client.stats == {"requests": 2, "retries": 1, "throttled": 1}
+
+def test_429_waits_retry_after_http_date(mock_server):
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=2)
+    mock_server.retry_after = format_datetime(retry_at, usegmt=True)
+    throttle_first(mock_server, 1)
+    client = make_client(mock_server.base_url)
+    response = client.get("/users")
+    assert response.status_code == 200
+    # HTTP dates have whole-second resolution
+    assert datetime.now(timezone.utc) >= retry_at.replace(microsecond=0)
+    assert client.stats["retries"] == 1
+
+def test_parse_retry_after():
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+    in_ten = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+    assert 8 < parse_retry_after(in_ten) <= 10
+
+def test_retries_stop_after_max_retries(mock_server):
+    mock_server.retry_after = 0.01
+    throttle_first(mock_server, 100)
+    client = make_client(mock_server.base_url, max_retries=2)
+    response = client.get("/users")
+    assert response.status_code == 429
+    assert mock_server.requests == 3
+    assert client.stats == {"requests": 3, "retries": 2, "throttled": 3}
+
+def test_post_is_retried_on_429(mock_server):
+    mock_server.retry_after = 0.01
+    throttle_first(mock_server, 1)
+    created = len(mock_server.dataset.models["comments"])
+    response = make_client(mock_server.base_url).post("/comments", {"body": "hi"})
+    assert response.status_code == 201
+    assert len(mock_server.dataset.models["comments"]) == created + 1
+
+def test_post_is_not_retried_on_5xx(mock_server, monkeypatch):
+    def do_POST(handler):
+        handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        mock_server.requests += 1
+        handler._send(503, b'{"detail": "Unavailable."}')
+    monkeypatch.setattr(mock_server.httpd.RequestHandlerClass, "do_POST", do_POST)
+    client = make_client(mock_server.base_url)
+    assert client.post("/comments", {"body": "hi"}).status_code == 503
+    assert mock_server.requests == 1
+    assert client.stats["retries"] == 0
+
+def test_connection_errors_retry_get_but_not_post():
+    client = make_client(closed_port_url(), max_retries=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post("/comments", {"body": "hi"})
+    assert client.stats["requests"] == 1
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("/comments")
+    assert client.stats["requests"] == 1 + 3
@@ -0,0 +1,10 @@
+from conftest import click
+from metrics import METRICS
+
+def test_work_after_the_frame_build_has_its_own_phases(app):
+    click(app, "GET /tickets")
+    assert not app.exception
+    phases = METRICS.recent[-1]["phases"]
+    assert {"frame", "snapshot", "index", "aggregate"} <= set(phases)
+    reported = [row["phase"] for row in METRICS.rolling_percentiles()]
+    assert {"snapshot", "index", "aggregate"} <= set(reported)
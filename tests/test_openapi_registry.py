@@ -0,0 +1,34 @@
+from bulk_post import coerce_value, validate_row
+from frames import parse_field_type
+from openapi_registry import category_base_url, compile_openapi, path_params
+
+SPEC = {
+    "paths": {
+        "/tickets": {
+            "get": {"responses": {"200": {"content": {"application/json": {"schema": {
+                "type": "object", "properties": {"results": {"type": "array"}}}}}}}},
+            "post": {"requestBody": {"content": {"application/json": {"schema": {
+                "type": "object",
+                "required": ["is_private"],
+                "properties": {"is_private": {"type": "boolean"}, "name": {"type": "string"}},
+            }}}}},
+        },
+    },
+}
+
+def test_required_boolean_keeps_boolean_handling():
+    fields = compile_openapi(SPEC, "Ticketing")["post_fields"]["tickets"]
+    assert fields["is_private"] == "boolean (Required for all integrations)"
+    assert parse_field_type(fields["is_private"]) == "boolean"
+    assert coerce_value("yes", fields["is_private"]) is True
+    assert validate_row({"is_private": "yes"}, fields) == ["is_private must be a boolean"]
+    assert validate_row({"is_private": False}, fields) == []
+
+def test_path_params_lists_parameter_names_in_order():
+    assert path_params(["/tickets", "/tickets/{ticket_id}/viewers/{id}"]) == {
+        "/tickets": [], "/tickets/{ticket_id}/viewers/{id}": ["ticket_id", "id"]}
+
+def test_category_base_url_only_rewrites_category_paths():
+    assert category_base_url("https://api.merge.dev/api/ticketing/v1", "File Storage") == "https://api.merge.dev/api/filestorage/v1"
+    assert category_base_url("http://127.0.0.1:8000/api/crm/v2", "HRIS") == "http://127.0.0.1:8000/api/hris/v2"
+    assert category_base_url("https://proxy.example.com/api/merge/v1", "HRIS") == "https://proxy.example.com/api/merge/v1"
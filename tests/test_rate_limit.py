@@ -0,0 +1,52 @@
+import threading
+import time
+
+from rate_limit import RATE_LIMIT_WINDOW, TokenBucket
+
+def drained(requests_per_minute: float) -> TokenBucket:
+    bucket = TokenBucket("test", requests_per_minute)
+    bucket.tokens = 0.0
+    return bucket
+
+def test_waiters_are_served_in_arrival_order():
+    bucket = drained(1200)
+    order = []
+    threads = []
+    for i in range(5):
+        thread = threading.Thread(target=lambda i=i: (bucket.acquire(), order.append(i)))
+        thread.start()
+        threads.append(thread)
+        # Let each waiter join the queue before the next one arrives
+        while len(bucket._queue) < i + 1:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(5)
+    assert order == list(range(5))
+    assert bucket.stats["acquired"] == 5
+
+def test_rate_is_learned_from_headers():
+    bucket = TokenBucket("test", 300)
+    bucket.update_from_headers({"X-RateLimit-Limit": "120"})
+    assert bucket.capacity == 120
+    assert bucket.rate == 120 / RATE_LIMIT_WINDOW
+
+    bucket.update_from_headers({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "10"})
+    assert bucket.tokens <= 5
+    assert bucket.rate == 5 / 10
+
+def test_penalize_waits_retry_after_not_a_refill_period():
+    # One token per second: refilling from empty would take a full second
+    bucket = drained(60)
+    bucket.penalize(0.05)
+    started = time.monotonic()
+    bucket.acquire()
+    waited = time.monotonic() - started
+    assert 0.04 <= waited < 0.5
+    assert bucket.stats["throttled"] == 1
+
+def test_penalize_without_retry_after_waits_one_token():
+    bucket = drained(600)
+    bucket.penalize(None)
+    started = time.monotonic()
+    bucket.acquire()
+    assert 0.05 <= time.monotonic() - started < 0.5
@@ -0,0 +1,30 @@
+import threading
+
+from response_cache import ResponseCache
+
+def test_callers_get_independent_copies():
+    cache = ResponseCache()
+    first = cache.get_or_fetch(("a", "/tickets", "{}"), lambda: ({"results": [{"id": "1"}]}, 10))
+    first["results"].append({"id": "2"})
+    second = cache.get_or_fetch(("a", "/tickets", "{}"), lambda: ({"results": []}, 10))
+    assert second == {"results": [{"id": "1"}]}
+
+def test_fetch_overlapping_an_invalidation_is_not_stored():
+    cache = ResponseCache()
+    key = ("a", "/tickets", "{}")
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch():
+        started.set()
+        release.wait(5)
+        return {"results": ["before write"]}, 10
+
+    thread = threading.Thread(target=cache.get_or_fetch, args=(key, slow_fetch))
+    thread.start()
+    started.wait(5)
+    cache.invalidate("a")
+    release.set()
+    thread.join(5)
+
+    assert cache.get_or_fetch(key, lambda: ({"results": ["after write"]}, 10)) == {"results": ["after write"]}
+    assert cache.snapshot()["misses"] == 2
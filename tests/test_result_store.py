@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+import result_store
+from conftest import click
+from result_store import ResultStore, StoredFrame, StoredObject
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path), session_budget=10 ** 9, global_budget=10 ** 9)
+
+def test_objects_round_trip_and_count_against_the_budget(store):
+    handle = store.put_object("s", "index", {"terms": list(range(1000))})
+    assert isinstance(handle, StoredObject)
+    assert store.load_object(handle) == {"terms": list(range(1000))}
+    assert store.stats("s")["session_bytes"] == handle.nbytes
+
+    store.session_budget = handle.nbytes
+    frame = store.put("s", "frame", pd.DataFrame({"id": [str(i) for i in range(100)]}))
+    assert isinstance(frame, StoredFrame)
+    assert store.load_object(handle) is None
+    assert store.stats("s")["evictions"] == 1
+
+def test_discard_only_removes_the_current_entry(store):
+    old = store.put_object("s", "snapshot", [1])
+    new = store.put_object("s", "snapshot", [2])
+    store.discard(old)
+    assert store.load_object(new) == [2]
+    store.discard(new)
+    assert store.stats("s")["entries"] == 0
+
+def test_large_results_are_spilled_as_a_whole(app, monkeypatch):
+    monkeypatch.setattr(result_store, "RESULT_SPILL_BYTES", 0)
+    monkeypatch.setenv("MERGE_SNAPSHOT_MAX_PER_SESSION", "1")
+    click(app, "GET /tickets")
+    click(app, "GET /tickets")
+    result = app.session_state["Ticketing_tickets_last_result"]
+    assert isinstance(result["frame"], StoredFrame)
+    assert all(isinstance(result[part], StoredObject) for part in ("data", "index", "diff"))
+    [snapshot] = app.session_state["snapshots"].values()
+    assert isinstance(snapshot, StoredObject)
+
+    click(app, "GET /comments")
+    assert len(app.session_state["snapshots"]) == 1
+    assert not app.exception
+    # The spilled ticket result is loaded back for the rerun
+    assert any("Last result of GET /tickets" in c.value for c in app.caption)
+    assert not any("evicted" in i.value for i in app.info)
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from conftest import click
+from search_index import SearchIndex
+
+def make_index() -> SearchIndex:
+    index = SearchIndex()
+    index.add(pd.DataFrame({
+        "name": ["Login outage", "Billing question", "Outage follow-up"],
+        "status": ["OPEN", "CLOSED", "OPEN"],
+        "tags": [["vip"], [], ["vip", "billing"]],
+    }))
+    return index
+
+def test_search_intersects_terms():
+    index = make_index()
+    assert index.search("outage status:open").tolist() == [0, 2]
+    assert index.search("tags:billing").tolist() == [2]
+    assert index.search("  ") is None
+
+def test_date_ranges_accept_a_time_of_day():
+    index = SearchIndex()
+    index.add(pd.DataFrame({
+        "name": ["a", "b", "c"],
+        "created_at": pd.to_datetime(["2024-01-01T12:00Z", "2024-01-02T00:00Z", "2024-01-02T08:30Z"]),
+    }))
+    assert index.search("created_at>=2024-01-02T00:00").tolist() == [1, 2]
+    assert index.search("created_at<2024-01-02T08:30:00Z").tolist() == [0, 1]
+
+@pytest.mark.parametrize("query", ["!!", "*", "- ."])
+def test_query_without_terms_is_a_value_error(query):
+    with pytest.raises(ValueError):
+        make_index().search(query)
+
+def test_search_box_warns_on_query_without_terms(app):
+    click(app, "GET /tickets")
+    app.text_input(key="/tickets_search").input("!!")
+    app.run()
+    assert not app.exception
+    assert any("Nothing to search for" in w.value for w in app.warning)
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from snapshots import Snapshot, diff_snapshots
+
+def frame(rows):
+    return pd.DataFrame(rows)
+
+def test_diff_detects_added_removed_and_changed():
+    old = Snapshot(frame([
+        {"id": "1", "name": "a", "status": "OPEN", "tags": ["x"]},
+        {"id": "2", "name": "b", "status": "OPEN", "tags": ["y"]},
+        {"id": "3", "name": "c", "status": "OPEN", "tags": []},
+    ]))
+    new = Snapshot(frame([
+        {"id": "1", "name": "a", "status": "OPEN", "tags": ["x"]},
+        {"id": "2", "name": "b", "status": "CLOSED", "tags": ["y", "z"]},
+        {"id": "4", "name": "d", "status": "OPEN", "tags": []},
+    ]))
+    diff = diff_snapshots(old, new)
+
+    assert diff["added"]["id"].tolist() == ["4"]
+    assert diff["removed"]["id"].tolist() == ["3"]
+    assert diff["changed"]["id"].tolist() == ["2"]
+    assert diff["changed"]["changed_fields"].tolist() == ["status, tags"]
+    assert diff["unchanged"] == 1
+    values = diff["values"].set_index("field")
+    assert values.at["status", "old"] == "OPEN" and values.at["status", "new"] == "CLOSED"
+    assert diff["field_counts"].to_dict() == {"status": 1, "tags": 1}
+
+def test_diff_counts_a_new_column_as_a_change():
+    old = Snapshot(frame([{"id": "1", "name": "a"}]))
+    new = Snapshot(frame([{"id": "1", "name": "a", "priority": "HIGH"}]))
+    diff = diff_snapshots(old, new)
+
+    assert diff["changed"]["changed_fields"].tolist() == ["priority"]
+    value = diff["values"].iloc[0]
+    assert (value["field"], value["new"]) == ("priority", "HIGH")
+    assert pd.isna(value["old"])
+
+def test_diff_caps_listed_values_but_not_changed_ids():
+    old = Snapshot(frame([{"id": str(i), "status": "OPEN"} for i in range(10)]))
+    new = Snapshot(frame([{"id": str(i), "status": "CLOSED"} for i in range(10)]))
+    diff = diff_snapshots(old, new, max_rows=3)
+
+    assert len(diff["changed"]) == 10
+    assert len(diff["values"]) == 3
+
+def test_snapshot_keeps_the_last_duplicate_id():
+    snapshot = Snapshot(frame([{"id": "1", "status": "OPEN"}, {"id": "1", "status": "CLOSED"}]))
+    assert len(snapshot) == 1
+    assert snapshot.frame["status"].tolist() == ["CLOSED"]
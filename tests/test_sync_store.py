@@ -0,0 +1,42 @@
+import pytest
+import requests
+
+import sync_store
+from merge_client import MergeClient
+from sync_store import SyncStore, sync_model
+
+@pytest.fixture
+def client(mock_server):
+    client = MergeClient("test-key", "test-token", base_url=mock_server.base_url)
+    yield client
+    client.close()
+
+def test_delta_sync_rereads_records_at_the_high_water_mark(mock_server, client, tmp_path):
+    store = SyncStore("account", str(tmp_path))
+    first = sync_model(client, store, "users")
+    newest = max(mock_server.dataset.models["users"], key=lambda r: r["modified_at"])
+    twin = {**newest, "id": "00000000-0000-0000-0000-000000000001"}
+    mock_server.dataset.models["users"].append(twin)
+
+    second = sync_model(client, store, "users")
+    assert second["delta"] and second["high_water"] == first["high_water"]
+    assert twin["id"] in {r["id"] for r in store.load_records("users")}
+
+def test_full_resync_keeps_records_until_the_pull_completes(mock_server, client, tmp_path, monkeypatch):
+    store = SyncStore("account", str(tmp_path))
+    sync_model(client, store, "tickets")
+    before = store.sync_state("tickets")
+
+    def failing_batches(*args, **kwargs):
+        yield mock_server.dataset.models["tickets"][:10]
+        raise requests.exceptions.ConnectionError("connection dropped")
+    monkeypatch.setattr(sync_store, "iter_record_batches", failing_batches)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        sync_model(client, store, "tickets", full=True)
+    assert store.sync_state("tickets") == before
+    monkeypatch.undo()
+
+    del mock_server.dataset.models["tickets"][:50]
+    result = sync_model(client, store, "tickets", full=True)
+    assert result["removed"] == 50 and not result["delta"]
+    assert store.sync_state("tickets")["records"] == len(mock_server.dataset.models["tickets"])
@@ -0,0 +1,69 @@
+from typing import List, Optional
+
+import pandas as pd
+
+# Timestamp fields that can drive a time-series chart, in order of preference
+TIME_FIELDS = ["created_at", "remote_created_at", "modified_at", "remote_updated_at"]
+# Fields a series can be split by
+SPLIT_FIELDS = ["status", "priority", "assignees"]
+GRANULARITIES = {"Hour": "h", "Day": "D", "Week": "W"}
+
+def available_time_fields(df: pd.DataFrame) -> List[str]:
+    """Return the timestamp fields present in a frame."""
+    return [field for field in TIME_FIELDS if field in df.columns]
+
+def bucket_start(timestamps: pd.Series, freq: str) -> pd.Series:
+    """Floor datetime64 values to the start of their hour, day or (Monday-based) week."""
+    if freq == "W":
+        days = timestamps.dt.floor("D")
+        return days - pd.to_timedelta(days.dt.dayofweek, unit="D")
+    return timestamps.dt.floor(freq)
+
+class TimeSeriesAggregator:
+    """Incrementally maintained record counts per time bucket, optionally split by a field.
+
+    Each call to `add` only groups the new rows and merges their counts into the
+    running totals, so pages can be added as they arrive without recomputing
+    everything already seen.
+    """
+
+    def __init__(self, time_field: str, freq: str = "D", split_by: Optional[str] = None):
+        self.time_field = time_field
+        self.freq = freq
+        self.split_by = split_by
+        self.counts = pd.Series(dtype="int64")
+        self.records = 0
+
+    def add(self, df: pd.DataFrame):
+        """Fold a frame of new records into the running counts."""
+        if df.empty or self.time_field not in df.columns:
+            return
+        timestamps = df[self.time_field]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, utc=True, errors="coerce", format="ISO8601")
+        keys = {"bucket": bucket_start(timestamps, self.freq)}
+        if self.split_by and self.split_by in df.columns:
+            keys[self.split_by] = df[self.split_by].astype(object)
+        frame = pd.DataFrame(keys).dropna(subset=["bucket"])
+        if self.split_by in frame.columns:
+            # List fields such as assignees count once per element
+            frame = frame.explode(self.split_by)
+            frame[self.split_by] = frame[self.split_by].fillna("(none)").astype(str)
+        self.records += len(frame)
+        if frame.empty:
+            return
+        new_counts = frame.groupby(list(frame.columns), observed=True).size()
+        self.counts = new_counts if self.counts.empty else self.counts.add(new_counts, fill_value=0).astype("int64")
+
+    def frame(self) -> pd.DataFrame:
+        """Return counts as a frame indexed by bucket with one column per split value."""
+        if self.counts.empty:
+            return pd.DataFrame()
+        if isinstance(self.counts.index, pd.MultiIndex):
+            wide = self.counts.unstack(fill_value=0)
+        else:
+            wide = self.counts.to_frame("count")
+        wide = wide.sort_index()
+        # Fill empty buckets so gaps show as zero instead of being interpolated
+        full_range = pd.date_range(wide.index.min(), wide.index.max(), freq="W-MON" if self.freq == "W" else self.freq)
+        return wide.reindex(full_range, fill_value=0)